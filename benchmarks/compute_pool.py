@@ -0,0 +1,90 @@
+# benchmarks/compute_pool.py
+"""Compute-Jobs: execute_next_job (seriell, Abbuchung bei Ausführung) vs.
+Pool-Modus mit Reservierung beim Einreichen (Threads bzw. Prozesse)
+
+Gemessen wird der Durchsatz von Einreichen bis Abrechnung; danach muss die
+Summe aus Guthaben und Reservierungen zur Buchführung passen. `runden` gibt
+jedem Job echte Rechenlast (SHA-256-Runden über 4 KiB, siehe run_payload);
+erst damit kann der Pool mit der Zahl der Kerne skalieren.
+
+Aufruf: python -m benchmarks.compute_pool [anzahl_jobs] [workers] [runden]
+"""
+import os
+import sys
+import time
+from compute.job import ComputeJob
+from orchestration.coordinator import Coordinator
+
+NODES = 16
+COST = 1.0
+
+
+def make_coordinator(count: int, **options) -> Coordinator:
+    coordinator = Coordinator(**options)
+    for i in range(NODES):
+        coordinator.register_node(f"node_{i:02d}")
+        coordinator.ledger.credit_tokens(f"node_{i:02d}", count * COST)
+    return coordinator
+
+
+def submit(coordinator: Coordinator, count: int, rounds: int) -> None:
+    for i in range(count):
+        job = ComputeJob(f"job_{i}", f"node_{i % NODES:02d}", COST, {"task": "hash", "n": i, "rounds": rounds})
+        assert coordinator.submit_compute_job(job)
+
+
+def serial(count: int, rounds: int) -> float:
+    coordinator = make_coordinator(count)
+    started = time.perf_counter()
+    submit(coordinator, count, rounds)
+    while coordinator.execute_next_job().get("error") != "no_jobs_in_queue":
+        pass
+    elapsed = time.perf_counter() - started
+    check_accounts(coordinator, count)
+    return elapsed
+
+
+def check_accounts(coordinator: Coordinator, count: int) -> None:
+    """Jeder Job kostet genau einmal COST; Reservierungen sind aufgelöst"""
+    spent = NODES * count * COST - sum(coordinator.ledger.balances.values())
+    assert abs(spent - count * COST) < 1e-6, spent
+    assert coordinator.escrow.held() == 0 and len(coordinator.escrow) == 0
+    assert coordinator.ledger.total_supply == NODES * count * COST
+
+
+def pooled(count: int, workers: int, use_processes: bool, rounds: int) -> float:
+    coordinator = make_coordinator(
+        count,
+        compute_pool=True,
+        compute_workers=workers,
+        compute_processes=use_processes
+    )
+    started = time.perf_counter()
+    submit(coordinator, count, rounds)
+    collected = 0
+    while collected < count:
+        coordinator.dispatch_jobs()
+        results = coordinator.collect_results(timeout=0.01)
+        assert all("error" not in result for result in results)
+        collected += len(results)
+    elapsed = time.perf_counter() - started
+    check_accounts(coordinator, count)
+    coordinator.close()
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    print(f"{count} Jobs, {rounds} Runden/Job, {workers} Worker, {os.cpu_count()} CPUs")
+    elapsed = serial(count, rounds)
+    print(f"  seriell          {elapsed * 1000:9.1f} ms  {count / elapsed:9.0f} Jobs/s")
+    elapsed = pooled(count, workers, use_processes=False, rounds=rounds)
+    print(f"  Pool (Threads)   {elapsed * 1000:9.1f} ms  {count / elapsed:9.0f} Jobs/s")
+    elapsed = pooled(count, workers, use_processes=True, rounds=rounds)
+    print(f"  Pool (Prozesse)  {elapsed * 1000:9.1f} ms  {count / elapsed:9.0f} Jobs/s")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
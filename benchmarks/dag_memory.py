@@ -0,0 +1,72 @@
+# benchmarks/dag_memory.py
+"""Speicherbedarf: DAG (Dicts mit Hex-Schlüsseln) vs. CompactDAG (Arrays)
+vs. CompactDAG mit ausgelagerten Bodies (BodyStore)
+
+Aufruf: python -m benchmarks.dag_memory [anzahl_transaktionen] [signiert]
+"""
+import functools
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from core.compact_dag import CompactDAG
+from core.crypto import Wallet
+from core.dag import DAG
+from core.node import Node
+
+
+def build(make_dag, count: int, signed: bool = False):
+    dag = make_dag()
+    nodes = [Node(f"node_{i:04d}", Wallet() if signed else None) for i in range(100)]
+    for i in range(count):
+        tips = dag.select_tips(2)
+        tx = nodes[i % len(nodes)].create_energy_transaction(
+            float(i % 500) + 0.5, f"solar_panel_{i % 1000}", tips[0], tips[1]
+        )
+        dag.add_transaction(tx)
+    return dag
+
+
+def measure(make_dag, count: int, signed: bool = False):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    dag = build(make_dag, count, signed)
+    elapsed = time.perf_counter() - started
+    # Die Mint-Queue wird im Betrieb laufend geleert und zählt nicht zum Speicher-Layout
+    dag.newly_confirmed.clear()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dag, current, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    signed = len(sys.argv) > 2 and sys.argv[2] == "signiert"
+    print(f"{count} Transaktionen{' (signiert)' if signed else ''}")
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        body_path = os.path.join(directory, "bodies.bin")
+        variants = (
+            ("DAG", DAG),
+            ("CompactDAG", CompactDAG),
+            ("+BodyStore", functools.partial(CompactDAG, body_path=body_path))
+        )
+        for name, make_dag in variants:
+            dag, used, elapsed = measure(make_dag, count, signed)
+            results[name] = used
+            print(
+                f"  {name:<11} {used / 1e6:8.1f} MB"
+                f"  {used / count:7.0f} B/TX  {count / elapsed:9.0f} TX/s"
+            )
+            dag.close()
+            del dag
+    print(f"  Faktor CompactDAG: {results['DAG'] / results['CompactDAG']:.1f}x")
+    print(f"  Faktor BodyStore:  {results['DAG'] / results['+BodyStore']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
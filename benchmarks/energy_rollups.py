@@ -0,0 +1,91 @@
+# benchmarks/energy_rollups.py
+"""Dashboard-Abfragen ("kWh pro Node pro Stunde", "kWh pro Quellentyp pro
+Tag"): Scan über alle Transaktionen mit to_dict() vs. EnergyRollups
+
+Die Meldungen verteilen sich über `tage` Tage; gemessen werden Aufbau der
+Rollups (inkrementell in Batches wie beim Einfügen) und beide Abfragen.
+
+Aufruf: python -m benchmarks.energy_rollups [anzahl_meldungen] [tage]
+"""
+import hashlib
+import sys
+import time
+import numpy as np
+from core.encoding import VERSION_BINARY
+from core.transaction import Transaction
+from energy.rollups import EnergyRollups
+
+SOURCES = ("solar_panel", "wind_turbine", "hydro_dam", "geothermal_well")
+BATCH = 1000
+
+
+def timed(run):
+    started = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - started
+
+
+def make_transactions(count: int, days: int, start: int):
+    rng = np.random.default_rng(1)
+    times = np.sort(rng.integers(start, start + days * 86400, count)).tolist()
+    return [
+        Transaction.from_energy(
+            VERSION_BINARY,
+            hashlib.sha256(i.to_bytes(8, "little")).digest(),
+            "", "",
+            f"node_{i % 500:04d}",
+            at,
+            None,
+            float(1 + i % 50),
+            f"{SOURCES[i % len(SOURCES)]}_{i % 100}"
+        )
+        for i, at in enumerate(times)
+    ]
+
+
+def scan_node_hours(txs, node_id: str, start: int, end: int):
+    hours = np.zeros((end - start) // 3600)
+    for tx in txs:
+        data = tx.to_dict()
+        if data["node_id"] == node_id and start <= data["timestamp"] < end:
+            hours[(data["timestamp"] - start) // 3600] += data["payload"]["amount_kwh"]
+    return hours
+
+
+def scan_type_days(txs, prefix: str, start: int, end: int):
+    days = np.zeros((end - start) // 86400)
+    for tx in txs:
+        data = tx.to_dict()
+        if data["payload"]["source_id"].startswith(prefix) and start <= data["timestamp"] < end:
+            days[(data["timestamp"] - start) // 86400] += data["payload"]["amount_kwh"]
+    return days
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    start = 1_700_000_000 // 86400 * 86400
+    end = start + days * 86400
+    txs = make_transactions(count, days, start)
+    print(f"{count} Meldungen über {days} Tage")
+    
+    rollups = EnergyRollups()
+    _, elapsed = timed(lambda: [rollups.add_transactions(txs[i:i + BATCH]) for i in range(0, count, BATCH)])
+    print(f"  Rollups aufbauen     {elapsed * 1000:9.1f} ms  {count / elapsed:11.0f} Meldungen/s")
+    
+    old, old_elapsed = timed(lambda: scan_node_hours(txs, "node_0007", start, end))
+    (_, new), new_elapsed = timed(lambda: rollups.series(start, end, EnergyRollups.HOUR, node_id="node_0007"))
+    print(f"  Node/Stunde  Scan    {old_elapsed * 1000:9.1f} ms")
+    print(f"  Node/Stunde  Rollups {new_elapsed * 1000:9.3f} ms  ({len(new)} Fenster)")
+    assert np.allclose(old, new)
+    
+    old, old_elapsed = timed(lambda: scan_type_days(txs, "solar", start, end))
+    (_, new), new_elapsed = timed(lambda: rollups.series(start, end, EnergyRollups.DAY, source_prefix="solar"))
+    print(f"  Solar/Tag    Scan    {old_elapsed * 1000:9.1f} ms")
+    print(f"  Solar/Tag    Rollups {new_elapsed * 1000:9.3f} ms  ({len(new)} Fenster)")
+    assert np.allclose(old, new)
+    print(f"  Speicher: {len(rollups)} Reihen, {rollups.memory_usage() / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+# benchmarks/energy_validation.py
+"""Validierung bestätigter Energiemeldungen: to_dict() → EnergyContribution
+→ validate_contribution pro Meldung vs. ContributionBatch mit
+vektorisierten Masken (validate_columns)
+
+Aufruf: python -m benchmarks.energy_validation [anzahl_meldungen]
+"""
+import sys
+import time
+import numpy as np
+from core.dag import DAG
+from core.node import Node
+from energy.batch import ContributionBatch
+from energy.contribution import EnergyContribution
+from energy.validator import EnergyValidator
+
+SOURCES = ("solar_panel", "wind_turbine", "hydro_dam", "coal_plant", "geothermal_well")
+
+
+def timed(run):
+    started = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - started
+
+
+def per_contribution(txs):
+    contributions = [EnergyContribution.from_transaction(tx.hash, tx.to_dict()) for tx in txs]
+    return [contrib for contrib in contributions if EnergyValidator.validate_contribution(contrib)]
+
+
+def columnar(txs):
+    batch = ContributionBatch.from_transactions(txs)
+    valid, _ = EnergyValidator.validate_columns(batch)
+    return batch.contributions(valid)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    nodes = [Node(f"node_{i:04d}") for i in range(100)]
+    genesis = DAG.GENESIS_HASH
+    txs = [
+        nodes[i % len(nodes)].create_energy_transaction(
+            float(i % 12000) + 0.05, f"{SOURCES[i % len(SOURCES)]}_{i % 1000}", genesis, genesis
+        )
+        for i in range(count)
+    ]
+    print(f"{count} Meldungen")
+    old, old_elapsed = timed(lambda: per_contribution(txs))
+    print(f"  pro Meldung     {old_elapsed * 1000:8.1f} ms  {count / old_elapsed:11.0f} Meldungen/s")
+    new, new_elapsed = timed(lambda: columnar(txs))
+    print(f"  ContributionBatch {new_elapsed * 1000:6.1f} ms  {count / new_elapsed:11.0f} Meldungen/s")
+    assert new == old
+    batch = ContributionBatch.from_transactions(txs)
+    (valid, reasons), elapsed = timed(lambda: EnergyValidator.validate_columns(batch))
+    print(f"  nur Masken      {elapsed * 1000:8.1f} ms  {count / elapsed:11.0f} Meldungen/s")
+    print(f"  gültig {int(valid.sum())}, Ablehnungen pro Grund {np.bincount(reasons)[1:].tolist()}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,142 @@
+# benchmarks/ingest_stress.py
+"""Nebenläufige Ingestion: mehrere Threads reichen Energiemeldungen ein,
+während ein weiterer Thread bestätigt und mintet
+
+Danach wird geprüft, dass nichts verloren ging: jede Meldung steht im DAG,
+jede Transaktion wurde genau einmal gemintet, und die Guthaben ergeben die
+Gesamtmenge. Ein zweiter Lauf bucht parallel auf gemeinsame Konten
+(gestreifte Ledger-Locks). Der Durchsatz skaliert nur, wenn Hashing und
+Signieren den GIL freigeben oder der Interpreter ohne GIL läuft.
+
+Aufruf: python -m benchmarks.ingest_stress [meldungen_pro_thread] [signiert]
+"""
+import os
+import sys
+import threading
+import time
+from core.crypto import Wallet
+from orchestration.coordinator import Coordinator
+from tokens.ledger import TokenLedger
+
+THREADS = (1, 2, 4, 8)
+BATCH = 50
+NODES_PER_THREAD = 10
+ACCOUNTS = 16
+
+
+def submit(coord: Coordinator, thread_index: int, count: int, barrier: threading.Barrier) -> None:
+    barrier.wait()
+    for start in range(0, count, BATCH):
+        records = [
+            (f"node_{thread_index:02d}_{i % NODES_PER_THREAD}", float(i % 7) + 1.0, f"solar_{thread_index}_{i}")
+            for i in range(start, min(start + BATCH, count))
+        ]
+        # Einzel- und Batch-Pfad abwechselnd
+        if (start // BATCH) % 2:
+            results = coord.submit_energy_batch(records)
+            assert all("tx_hash" in result for result in results), results
+        else:
+            for record in records:
+                coord.submit_energy(*record)
+
+
+def mint(coord: Coordinator, done: threading.Event) -> None:
+    while not done.is_set():
+        coord.confirm_transactions()
+        coord.process_minting()
+        time.sleep(0.001)
+
+
+def expected_supply(threads: int, count: int) -> float:
+    kwh = sum(float(i % 7) + 1.0 for i in range(count)) * threads
+    return kwh * Coordinator().minter.KWH_TO_TOKEN_RATE
+
+
+def run_ingest(threads: int, count: int, signed: bool) -> float:
+    coord = Coordinator()
+    for thread_index in range(threads):
+        for i in range(NODES_PER_THREAD):
+            coord.register_node(f"node_{thread_index:02d}_{i}", wallet=Wallet() if signed else None)
+    barrier = threading.Barrier(threads + 1)
+    done = threading.Event()
+    workers = [
+        threading.Thread(target=submit, args=(coord, thread_index, count, barrier))
+        for thread_index in range(threads)
+    ]
+    minter = threading.Thread(target=mint, args=(coord, done))
+    for worker in workers:
+        worker.start()
+    minter.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    minter.join()
+    
+    # Rest bestätigen: Tips mit voller Tiefe bestätigen deren gesamte Vergangenheit
+    for tip in list(coord.dag.tips):
+        coord.confirm(tip, coord.dag.confirmation_threshold)
+    coord.process_minting()
+    
+    submitted = threads * count
+    assert len(coord.dag.transactions) == submitted, (len(coord.dag.transactions), submitted)
+    assert len(coord.minter.processed_transactions) == submitted
+    supply = expected_supply(threads, count)
+    assert abs(coord.ledger.total_supply - supply) < 1e-6 * supply, (coord.ledger.total_supply, supply)
+    assert abs(sum(coord.ledger.balances.values()) - coord.ledger.total_supply) < 1e-6 * supply
+    return submitted / elapsed
+
+
+def book(ledger: TokenLedger, operations: int, barrier: threading.Barrier) -> None:
+    barrier.wait()
+    for i in range(operations):
+        account = f"account_{i % ACCOUNTS}"
+        ledger.credit_tokens(account, 1.0)
+        assert ledger.debit_tokens(account, 1.0)
+
+
+def run_ledger(threads: int, operations: int) -> float:
+    ledger = TokenLedger()
+    for i in range(ACCOUNTS):
+        ledger.credit_tokens(f"account_{i}", 100.0)
+    root = ledger.root()
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=book, args=(ledger, operations, barrier)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    assert all(balance == 100.0 for balance in ledger.balances.values()), ledger.balances
+    assert ledger.total_supply == 100.0 * ACCOUNTS + threads * operations
+    assert ledger.root() == root
+    return 2 * threads * operations / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    signed = len(sys.argv) > 2 and sys.argv[2] == "signiert"
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"{count} Meldungen pro Thread{' (signiert)' if signed else ''}, "
+        f"GIL {'aktiv' if gil else 'aus'}, {os.cpu_count()} CPUs"
+    )
+    baseline = None
+    for threads in THREADS:
+        rate = run_ingest(threads, count, signed)
+        baseline = baseline or rate
+        print(f"  Ingestion {threads} Threads  {rate:9.0f} TX/s  {rate / baseline:5.2f}x")
+    baseline = None
+    for threads in THREADS:
+        rate = run_ledger(threads, count * 10)
+        baseline = baseline or rate
+        print(f"  Ledger    {threads} Threads  {rate:9.0f} Buchungen/s  {rate / baseline:5.2f}x")
+    print("  keine verlorenen Aktualisierungen")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
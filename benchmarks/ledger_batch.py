@@ -0,0 +1,52 @@
+# benchmarks/ledger_batch.py
+"""Minting: TokenLedger (Dict, eine Gutschrift pro Aufruf) vs.
+ColumnarTokenLedger (NumPy, credit_many/debit_many)
+
+Aufruf: python -m benchmarks.ledger_batch [anzahl_buchungen] [anzahl_konten]
+"""
+import sys
+import time
+import numpy as np
+from tokens.columnar_ledger import ColumnarTokenLedger
+from tokens.ledger import TokenLedger
+
+
+def timed(book) -> float:
+    started = time.perf_counter()
+    book()
+    return time.perf_counter() - started
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    accounts = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    print(f"{count} Buchungen auf {accounts} Konten")
+    rng = np.random.default_rng(1)
+    indexes = rng.integers(0, accounts, count)
+    amounts = np.round(rng.uniform(1.0, 500.0, count), 3)
+    names = [f"node_{i:06d}" for i in indexes.tolist()]
+    amount_list = amounts.tolist()
+    
+    ledger = TokenLedger()
+    elapsed = timed(lambda: [ledger.credit_tokens(name, amount) for name, amount in zip(names, amount_list)])
+    print(f"  TokenLedger credit_tokens      {elapsed * 1000:9.1f} ms")
+    
+    columnar = ColumnarTokenLedger()
+    elapsed = timed(lambda: columnar.credit_many(names, amounts))
+    print(f"  Columnar credit_many (Namen)   {elapsed * 1000:9.1f} ms")
+    interned = columnar.intern(f"node_{i:06d}" for i in range(accounts))
+    elapsed = timed(lambda: columnar.credit_many(interned[indexes], amounts))
+    print(f"  Columnar credit_many (Indizes) {elapsed * 1000:9.1f} ms")
+    elapsed = timed(lambda: columnar.debit_many(interned[indexes], amounts))
+    print(f"  Columnar debit_many (Indizes)  {elapsed * 1000:9.1f} ms")
+    
+    assert columnar.root() == ledger.root()
+    assert abs(columnar.total_supply - 2 * ledger.total_supply) < 1e-6 * columnar.total_supply
+    elapsed = timed(ledger.get_all_balances)
+    print(f"  TokenLedger get_all_balances   {elapsed * 1000:9.1f} ms")
+    elapsed = timed(columnar.balance_view)
+    print(f"  Columnar balance_view          {elapsed * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
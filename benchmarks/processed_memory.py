@@ -0,0 +1,68 @@
+# benchmarks/processed_memory.py
+"""Speicherbedarf der gemintete-Transaktionen-Menge: Set[str] mit
+Hex-Hashes vs. ProcessedIndex (HashIndex + Bitmap)
+
+Gemessen werden Speicher, Membership-Checks und die gespeicherte Größe
+(JSON-Liste bzw. 32-Byte-Hashes im Snapshot vs. Bitmap über alle
+Transaktionen, von denen `anteil_gemintet` gemintet sind).
+
+Aufruf: python -m benchmarks.processed_memory [anzahl_transaktionen] [anteil_gemintet]
+"""
+import gc
+import hashlib
+import json
+import sys
+import time
+import tracemalloc
+from tokens.processed import ProcessedIndex
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def lookups(processed, tx_hashes) -> float:
+    started = time.perf_counter()
+    found = sum(1 for tx_hash in tx_hashes if tx_hash in processed)
+    elapsed = time.perf_counter() - started
+    assert found == len(processed)
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    share = float(sys.argv[2]) if len(sys.argv) > 2 else 0.9
+    digests = [hashlib.sha256(i.to_bytes(8, "little")).digest() for i in range(count)]
+    minted = [digest for i, digest in enumerate(digests) if i % 1000 < share * 1000]
+    print(f"{count} Transaktionen, davon {len(minted)} gemintet")
+    
+    # Wie im Minter: jeder Eintrag ist ein eigener Hex-String
+    old, old_bytes = measure(lambda: {digest.hex() for digest in minted})
+    new, new_bytes = measure(lambda: ProcessedIndex(digest.hex() for digest in minted))
+    print(f"  Set[str]        {old_bytes / 1e6:8.1f} MB  {old_bytes / len(minted):6.1f} B/TX")
+    print(f"  ProcessedIndex  {new_bytes / 1e6:8.1f} MB  {new_bytes / len(minted):6.1f} B/TX")
+    print(f"  Faktor:         {old_bytes / new_bytes:8.1f}x")
+    
+    tx_hashes = [digest.hex() for digest in digests]
+    print(f"  Lookup Set       {lookups(old, tx_hashes) / count * 1e9:7.0f} ns")
+    print(f"  Lookup Index     {lookups(new, tx_hashes) / count * 1e9:7.0f} ns")
+    
+    as_list = len(json.dumps(sorted(old)))
+    as_bitmap = len(json.dumps(new.to_state(digests)))
+    print(f"  JSON-Liste      {as_list / 1e6:8.2f} MB  {as_list / count:6.2f} B/TX")
+    print(f"  Snapshot alt    {32 * len(minted) / 1e6:8.2f} MB  {32 * len(minted) / count:6.2f} B/TX")
+    print(f"  Bitmap (Base64) {as_bitmap / 1e6:8.2f} MB  {as_bitmap / count:6.2f} B/TX")
+    
+    restored = ProcessedIndex()
+    restored.load_bitmap(digests, new.bitmap(digests))
+    assert len(restored) == len(old) and all(tx_hash in restored for tx_hash in old)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+# benchmarks/snapshot_load.py
+"""Kaltstart: JSON-Zustandsdatei vs. binärer Snapshot (unkomprimiert, zlib, lzma)
+
+Die CompactDAG übernimmt Snapshots spaltenweise und dekodiert Bodies erst
+beim Zugriff (mit und ohne BodyStore gemessen).
+
+Aufruf: python -m benchmarks.snapshot_load [anzahl_transaktionen]
+"""
+import os
+import sys
+import tempfile
+import time
+from orchestration.coordinator import Coordinator
+
+BATCH = 5_000
+
+
+def build(count: int) -> Coordinator:
+    coord = Coordinator()
+    for i in range(100):
+        coord.register_node(f"node_{i:04d}")
+    for start in range(0, count, BATCH):
+        coord.submit_energy_batch([
+            (f"node_{i % 100:04d}", float(i % 500) + 0.5, f"solar_panel_{i % 1000}")
+            for i in range(start, min(start + BATCH, count))
+        ])
+        coord.process_minting()
+    return coord
+
+
+def timed(load) -> float:
+    started = time.perf_counter()
+    load()
+    return time.perf_counter() - started
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{count} Transaktionen")
+    source = build(count)
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        source.save_state()
+        variants = [("JSON", Coordinator.STATE_FILE, None)]
+        for compression in (None, "zlib", "lzma"):
+            path = f"state-{compression or 'raw'}.snap"
+            source.save_snapshot(path, compression)
+            variants.append((f"binär {compression or 'roh'}", path, compression))
+        
+        engines = [
+            ("DAG", {}),
+            ("CompactDAG", {"compact_dag": True}),
+            ("CompactDAG + BodyStore", {"body_path": "bodies.bin"})
+        ]
+        for engine, options in engines:
+            print(f"  {engine}")
+            for name, path, compression in variants:
+                coord = Coordinator(**options)
+                if path == Coordinator.STATE_FILE:
+                    elapsed = timed(coord.load_state)
+                else:
+                    elapsed = timed(lambda: coord.load_snapshot(path))
+                assert len(coord.dag.transactions) == len(source.dag.transactions)
+                print(
+                    f"    {name:<12} {os.path.getsize(path) / 1e6:8.1f} MB"
+                    f"  {elapsed:7.2f} s  {count / elapsed:9.0f} TX/s"
+                )
+                coord.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,42 @@
+# benchmarks/tx_hashing.py
+"""Transaktionen pro Sekunde: Legacy-JSON-Hash vs. kanonische Binärkodierung
+
+Aufruf: python -m benchmarks.tx_hashing [anzahl]
+"""
+import sys
+import time
+from core.encoding import VERSION_BINARY, VERSION_LEGACY
+from core.transaction import Transaction
+
+PARENT1 = "ab" * 32
+PARENT2 = "cd" * 32
+
+
+def create(count: int, version: int) -> float:
+    started = time.perf_counter()
+    for i in range(count):
+        payload = {"type": "energy_contribution", "amount_kwh": i + 0.5, "source_id": "solar_panel_a"}
+        Transaction(payload, PARENT1, PARENT2, "node_solar_01", version=version)
+    return count / (time.perf_counter() - started)
+
+
+def rehash(count: int, version: int) -> float:
+    payload = {"type": "energy_contribution", "amount_kwh": 12.5, "source_id": "solar_panel_a"}
+    txs = [Transaction(payload, PARENT1, PARENT2, "node_solar_01", version=version) for _ in range(count)]
+    started = time.perf_counter()
+    for tx in txs:
+        # Cache verwerfen, damit jede Runde wirklich kodiert
+        tx._encoded = None
+        tx._compute_digest()
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"{count} Transaktionen")
+    for name, version in (("legacy (JSON)", VERSION_LEGACY), ("binary v1", VERSION_BINARY)):
+        print(f"  {name:<14} erstellen: {create(count, version):9.0f} TX/s   hashen: {rehash(count, version):9.0f} TX/s")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,9 +1,14 @@
 import cmd
 import atexit
+import shutil
 from orchestration.coordinator import Coordinator
 from compute.job import ComputeJob
+from orchestration.importer import ImportStats, ReadingImporter
 import os
 
+# Zustand als Write-Ahead-Log + Snapshot (eine bestehende atlas_state.json wird übernommen)
+JOURNAL_DIR = "atlas_wal"
+
 
 class AtlasCLI(cmd.Cmd):
     intro = "Willkommen bei Atlas Post-MVP CLI. Tippe 'help' oder '?' für Hilfe.\n"
@@ -11,7 +16,7 @@ class AtlasCLI(cmd.Cmd):
     
     def __init__(self):
         super().__init__()
-        self.coordinator = Coordinator()
+        self.coordinator = Coordinator(journal_dir=JOURNAL_DIR)
         self.current_node = None
         
         # Load existing state if available
@@ -24,7 +29,7 @@ class AtlasCLI(cmd.Cmd):
             print("🆕 Neues System gestartet")
         
         # Auto-save on exit
-        atexit.register(self.coordinator.save_state)
+        atexit.register(lambda: self.coordinator.save_state())
     
     def do_create_node(self, arg):
         """Erstelle einen Node: create_node <node_id>"""
@@ -82,6 +87,43 @@ class AtlasCLI(cmd.Cmd):
         except Exception as e:
             print(f"❌ Fehler beim Hinzufügen zur DAG: {e}")
     
+    def do_import(self, arg):
+        """Importiere Zählerstände aus JSONL (auch gzip): import <datei> [mint]"""
+        parts = arg.split()
+        if not parts:
+            print("❌ Fehler: Nutzung: import <datei> [mint]")
+            return
+        path = parts[0]
+        if not os.path.isfile(path):
+            print(f"❌ Fehler: Datei '{path}' nicht gefunden")
+            return
+        
+        # Fortsetzung nach Abbruch über den Checkpoint neben der Datei
+        checkpoint_path = path + ".checkpoint"
+        importer = ReadingImporter(
+            self.coordinator,
+            checkpoint_path=checkpoint_path,
+            mint="mint" in parts[1:],
+            progress=self._print_progress
+        )
+        try:
+            stats = importer.run(path)
+        except KeyboardInterrupt:
+            print(f"\n⏸️  Import abgebrochen, Fortsetzung ab Checkpoint '{checkpoint_path}'")
+            return
+        print(f"\n✅ {stats.accepted} Meldungen importiert ({stats.rate:.0f} Zeilen/s)")
+        for reason, count in sorted(stats.rejected.items()):
+            print(f"   abgelehnt ({reason}): {count}")
+        self.coordinator.save_state()
+    
+    @staticmethod
+    def _print_progress(stats: ImportStats):
+        print(
+            f"\r📥 {stats.lines} Zeilen, {stats.accepted} übernommen, {stats.rate:.0f} Zeilen/s",
+            end="",
+            flush=True
+        )
+    
     def do_confirm(self, arg):
         """Bestätige Transaktionen (simuliert Tip-Referenzierung)"""
         count = self.coordinator.confirm_transactions()
@@ -152,6 +194,18 @@ class AtlasCLI(cmd.Cmd):
             print(f"   Ergebnis: {result.get('result', 'none')}")
             self.coordinator.save_state()
     
+    def do_cancel_job(self, arg):
+        """Nimm wartenden Job aus der Warteschlange: cancel_job <job_id>"""
+        job_id = arg.strip()
+        if not job_id:
+            print("❌ Fehler: Nutzung: cancel_job <job_id>")
+            return
+        if self.coordinator.cancel_compute_job(job_id):
+            print(f"✅ Job '{job_id}' abgebrochen")
+            self.coordinator.save_state()
+        else:
+            print(f"❌ Job '{job_id}' wartet nicht")
+    
     def do_show_balances(self, arg):
         """Zeige Token-Balances aller Nodes"""
         balances = self.coordinator.ledger.get_all_balances()
@@ -199,9 +253,13 @@ class AtlasCLI(cmd.Cmd):
     
     def do_clear_state(self, arg):
         """Lösche gespeicherten Zustand und starte neu"""
+        self.coordinator.close()
         if os.path.exists(self.coordinator.STATE_FILE):
             os.remove(self.coordinator.STATE_FILE)
-        print("🗑️  Zustand gelöscht. Starte neu mit 'quit' und erneutem Start.")
+        shutil.rmtree(JOURNAL_DIR, ignore_errors=True)
+        self.coordinator = Coordinator(journal_dir=JOURNAL_DIR)
+        self.current_node = None
+        print("🗑️  Zustand gelöscht. Die Sitzung läuft mit leerem Zustand weiter.")
     
     def default(self, line):
         if line.strip():
@@ -0,0 +1,68 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from compute.job import ComputeJob
+from tokens.ledger import TokenLedger
+
+
+class TokenEscrow:
+    """Beim Einreichen reservierte Job-Kosten.
+    
+    `reserve` bucht die Kosten sofort vom Konto ab, sodass wartende und
+    laufende Jobs dasselbe Guthaben nicht mehrfach verplanen können.
+    `settle` behält sie nach erfolgreicher Ausführung ein (die Abbuchung
+    bleibt bestehen), `refund` bucht sie bei Abbruch, Fehler oder Timeout
+    zurück, ohne die Gesamtmenge zu verändern.
+    """
+    
+    def __init__(self, ledger: TokenLedger):
+        self.ledger = ledger
+        self._held: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._held)
+    
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._held
+    
+    def reserve(self, job: ComputeJob, at: Optional[float] = None) -> bool:
+        with self._lock:
+            if job.job_id in self._held:
+                return False
+            if not self.ledger.debit_tokens(job.node_id, job.token_cost, at):
+                return False
+            self._held[job.job_id] = (job.node_id, job.token_cost)
+        return True
+    
+    def hold(self, job_id: str, node_id: str, amount: float) -> None:
+        """Reservierung ohne Abbuchung eintragen (Wiederherstellung)"""
+        with self._lock:
+            self._held[job_id] = (node_id, amount)
+    
+    def settle(self, job_id: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            return self._held.pop(job_id, None)
+    
+    def refund(self, job_id: str, at: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            held = self._held.pop(job_id, None)
+            if held is not None:
+                self.ledger.refund_tokens(held[0], held[1], at)
+        return held
+    
+    def held(self, node_id: Optional[str] = None) -> float:
+        """Reservierte Tokens einer Node (ohne node_id: insgesamt)"""
+        with self._lock:
+            return sum(amount for owner, amount in self._held.values() if node_id is None or owner == node_id)
+    
+    def job_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._held)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {job_id: [node_id, amount] for job_id, (node_id, amount) in self._held.items()}
+    
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._held = {job_id: (node_id, amount) for job_id, (node_id, amount) in data.items()}
\ No newline at end of file
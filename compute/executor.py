@@ -1,29 +1,210 @@
 import hashlib
-from typing import Any, Dict
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait
+)
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 from compute.job import ComputeJob
 from tokens.ledger import TokenLedger
 
+# Blockgröße der Rechenrunden; ab 2048 Bytes gibt hashlib den GIL frei
+WORK_BLOCK = 4096
+
+
+def run_payload(payload: Any) -> int:
+    """Die eigentliche Berechnung (modulweit, damit sie im Prozess-Pool läuft).
+    
+    `rounds` im Payload verlangt zusätzlich so viele SHA-256-Runden über
+    WORK_BLOCK Bytes (echte Rechenlast, etwa für Benchmarks).
+    """
+    # DETERMINISTISCHER HASH (über Prozess-Neustarts hinweg konsistent)
+    if isinstance(payload, dict):
+        payload_str = str(sorted(payload.items()))
+        rounds = int(payload.get("rounds", 0))
+    else:
+        payload_str = str(payload)
+        rounds = 0
+    digest = hashlib.sha256(payload_str.encode()).digest()
+    if rounds > 0:
+        block = bytes(WORK_BLOCK)
+        for _ in range(rounds):
+            digest = hashlib.sha256(digest + block).digest()
+    return int.from_bytes(digest[:4], "big") % 1000000
+
+
+def run_chunk(payloads: List[Any]) -> List[Tuple[bool, Any]]:
+    """Führt einen Chunk aus; pro Job (True, Ergebnis) oder (False, Fehler)"""
+    results = []
+    for payload in payloads:
+        try:
+            results.append((True, run_payload(payload)))
+        except Exception as error:
+            results.append((False, repr(error)))
+    return results
+
 
 class ComputeExecutor:
-    def __init__(self, ledger: TokenLedger):
+    """Führt Compute-Jobs aus: direkt (`execute_job`) oder auf einem Pool.
+    
+    Im Pool-Modus verteilt `dispatch` Jobs in Chunks auf einen Thread- oder
+    Prozess-Pool mit `workers` Plätzen: ein Future pro Chunk statt pro Job,
+    damit Übergabe und Serialisierung sich auf viele Jobs verteilen. Ein
+    Chunk umfasst höchstens `CHUNK_SIZE` Jobs; bei wenig Last werden sie
+    kleiner, damit alle Worker etwas bekommen. Pro freiem Worker
+    stehen bis zu `IN_FLIGHT` Chunks an, damit kein Worker zwischen zwei
+    poll()-Aufrufen leerläuft.
+    
+    `poll` liefert fertige Jobs ohne zu blockieren, ebenso die Jobs eines
+    Chunks, der länger als `timeout` Sekunden pro Job läuft. Als Start gilt
+    das Einreichen oder, falls später, das letzte Chunk-Ende davor: ein
+    wartender Chunk beginnt erst, wenn ein Worker frei wird. Ein laufender Worker lässt
+    sich nicht abbrechen: sein Ergebnis wird verworfen, der Worker zählt
+    aber bis zum tatsächlichen Ende als belegt (`free_slots`, `stuck`),
+    damit keine weiteren Jobs hinter ihm anstehen. Abrechnung und
+    Rückerstattung übernimmt der Aufrufer.
+    """
+    
+    IN_FLIGHT = 4
+    CHUNK_SIZE = 64
+    
+    def __init__(
+        self,
+        ledger: TokenLedger,
+        workers: Optional[int] = None,
+        use_processes: bool = False,
+        timeout: Optional[float] = None
+    ):
         self.ledger = ledger
+        self.workers = workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+        # Future → [Jobs des Chunks, eingereicht, Start (None = noch nicht laufend gesehen)]
+        self._chunks: Dict[Future, list] = {}
+        self._in_flight = 0
+        self._finished: Deque[Future] = deque()
+        self._last_done = 0.0
+        # Als Timeout gemeldet, aber noch nicht beendet (belegen einen Worker)
+        self._abandoned: Set[Future] = set()
+        self._lock = threading.Lock()
     
-    def execute_job(self, job: ComputeJob) -> Dict[str, Any]:
-        if not self.ledger.debit_tokens(job.node_id, job.token_cost):
+    def execute_job(self, job: ComputeJob, at: Optional[float] = None, escrowed: bool = False) -> Dict[str, Any]:
+        """Führt den Job im aufrufenden Thread aus; `escrowed`: Kosten sind schon reserviert"""
+        if not escrowed and not self.ledger.debit_tokens(job.node_id, job.token_cost, at):
             return {"error": "insufficient_balance", "job_id": job.job_id}
-        
-        # DETERMINISTISCHER HASH (über Prozess-Neustarts hinweg konsistent)
-        if isinstance(job.payload, dict):
-            payload_str = str(sorted(job.payload.items()))
-        else:
-            payload_str = str(job.payload)
-        payload_hash = hashlib.sha256(payload_str.encode()).hexdigest()
-        result_value = int(payload_hash[:8], 16) % 1000000
-        
-        result = {
+        return self._result(job, run_payload(job.payload))
+    
+    @staticmethod
+    def _result(job: ComputeJob, value: int) -> Dict[str, Any]:
+        return {
             "job_id": job.job_id,
             "node_id": job.node_id,
             "status": "completed",
-            "result": result_value
+            "result": value
         }
-        return result
\ No newline at end of file
+    
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            pool_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.workers)
+        return self._pool
+    
+    def _active_workers(self) -> int:
+        return max(0, self.workers - len(self._abandoned))
+    
+    def free_slots(self) -> int:
+        """Wie viele Jobs `dispatch` jetzt annehmen sollte"""
+        with self._lock:
+            return max(0, self._active_workers() * self.IN_FLIGHT * self.CHUNK_SIZE - self._in_flight)
+    
+    def stuck(self) -> int:
+        """Worker, die noch an abgelaufenen Chunks rechnen"""
+        return len(self._abandoned)
+    
+    def running(self) -> int:
+        return self._in_flight
+    
+    def dispatch(self, jobs: List[ComputeJob]) -> None:
+        if not jobs:
+            return
+        # Nach der gesamten Last bemessen, nicht nach diesem Aufruf: sonst
+        # schrumpfen die Chunks beim Nachfüllen einzelner freier Plätze
+        chunks = max(1, self._active_workers()) * self.IN_FLIGHT
+        size = min(self.CHUNK_SIZE, max(1, math.ceil((self._in_flight + len(jobs)) / chunks)))
+        pool = self._executor()
+        for start in range(0, len(jobs), size):
+            chunk = jobs[start:start + size]
+            future = pool.submit(run_chunk, [job.payload for job in chunk])
+            with self._lock:
+                self._chunks[future] = [chunk, time.monotonic(), None]
+                self._in_flight += len(chunk)
+            # Erst nach dem Eintragen: poll() kennt jeden gemeldeten Future
+            future.add_done_callback(self._done)
+    
+    def _done(self, future: Future) -> None:
+        self._last_done = time.monotonic()
+        self._finished.append(future)
+    
+    def poll(self, timeout: float = 0.0) -> List[Tuple[ComputeJob, Dict[str, Any]]]:
+        """Fertige und überfällige Jobs mit Ergebnis bzw. {"error", "job_id"}.
+        
+        Mit `timeout` > 0 wird höchstens so lange auf den ersten fertigen Chunk gewartet.
+        """
+        if timeout > 0 and not self._finished:
+            with self._lock:
+                futures = list(self._chunks)
+            if futures:
+                wait(futures, timeout, return_when=FIRST_COMPLETED)
+        outcomes = []
+        with self._lock:
+            while self._finished:
+                future = self._finished.popleft()
+                if future in self._abandoned:
+                    # Schon als Timeout gemeldet; der Worker ist jetzt frei
+                    self._abandoned.discard(future)
+                    continue
+                jobs = self._chunks.pop(future)[0]
+                self._in_flight -= len(jobs)
+                try:
+                    results = future.result()
+                except (Exception, CancelledError) as error:
+                    results = [(False, repr(error))] * len(jobs)
+                for job, (ok, value) in zip(jobs, results):
+                    if ok:
+                        outcomes.append((job, self._result(job, value)))
+                    else:
+                        outcomes.append((job, {"error": "job_failed", "job_id": job.job_id, "detail": value}))
+            if self.timeout is not None:
+                outcomes.extend(self._expire(time.monotonic()))
+        return outcomes
+    
+    def _expire(self, now: float) -> List[Tuple[ComputeJob, Dict[str, Any]]]:
+        outcomes = []
+        for future, entry in list(self._chunks.items()):
+            jobs, submitted, started = entry
+            if started is None:
+                if not future.running():
+                    continue
+                started = entry[2] = max(submitted, self._last_done)
+            if future.done() or now - started <= self.timeout * len(jobs):
+                continue
+            del self._chunks[future]
+            self._in_flight -= len(jobs)
+            self._abandoned.add(future)
+            outcomes.extend((job, {"error": "timeout", "job_id": job.job_id}) for job in jobs)
+        return outcomes
+    
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 @dataclass
@@ -8,11 +8,17 @@ class ComputeJob:
     node_id: str
     token_cost: float
     payload: Dict[str, Any]
+    # Höhere Priorität wird zuerst ausgeführt
+    priority: int = 0
+    # Spätester Startzeitpunkt (Unix-Zeit); danach wird der Job verworfen
+    deadline: Optional[float] = None
     
     def is_valid(self) -> bool:
         return (
             bool(self.job_id) and
             bool(self.node_id) and
             self.token_cost > 0 and
-            isinstance(self.payload, dict)
+            isinstance(self.payload, dict) and
+            isinstance(self.priority, int) and
+            (self.deadline is None or isinstance(self.deadline, (int, float)))
         )
\ No newline at end of file
@@ -1,25 +1,168 @@
-from typing import List, Optional
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 from compute.job import ComputeJob
 from tokens.ledger import TokenLedger
 
+# Heap-Eintrag: [-Priorität, Tag, Deadline (inf = keine), Folgenummer, Job oder None]
+_PRIORITY, _TAG, _DEADLINE, _SEQ, _JOB = range(5)
+
 
 class JobScheduler:
-    def __init__(self, ledger: TokenLedger):
+    """Priorisierte, faire Warteschlange über einen Heap.
+    
+    Reihenfolge: höhere `priority` zuerst, innerhalb einer Priorität nach
+    Weighted Fair Queueing über die node_ids (Self-Clocked Fair Queueing):
+    Jeder Job erhält beim Einreihen ein virtuelles Ende
+    `max(virtual_time, letztes Ende der Node) + token_cost / Gewicht`, und
+    `virtual_time` folgt dem Tag des zuletzt entnommenen Jobs. Eine Node
+    mit vielen Jobs kann die anderen so nicht aushungern; `weights` teilt
+    Nodes einen größeren Anteil zu. Bei gleichem Tag entscheidet die
+    frühere Deadline, dann die Einreihung.
+    
+    Einreihen und Entnehmen kosten O(log n), unabhängig von der Länge der
+    Warteschlange. Abbrechen per job_id ist O(1): der Eintrag wird nur
+    markiert und beim Entnehmen übersprungen; überwiegen die Markierungen,
+    wird der Heap neu aufgebaut. Jobs, deren Deadline beim Entnehmen
+    verstrichen ist, landen in `take_expired()` statt bei der Ausführung.
+    Eine job_id kann nur einmal gleichzeitig in der Warteschlange stehen.
+    """
+    
+    DEFAULT_WEIGHT = 1.0
+    # Unterhalb dieser Größe lohnt kein Neuaufbau für markierte Einträge
+    REBUILD_MIN = 1024
+    
+    def __init__(self, ledger: TokenLedger, weights: Optional[Dict[str, float]] = None):
         self.ledger = ledger
-        self.job_queue: List[ComputeJob] = []
+        self.weights: Dict[str, float] = dict(weights or {})
+        self.virtual_time = 0.0
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._finish: Dict[str, float] = {}
+        self._expired: List[ComputeJob] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+    
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._entries
+    
+    @property
+    def job_queue(self) -> List[ComputeJob]:
+        """Alle wartenden Jobs in Ausführungsreihenfolge"""
+        return [job for job, _ in self.queued()]
+    
+    def queued(self) -> List[Tuple[ComputeJob, float]]:
+        """(Job, Tag) in Ausführungsreihenfolge; so gespeichert, stellt
+        `restore_job` dieselbe Reihenfolge wieder her"""
+        with self._lock:
+            entries = sorted(self._entries.values())
+        return [(entry[_JOB], entry[_TAG]) for entry in entries]
+    
+    def set_weight(self, node_id: str, weight: float) -> None:
+        """Anteil der Node; wirkt auf Jobs, die danach eingereiht werden"""
+        with self._lock:
+            self.weights[node_id] = weight
     
     def submit_job(self, job: ComputeJob) -> bool:
         if not job.is_valid():
             return False
         if self.ledger.get_balance(job.node_id) < job.token_cost:
             return False
-        self.job_queue.append(job)
+        with self._lock:
+            if job.job_id in self._entries:
+                return False
+            self._push(job, None)
         return True
     
-    def get_next_job(self) -> Optional[ComputeJob]:
-        if not self.job_queue:
+    def restore_job(self, job: ComputeJob, tag: Optional[float] = None) -> bool:
+        """Reiht einen gespeicherten Job ohne Guthabenprüfung ein.
+        
+        Mit `tag` behält er seinen Platz; ohne (ältere Zustände) wird er wie
+        beim Einreichen neu eingeordnet.
+        """
+        with self._lock:
+            if job.job_id in self._entries:
+                return False
+            self._push(job, tag)
+        return True
+    
+    def tag_of(self, job_id: str) -> Optional[float]:
+        entry = self._entries.get(job_id)
+        return entry[_TAG] if entry is not None else None
+    
+    def _push(self, job: ComputeJob, tag: Optional[float]) -> None:
+        if tag is None:
+            weight = self.weights.get(job.node_id, self.DEFAULT_WEIGHT)
+            tag = max(self.virtual_time, self._finish.get(job.node_id, 0.0)) + job.token_cost / weight
+        self._finish[job.node_id] = max(self._finish.get(job.node_id, 0.0), tag)
+        deadline = math.inf if job.deadline is None else job.deadline
+        entry = [-job.priority, tag, deadline, next(self._seq), job]
+        self._entries[job.job_id] = entry
+        heapq.heappush(self._heap, entry)
+    
+    def get_next_job(self, now: Optional[float] = None) -> Optional[ComputeJob]:
+        """Entnimmt den nächsten Job; abgelaufene wandern nach `take_expired()`"""
+        now = time.time() if now is None else now
+        with self._lock:
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                job = entry[_JOB]
+                if job is None:
+                    continue
+                del self._entries[job.job_id]
+                if entry[_DEADLINE] < now:
+                    self._expired.append(job)
+                    continue
+                self.virtual_time = max(self.virtual_time, entry[_TAG])
+                return job
             return None
-        return self.job_queue.pop(0)
+    
+    def complete_job(self, job_id: str) -> Optional[ComputeJob]:
+        """Entnimmt einen bestimmten Job wie get_next_job (Replay des Journals)"""
+        with self._lock:
+            entry = self._remove(job_id)
+            if entry is None:
+                return None
+            self.virtual_time = max(self.virtual_time, entry[_TAG])
+            return entry[_JOB]
+    
+    def cancel_job(self, job_id: str) -> Optional[ComputeJob]:
+        """Nimmt einen wartenden Job heraus; None, wenn er nicht wartet"""
+        with self._lock:
+            entry = self._remove(job_id)
+            return entry[_JOB] if entry is not None else None
+    
+    def _remove(self, job_id: str) -> Optional[list]:
+        entry = self._entries.pop(job_id, None)
+        if entry is None:
+            return None
+        removed = list(entry)
+        entry[_JOB] = None
+        if len(self._heap) > max(2 * len(self._entries), self.REBUILD_MIN):
+            self._heap = [entry for entry in self._heap if entry[_JOB] is not None]
+            heapq.heapify(self._heap)
+        return removed
+    
+    def take_expired(self) -> List[ComputeJob]:
+        """Seit dem letzten Aufruf wegen verstrichener Deadline verworfene Jobs"""
+        with self._lock:
+            expired, self._expired = self._expired, []
+        return expired
+    
+    def restore(self, jobs: Iterable[Tuple[ComputeJob, Optional[float]]], virtual_time: float = 0.0) -> None:
+        """Ersetzt die Warteschlange durch gespeicherte (Job, Tag)-Paare"""
+        with self._lock:
+            self._heap = []
+            self._entries = {}
+            self._finish = {}
+            self._expired = []
+            self.virtual_time = virtual_time
+            for job, tag in jobs:
+                if job.job_id not in self._entries:
+                    self._push(job, tag)
     
     def get_queue_length(self) -> int:
-        return len(self.job_queue)
\ No newline at end of file
+        return len(self._entries)
\ No newline at end of file
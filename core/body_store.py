@@ -0,0 +1,65 @@
+import os
+from collections import OrderedDict
+from typing import Tuple
+from core.encoding import Buffer
+
+
+class BodyStore:
+    """Append-only Datei für Transaktions-Bodies (kanonische Kodierung).
+    
+    Bodies werden über (Offset, Länge) adressiert und bei Bedarf per
+    `os.pread` gelesen; zuletzt gelesene oder geschriebene Bodies hält ein
+    kleiner LRU-Cache. Die Datei ist nur ein Auslagerungsbereich: der
+    Zustand wird aus Journal oder Snapshot wiederhergestellt, daher wird
+    sie beim Öffnen geleert.
+    """
+    
+    CACHE_SIZE = 4096
+    
+    def __init__(self, path: str, cache_size: int = CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self._file = open(path, "w+b")
+        self._size = 0
+        self._flushed = 0
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def append(self, body: bytes) -> Tuple[int, int]:
+        """Hängt einen Body an und liefert (Offset, Länge)"""
+        offset = self._size
+        self._file.write(body)
+        self._size += len(body)
+        self._remember(offset, body)
+        return offset, len(body)
+    
+    def append_block(self, data: Buffer) -> int:
+        """Hängt viele Bodies am Stück an (ohne Cache); liefert den Start-Offset"""
+        offset = self._size
+        self._file.write(data)
+        self._size += len(data)
+        return offset
+    
+    def read(self, offset: int, length: int) -> bytes:
+        body = self._cache.get(offset)
+        if body is not None:
+            self._cache.move_to_end(offset)
+            return body
+        if offset + length > self._flushed:
+            self._file.flush()
+            self._flushed = self._size
+        body = os.pread(self._file.fileno(), length, offset)
+        self._remember(offset, body)
+        return body
+    
+    def _remember(self, offset: int, body: bytes) -> None:
+        self._cache[offset] = body
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        self._cache.clear()
\ No newline at end of file
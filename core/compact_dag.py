@@ -0,0 +1,641 @@
+import operator
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from core.body_store import BodyStore
+from core.dag import DAG
+from core.encoding import Buffer, decode_transaction, read_timestamp
+from core.transaction import Transaction
+
+if TYPE_CHECKING:
+    from storage.sqlite_store import TransactionBodies
+
+
+HASH_SIZE = 32
+NO_ID = -1
+
+
+class HashIndex:
+    """Interniert 32-Byte-Hashes zu dichten Integer-IDs.
+    
+    Die Digests liegen hintereinander in einem bytearray, die Hash-Tabelle
+    (offene Adressierung, lineares Sondieren) speichert nur `id + 1`.
+    Pro Transaktion fallen so ca. 48 Bytes an statt eines Dict-Eintrags
+    mit 64-Zeichen-String.
+    """
+    
+    def __init__(self):
+        self.digests = bytearray()
+        self._table = array('q', [0]) * 16
+        self._mask = 15
+    
+    def __len__(self) -> int:
+        return len(self.digests) // HASH_SIZE
+    
+    def _slot(self, digest: bytes) -> int:
+        table = self._table
+        digests = self.digests
+        mask = self._mask
+        slot = int.from_bytes(digest[:8], "little") & mask
+        while True:
+            entry = table[slot]
+            if entry == 0:
+                return slot
+            start = (entry - 1) * HASH_SIZE
+            if digests[start:start + HASH_SIZE] == digest:
+                return slot
+            slot = (slot + 1) & mask
+    
+    def lookup(self, digest: bytes) -> int:
+        entry = self._table[self._slot(digest)]
+        return entry - 1 if entry else NO_ID
+    
+    def intern(self, digest: bytes) -> int:
+        slot = self._slot(digest)
+        entry = self._table[slot]
+        if entry:
+            return entry - 1
+        tx_id = len(self)
+        self.digests += digest
+        self._table[slot] = tx_id + 1
+        if 2 * len(self) > len(self._table):
+            self._grow()
+        return tx_id
+    
+    def digest(self, tx_id: int) -> bytes:
+        start = tx_id * HASH_SIZE
+        return bytes(self.digests[start:start + HASH_SIZE])
+    
+    @classmethod
+    def from_digests(cls, digests: Buffer) -> "HashIndex":
+        """Index über aneinandergereihte, eindeutige Digests (IDs in Reihenfolge)"""
+        index = cls()
+        index.digests = bytearray(digests)
+        size = 16
+        while size < 2 * len(index):
+            size *= 2
+        index._rebuild(size)
+        return index
+    
+    def _grow(self) -> None:
+        self._rebuild(2 * len(self._table))
+    
+    def _rebuild(self, size: int) -> None:
+        self._table = array('q', [0]) * size
+        self._mask = size - 1
+        for tx_id in range(len(self)):
+            self._table[self._slot(self.digest(tx_id))] = tx_id + 1
+
+
+class StringTable:
+    """Interniert wiederkehrende Strings (Node-IDs, Quellen, Payload-Typen)"""
+    
+    def __init__(self):
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+    
+    def intern(self, value: str) -> int:
+        index = self._ids.get(value)
+        if index is None:
+            index = len(self.values)
+            self._ids[value] = index
+            self.values.append(value)
+        return index
+
+
+class CompactDAG(DAG):
+    """Array-basierte Speicher-Engine hinter der DAG-Schnittstelle.
+    
+    - Hashes werden zu dichten IDs interniert (HashIndex)
+    - Eltern liegen in zwei array('q')-Spalten, -1 steht für Genesis
+    - Kinder als Adjazenz-Array: first_child pro Knoten, verkettete Kanten
+    - Tiefe und Gewicht liegen in array('i')
+    - Energie-Payloads werden in Spalten zerlegt; Transaction-Objekte
+      entstehen erst beim Zugriff über `transactions`
+    - mit `body_path` bleiben nur Struktur und Zeitstempel im Speicher,
+      die Bodies liegen in einem BodyStore und werden bei Bedarf gelesen
+    - mit `body_table` ebenso, die Bodies kommen dann per Digest aus der
+      SQLite-Tabelle `transactions` (TransactionBodies)
+    - aus einem Snapshot geladene Transaktionen bleiben kodiert
+      (`restore_encoded`) und werden erst beim Zugriff dekodiert
+    - geprunte Zeilen werden nur als gelöscht markiert; die Spalten werden
+      erst neu aufgebaut, wenn mehr als COMPACT_RATIO der Zeilen gelöscht sind
+    
+    `transactions`, `parents`, `children`, `confirmations` und `weights`
+    sind Mapping-Sichten mit Hex-Schlüsseln, damit bestehender Code
+    unverändert funktioniert.
+    """
+    
+    COMPACT_RATIO = 0.25
+    
+    def __init__(
+        self,
+        *args,
+        body_path: Optional[str] = None,
+        body_cache: int = BodyStore.CACHE_SIZE,
+        body_table: Optional["TransactionBodies"] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self._bodies = BodyStore(body_path, body_cache) if body_path and body_table is None else None
+        self._body_table = body_table
+        self._body_offsets = array('q')
+        self._body_lengths = array('i')
+        self._index = HashIndex()
+        self._strings = StringTable()
+        self._parent1 = array('q')
+        self._parent2 = array('q')
+        self._first_child = array('q')
+        self._edge_child = array('q')
+        self._edge_next = array('q')
+        self._depth = array('i')
+        self._weight = array('i')
+        self._timestamps = array('q')
+        self._node_ids = array('i')
+        self._types = array('i')
+        self._amounts = array('d')
+        self._sources = array('i')
+        self._versions = bytearray()
+        # Selten belegte Felder: nicht-standardisierte Payloads und Signaturen
+        self._extra_payloads: Dict[int, Dict[str, Any]] = {}
+        self._signatures: Dict[int, str] = {}
+        # Original-Eltern von Transaktionen, deren Eltern gepruned wurden
+        self._parent_hashes: Dict[int, Tuple[str, str]] = {}
+        # Kodierte Bodies aus restore_encoded (ohne BodyStore): Block und
+        # Offset pro Zeile, NO_ID für später eingefügte Transaktionen
+        self._snapshot_table: Optional[bytes] = None
+        self._snapshot_offsets = array('q')
+        # Tombstones: 1 = gepruned, Digest und Spalten bleiben bis _compact
+        self._deleted = bytearray()
+        self._deleted_count = 0
+        
+        self.transactions = _TransactionView(self)
+        self.parents = _ParentsView(self)
+        self.children = _ChildrenView(self)
+        self.confirmations = _ColumnView(self, self._depth)
+        self.weights = _ColumnView(self, self._weight)
+    
+    def _lookup(self, tx_hash: Any) -> int:
+        if not isinstance(tx_hash, str) or len(tx_hash) != 2 * HASH_SIZE:
+            return NO_ID
+        try:
+            tx_id = self._index.lookup(bytes.fromhex(tx_hash))
+        except ValueError:
+            return NO_ID
+        if tx_id != NO_ID and self._deleted[tx_id]:
+            return NO_ID
+        return tx_id
+    
+    def _live_ids(self) -> Iterator[int]:
+        deleted = self._deleted
+        if not self._deleted_count:
+            return iter(range(len(deleted)))
+        return (tx_id for tx_id in range(len(deleted)) if not deleted[tx_id])
+    
+    def _can_add(self, tx: Transaction, tx_hash: str) -> bool:
+        # Gelöschte Zeilen halten ihren Digest bis _compact im Index
+        if self._index.lookup(tx.digest) != NO_ID:
+            return False
+        return super()._can_add(tx, tx_hash)
+    
+    def _parent_id(self, tx_hash: str) -> int:
+        if tx_hash == self.GENESIS_HASH:
+            return NO_ID
+        return self._lookup(tx_hash)
+    
+    def _hex(self, tx_id: int) -> str:
+        if tx_id == NO_ID:
+            return self.GENESIS_HASH
+        return self._index.digest(tx_id).hex()
+    
+    def _store(self, tx: Transaction) -> None:
+        tx_id = self._append(tx, self._parent_id(tx.parent1), self._parent_id(tx.parent2))
+        if self.pruned and self._link_pruned(tx):
+            self._parent_hashes[tx_id] = (tx.parent1, tx.parent2)
+    
+    def _append(self, tx: Transaction, parent1: int, parent2: int) -> int:
+        tx_id = self._index.intern(tx.digest)
+        
+        self._parent1.append(parent1)
+        self._parent2.append(parent2)
+        self._first_child.append(NO_ID)
+        self._deleted.append(0)
+        self._depth.append(0)
+        self._weight.append(0)
+        if parent1 != NO_ID:
+            self._add_edge(parent1, tx_id)
+        if parent2 != NO_ID and parent2 != parent1:
+            self._add_edge(parent2, tx_id)
+        
+        self._timestamps.append(tx.timestamp)
+        if self._body_table is not None:
+            self._body_table.remember(tx.digest, tx.encoded())
+            return tx_id
+        if self._bodies is not None:
+            offset, length = self._bodies.append(tx.encoded())
+            self._body_offsets.append(offset)
+            self._body_lengths.append(length)
+            return tx_id
+        if self._snapshot_table is not None:
+            self._snapshot_offsets.append(NO_ID)
+        self._versions.append(tx.version)
+        self._node_ids.append(self._strings.intern(tx.node_id))
+        if tx.extra is None:
+            self._types.append(self._strings.intern(tx.type))
+            self._amounts.append(tx.amount_kwh)
+            self._sources.append(self._strings.intern(tx.source_id))
+        else:
+            self._types.append(NO_ID)
+            self._amounts.append(0.0)
+            self._sources.append(NO_ID)
+            self._extra_payloads[tx_id] = tx.extra
+        if tx.signature is not None:
+            self._signatures[tx_id] = tx.signature
+        return tx_id
+    
+    def export_columns(self) -> Tuple[List[Transaction], array, array, array, array, array]:
+        if self._deleted_count:
+            # Positionen müssen dicht sein
+            self._compact()
+        transactions = [self._materialize(tx_id) for tx_id in range(len(self._index))]
+        tips = array('q', (self._parent_id(tx_hash) for tx_hash in self.tips))
+        return (
+            transactions,
+            array('q', self._parent1),
+            array('q', self._parent2),
+            array('i', self._depth),
+            array('i', self._weight),
+            tips
+        )
+    
+    def restore_columns(
+        self,
+        transactions: List[Transaction],
+        parent1: Sequence[int],
+        parent2: Sequence[int],
+        depths: Sequence[int],
+        weights: Sequence[int],
+        tips: Sequence[int],
+        pruned: Dict[str, int]
+    ) -> None:
+        """Wie DAG.restore_columns; die Positionen sind hier direkt die IDs"""
+        genesis = self.GENESIS_HASH
+        for tx, first, second in zip(transactions, parent1, parent2):
+            tx_id = self._append(tx, first, second)
+            if first == NO_ID and tx.parent1 != genesis or second == NO_ID and tx.parent2 != genesis:
+                self._parent_hashes[tx_id] = (tx.parent1, tx.parent2)
+        self._depth[:] = array('i', depths)
+        self._weight[:] = array('i', weights)
+        self._restore_common(transactions, [tx.hash for tx in transactions], tips, pruned)
+    
+    def restore_encoded(
+        self,
+        table: Buffer,
+        offsets: Sequence[int],
+        digests: Buffer,
+        parent1: Sequence[int],
+        parent2: Sequence[int],
+        depths: Sequence[int],
+        weights: Sequence[int],
+        tips: Sequence[int],
+        pruned: Dict[str, int]
+    ) -> None:
+        """Wie DAG.restore_encoded, aber ohne die Transaktionen zu dekodieren.
+        
+        Digests, Eltern, Tiefen und Gewichte werden spaltenweise kopiert.
+        Die Bodies bleiben kodiert: mit BodyStore landen sie in einem Stück
+        in der Body-Datei, sonst bleibt der Block im Speicher. Vorab dekodiert
+        werden nur Transaktionen ohne Eltern-ID, und nur wenn `pruned` zeigt,
+        dass darunter geprunte Eltern sein können.
+        """
+        if self._body_table is not None:
+            # Die Bodies gehören in die Tabelle, nicht in einen Block
+            super().restore_encoded(table, offsets, digests, parent1, parent2, depths, weights, tips, pruned)
+            return
+        count = len(offsets) - 1
+        self._index = HashIndex.from_digests(digests)
+        self._parent1[:] = array('q', parent1)
+        self._parent2[:] = array('q', parent2)
+        self._depth[:] = array('i', depths)
+        self._weight[:] = array('i', weights)
+        self._first_child[:] = array('q', [NO_ID]) * count
+        self._deleted[:] = bytes(count)
+        for tx_id in range(count):
+            first = self._parent1[tx_id]
+            second = self._parent2[tx_id]
+            if first != NO_ID:
+                self._add_edge(first, tx_id)
+            if second != NO_ID and second != first:
+                self._add_edge(second, tx_id)
+        
+        starts = array('q', offsets[:count])
+        if self._bodies is not None:
+            base = self._bodies.append_block(table[offsets[0]:offsets[count]])
+            self._body_offsets[:] = array('q', (start + base - offsets[0] for start in starts))
+            self._body_lengths[:] = array('i', map(operator.sub, offsets[1:count + 1], starts))
+            placeholders = ()
+        else:
+            self._snapshot_table = bytes(table) if count else None
+            self._snapshot_offsets[:] = starts
+            self._versions += bytes(count)
+            placeholders = (self._node_ids, self._types, self._amounts, self._sources)
+        for column in placeholders:
+            column.frombytes(bytes(column.itemsize * count))
+        # Zeitstempel direkt aus den Bodies (für Pruner-Alter ohne Dekodieren)
+        self._timestamps[:] = array('q', (read_timestamp(table, start) for start in starts))
+        
+        genesis = self.GENESIS_HASH
+        for tx_id in range(count if pruned else 0):
+            if self._parent1[tx_id] == NO_ID or self._parent2[tx_id] == NO_ID:
+                tx = self._materialize(tx_id)
+                if tx.parent1 != genesis and self._parent1[tx_id] == NO_ID or tx.parent2 != genesis and self._parent2[tx_id] == NO_ID:
+                    self._parent_hashes[tx_id] = (tx.parent1, tx.parent2)
+        self._restore_tips((self._hex(tip) for tip in tips), pruned)
+        if self.reachability is not None:
+            for tx_id in range(count):
+                self.reachability.add(self._hex(tx_id), self._original_parents(tx_id))
+    
+    def timestamp(self, tx_hash: str) -> int:
+        """Zeitstempel aus der Spalte, ohne den Body zu laden"""
+        tx_id = self._lookup(tx_hash)
+        if tx_id == NO_ID:
+            raise KeyError(tx_hash)
+        return self._timestamps[tx_id]
+    
+    def _original_parents(self, tx_id: int) -> Tuple[str, str]:
+        parents = self._parent_hashes.get(tx_id)
+        if parents is None:
+            parents = self._hex(self._parent1[tx_id]), self._hex(self._parent2[tx_id])
+        return parents
+    
+    def _add_edge(self, parent_id: int, child_id: int) -> None:
+        self._edge_child.append(child_id)
+        self._edge_next.append(self._first_child[parent_id])
+        self._first_child[parent_id] = len(self._edge_child) - 1
+    
+    def _child_ids(self, tx_id: int) -> List[int]:
+        result = []
+        deleted = self._deleted
+        edge = self._first_child[tx_id]
+        while edge != NO_ID:
+            child = self._edge_child[edge]
+            if not deleted[child]:
+                result.append(child)
+            edge = self._edge_next[edge]
+        result.reverse()
+        return result
+    
+    def _materialize(self, tx_id: int) -> Transaction:
+        if self._body_table is not None:
+            digest = self._index.digest(tx_id)
+            return decode_transaction(self._body_table.read(digest), digest=digest)[0]
+        if self._bodies is not None:
+            body = self._bodies.read(self._body_offsets[tx_id], self._body_lengths[tx_id])
+            return decode_transaction(body, digest=self._index.digest(tx_id))[0]
+        if self._snapshot_table is not None and self._snapshot_offsets[tx_id] != NO_ID:
+            offset = self._snapshot_offsets[tx_id]
+            return decode_transaction(self._snapshot_table, offset, digest=self._index.digest(tx_id))[0]
+        payload = self._extra_payloads.get(tx_id)
+        if payload is None:
+            strings = self._strings.values
+            payload = {
+                "type": strings[self._types[tx_id]],
+                "amount_kwh": self._amounts[tx_id],
+                "source_id": strings[self._sources[tx_id]]
+            }
+        parents = self._original_parents(tx_id)
+        return Transaction.from_dict({
+            "hash": self._hex(tx_id),
+            "payload": payload,
+            "parent1": parents[0],
+            "parent2": parents[1],
+            "node_id": self._strings.values[self._node_ids[tx_id]],
+            "timestamp": self._timestamps[tx_id],
+            "signature": self._signatures.get(tx_id),
+            "version": self._versions[tx_id]
+        })
+    
+    def _propagate(self, tx_hash: str, depth: int, count_weight: bool = False) -> None:
+        """Wie DAG._propagate, arbeitet aber direkt auf den ID-Spalten"""
+        cap = self.confirmation_threshold
+        weight_cap = self.weight_cap
+        parent1 = self._parent1
+        parent2 = self._parent2
+        depths = self._depth
+        weights = self._weight
+        tx_id = self._lookup(tx_hash)
+        visited = set()
+        stack = []
+        for parent in {parent1[tx_id], parent2[tx_id]}:
+            if parent != NO_ID:
+                stack.append((parent, min(depth, cap)))
+        while stack:
+            current, candidate = stack.pop()
+            expand = False
+            if count_weight and current not in visited:
+                visited.add(current)
+                if weights[current] < weight_cap:
+                    weights[current] += 1
+                    expand = True
+            if candidate > depths[current]:
+                previous = depths[current]
+                depths[current] = candidate
+                if previous < cap <= candidate:
+                    self.newly_confirmed.append(self._hex(current))
+                expand = True
+            if expand:
+                next_depth = min(depths[current] + 1, cap)
+                first = parent1[current]
+                second = parent2[current]
+                if first != NO_ID:
+                    stack.append((first, next_depth))
+                if second != NO_ID and second != first:
+                    stack.append((second, next_depth))
+    
+    def _remove(self, removed: Set[str]) -> None:
+        """Markiert die Zeilen als gelöscht (Kosten pro Zeile, nicht pro DAG).
+        
+        Verweise lebender Kinder auf entfernte Eltern werden zu NO_ID, die
+        Original-Hashes bleiben in `_parent_hashes` erhalten. Sind mehr als
+        COMPACT_RATIO der Zeilen gelöscht, baut `_compact` die Spalten neu auf.
+        """
+        drop = [self._lookup(tx_hash) for tx_hash in removed]
+        for tx_id in drop:
+            self._deleted[tx_id] = 1
+        for tx_id in drop:
+            for child in self._child_ids(tx_id):
+                first = self._parent1[child]
+                second = self._parent2[child]
+                if child not in self._parent_hashes:
+                    self._parent_hashes[child] = (self._hex(first), self._hex(second))
+                if first == tx_id:
+                    self._parent1[child] = NO_ID
+                if second == tx_id:
+                    self._parent2[child] = NO_ID
+            self._extra_payloads.pop(tx_id, None)
+            self._signatures.pop(tx_id, None)
+            self._parent_hashes.pop(tx_id, None)
+        self._deleted_count += len(drop)
+        if self._deleted_count > self.COMPACT_RATIO * len(self._deleted):
+            self._compact()
+    
+    def _compact(self) -> None:
+        """Baut alle Spalten ohne die gelöschten Zeilen neu auf.
+        
+        IDs werden dabei dicht neu vergeben, der Speicher schrumpft also
+        tatsächlich.
+        """
+        drop = {tx_id for tx_id in range(len(self._deleted)) if self._deleted[tx_id]}
+        old_count = len(self._index)
+        kept = [tx_id for tx_id in range(old_count) if tx_id not in drop]
+        remap = array('q', [NO_ID]) * old_count
+        index = HashIndex()
+        for tx_id in kept:
+            remap[tx_id] = index.intern(self._index.digest(tx_id))
+        
+        parent_hashes = {}
+        parent1 = array('q')
+        parent2 = array('q')
+        for tx_id in kept:
+            first = self._parent1[tx_id]
+            second = self._parent2[tx_id]
+            new_first = remap[first] if first != NO_ID else NO_ID
+            new_second = remap[second] if second != NO_ID else NO_ID
+            original = self._parent_hashes.get(tx_id)
+            if original is None and (first != NO_ID and new_first == NO_ID or second != NO_ID and new_second == NO_ID):
+                original = (self._hex(first), self._hex(second))
+            if original is not None:
+                parent_hashes[remap[tx_id]] = original
+            parent1.append(new_first)
+            parent2.append(new_second)
+        
+        for column in self._row_columns():
+            column[:] = array(column.typecode, [column[tx_id] for tx_id in kept])
+        if self._bodies is None and self._body_table is None:
+            self._versions[:] = bytes(self._versions[tx_id] for tx_id in kept)
+        self._extra_payloads = {remap[k]: v for k, v in self._extra_payloads.items() if k not in drop}
+        self._signatures = {remap[k]: v for k, v in self._signatures.items() if k not in drop}
+        self._parent_hashes = parent_hashes
+        self._index = index
+        self._parent1[:] = parent1
+        self._parent2[:] = parent2
+        self._deleted[:] = bytes(len(kept))
+        self._deleted_count = 0
+        
+        self._first_child[:] = array('q', [NO_ID]) * len(kept)
+        del self._edge_child[:]
+        del self._edge_next[:]
+        for tx_id in range(len(kept)):
+            first = parent1[tx_id]
+            second = parent2[tx_id]
+            if first != NO_ID:
+                self._add_edge(first, tx_id)
+            if second != NO_ID and second != first:
+                self._add_edge(second, tx_id)
+        # Alle Transaktionen aus dem Snapshot-Block gepruned: Block freigeben
+        if self._snapshot_table is not None and max(self._snapshot_offsets, default=NO_ID) == NO_ID:
+            self._snapshot_table = None
+            del self._snapshot_offsets[:]
+    
+    def _row_columns(self) -> Tuple[array, ...]:
+        columns = (self._depth, self._weight, self._timestamps)
+        if self._body_table is not None:
+            return columns
+        if self._bodies is not None:
+            return columns + (self._body_offsets, self._body_lengths)
+        columns += (self._node_ids, self._types, self._amounts, self._sources)
+        if self._snapshot_table is not None:
+            columns += (self._snapshot_offsets,)
+        return columns
+    
+    def _digests(self) -> Iterator[bytes]:
+        return (self._index.digest(tx_id) for tx_id in self._live_ids())
+    
+    def close(self) -> None:
+        if self._bodies is not None:
+            self._bodies.close()
+        if self._body_table is not None:
+            self._body_table.close()
+    
+    def memory_usage(self) -> Dict[str, int]:
+        """Belegter Speicher der Array-Spalten in Bytes"""
+        columns = {
+            "hash_index": len(self._index.digests) + len(self._index._table) * self._index._table.itemsize,
+            "parents": (len(self._parent1) + len(self._parent2)) * 8,
+            "children": (len(self._first_child) + len(self._edge_child) + len(self._edge_next)) * 8,
+            "tombstones": len(self._deleted),
+            "confirmations": (len(self._depth) + len(self._weight)) * 4,
+            "bodies": (
+                len(self._timestamps) * 8 + len(self._amounts) * 8 + len(self._versions)
+                + (len(self._node_ids) + len(self._types) + len(self._sources)) * 4
+                + len(self._body_offsets) * 8 + len(self._body_lengths) * 4
+                + len(self._snapshot_table or b"") + len(self._snapshot_offsets) * 8
+            )
+        }
+        columns["total"] = sum(columns.values())
+        return columns
+
+
+class _TransactionView(Mapping):
+    def __init__(self, dag: CompactDAG):
+        self._dag = dag
+    
+    def __getitem__(self, tx_hash: str) -> Transaction:
+        tx_id = self._dag._lookup(tx_hash)
+        if tx_id == NO_ID:
+            raise KeyError(tx_hash)
+        return self._dag._materialize(tx_id)
+    
+    def __contains__(self, tx_hash: object) -> bool:
+        return self._dag._lookup(tx_hash) != NO_ID
+    
+    def __iter__(self) -> Iterator[str]:
+        for tx_id in self._dag._live_ids():
+            yield self._dag._hex(tx_id)
+    
+    def __len__(self) -> int:
+        return len(self._dag._index) - self._dag._deleted_count
+
+
+class _ParentsView(_TransactionView):
+    def __getitem__(self, tx_hash: str) -> Tuple[str, str]:
+        tx_id = self._dag._lookup(tx_hash)
+        if tx_id == NO_ID:
+            raise KeyError(tx_hash)
+        return self._dag._hex(self._dag._parent1[tx_id]), self._dag._hex(self._dag._parent2[tx_id])
+
+
+class _ChildrenView(_TransactionView):
+    def __getitem__(self, tx_hash: str) -> List[str]:
+        tx_id = self._dag._lookup(tx_hash)
+        if tx_id == NO_ID:
+            raise KeyError(tx_hash)
+        return [self._dag._hex(child) for child in self._dag._child_ids(tx_id)]
+
+
+class _ColumnView(MutableMapping):
+    """Zählerspalte mit defaultdict-Semantik (unbekannte Hashes liefern 0)"""
+    
+    def __init__(self, dag: CompactDAG, column: array):
+        self._dag = dag
+        self._column = column
+    
+    def __getitem__(self, tx_hash: str) -> int:
+        tx_id = self._dag._lookup(tx_hash)
+        return self._column[tx_id] if tx_id != NO_ID else 0
+    
+    def __setitem__(self, tx_hash: str, value: int) -> None:
+        tx_id = self._dag._lookup(tx_hash)
+        if tx_id == NO_ID:
+            raise KeyError(tx_hash)
+        self._column[tx_id] = value
+    
+    def __delitem__(self, tx_hash: str) -> None:
+        raise TypeError("CompactDAG columns do not support deletion")
+    
+    def __iter__(self) -> Iterator[str]:
+        for tx_id in self._dag._live_ids():
+            yield self._dag._hex(tx_id)
+    
+    def __len__(self) -> int:
+        return len(self._column) - self._dag._deleted_count
\ No newline at end of file
@@ -24,6 +24,13 @@ class Wallet:
         """Gibt Wallet-Adresse zurück"""
         return self.address
     
+    def get_public_key(self):
+        """Gibt den Public Key als Hex (32 Rohbytes) zurück"""
+        return self.public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
+        ).hex()
+    
     def sign(self, data):
         """Signiert Daten mit Private Key"""
         if isinstance(data, dict):
@@ -31,10 +38,19 @@ class Wallet:
         if isinstance(data, str):
             data = data.encode()
         return self.private_key.sign(data).hex()
+    
+    def sign_transaction(self, tx) -> str:
+        """Signiert die kanonische Kodierung einer Transaktion und hängt die Signatur an"""
+        signature = self.private_key.sign(tx.signing_bytes()).hex()
+        tx.attach_signature(signature)
+        return signature
 
 
 def hash_data(data):
     """SHA-256 Hash einer Daten-Struktur"""
+    if hasattr(data, "encoded"):
+        # Transaktionen: gecachte kanonische Binärkodierung statt JSON
+        data = data.encoded()
     if isinstance(data, dict):
         data = json.dumps(data, sort_keys=True)
     if isinstance(data, str):
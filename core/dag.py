@@ -1,79 +1,533 @@
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+from array import array
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from core.encoding import Buffer, decode_transaction
+from core.merkle import MerkleAccumulator
+from core.reachability import ReachabilityIndex
+from core.tip_pool import TipPool
 from core.transaction import Transaction
+import math
 import random
 
 
 class DAG:
     GENESIS_HASH = "0" * 64
+    CONFIRMATION_THRESHOLD = 3
+    TIP_SELECTION_UNIFORM = "uniform"
+    TIP_SELECTION_MCMC = "mcmc"
+    MCMC_ALPHA = 0.5
+    MCMC_WALK_DEPTH = 10
+    MCMC_WEIGHT_CAP = 64
     
-    def __init__(self):
+    def __init__(
+        self,
+        confirmation_threshold: int = CONFIRMATION_THRESHOLD,
+        tip_selection: str = TIP_SELECTION_UNIFORM,
+        alpha: float = MCMC_ALPHA,
+        weight_cap: Optional[int] = None,
+        max_tips: Optional[int] = None,
+        reachability: bool = False
+    ):
+        if tip_selection not in (self.TIP_SELECTION_UNIFORM, self.TIP_SELECTION_MCMC):
+            raise ValueError(f"Unknown tip selection: {tip_selection}")
+        if weight_cap is None:
+            weight_cap = self.MCMC_WEIGHT_CAP if tip_selection == self.TIP_SELECTION_MCMC else confirmation_threshold
+        self.confirmation_threshold = confirmation_threshold
+        self.tip_selection = tip_selection
+        self.alpha = alpha
+        self.weight_cap = weight_cap
+        self.max_tips = max_tips
         self.transactions: Dict[str, Transaction] = {}
-        self.tips: Set[str] = {self.GENESIS_HASH}
+        self.tips = TipPool([self.GENESIS_HASH], max_size=max_tips)
         self.children: Dict[str, List[str]] = defaultdict(list)
         self.parents: Dict[str, Tuple[str, str]] = {}
+        # Bestätigungstiefe (längste Approver-Kette), gekappt bei confirmation_threshold
         self.confirmations: Dict[str, int] = defaultdict(int)
+        # Kumulatives Gewicht (1 + Größe des Future-Cones), gekappt bei weight_cap
+        self.weights: Dict[str, int] = defaultdict(int)
+        # Transaktionen, die gerade die Schwelle überschritten haben (FIFO)
+        self.newly_confirmed: Deque[str] = deque()
+        # Gepruned, aber noch von lebenden Transaktionen referenziert (Hash -> Anzahl)
+        self.pruned: Dict[str, int] = {}
+        # Optionaler Index für approves/past_cone/future_cone ohne Graph-Walk
+        self.reachability = ReachabilityIndex() if reachability else None
+        # Merkle-Akkumulator über die Digests in Einfügereihenfolge; nach dem
+        # Prunen wird er beim nächsten Zugriff neu aufgebaut
+        self.tx_accumulator = MerkleAccumulator()
+        self._tx_root_stale = False
     
     def add_transaction(self, tx: Transaction) -> bool:
-        if tx.hash in self.transactions:
+        tx_hash = tx.hash
+        if not self._can_add(tx, tx_hash):
             return False
         
-        if tx.parent1 != self.GENESIS_HASH and tx.parent1 not in self.transactions:
-            return False
-        if tx.parent2 != self.GENESIS_HASH and tx.parent2 not in self.transactions:
-            return False
+        self._store(tx)
+        if self.reachability is not None:
+            self.reachability.add(tx_hash, (tx.parent1, tx.parent2))
+        if not self._tx_root_stale:
+            self.tx_accumulator.append(tx.digest)
         
-        self.transactions[tx.hash] = tx
-        self.parents[tx.hash] = (tx.parent1, tx.parent2)
+        self.tips.discard(tx.parent1)
+        self.tips.discard(tx.parent2)
+        self.tips.add(tx_hash)
         
-        if tx.parent1 != self.GENESIS_HASH:
-            self.children[tx.parent1].append(tx.hash)
-        if tx.parent2 != self.GENESIS_HASH and tx.parent2 != tx.parent1:
-            self.children[tx.parent2].append(tx.hash)
+        self._update_confirmations(tx_hash)
+        return True
+    
+    def add_transactions(self, txs: List[Transaction]) -> List[bool]:
+        """Fügt viele Transaktionen auf einmal ein (Eltern vor Kindern).
         
-        self.tips.add(tx.hash)
-        if tx.parent1 in self.tips:
-            self.tips.discard(tx.parent1)
-        if tx.parent2 in self.tips:
-            self.tips.discard(tx.parent2)
+        Die Tip-Menge wird nur einmal am Ende aktualisiert; Eltern dürfen
+        auch frühere Transaktionen desselben Batches sein.
+        """
+        results = []
+        added = []
+        approved = set()
+        for tx in txs:
+            tx_hash = tx.hash
+            if not self._can_add(tx, tx_hash):
+                results.append(False)
+                continue
+            self._store(tx)
+            if self.reachability is not None:
+                self.reachability.add(tx_hash, (tx.parent1, tx.parent2))
+            if not self._tx_root_stale:
+                self.tx_accumulator.append(tx.digest)
+            added.append(tx_hash)
+            approved.add(tx.parent1)
+            approved.add(tx.parent2)
+            results.append(True)
         
-        self._update_confirmations(tx.hash)
+        for tx_hash in approved:
+            self.tips.discard(tx_hash)
+        for tx_hash in added:
+            if tx_hash not in approved:
+                self.tips.add(tx_hash)
+        
+        # Gewichte pro Transaktion (Past-Cones überlappen), Tiefen in einem Pass
+        for tx_hash in added:
+            self.weights[tx_hash] = 1
+            self._propagate_weights(tx_hash)
+        self._propagate_depths(added)
+        return results
+    
+    def _can_add(self, tx: Transaction, tx_hash: str) -> bool:
+        if tx_hash in self.transactions or tx_hash in self.pruned:
+            return False
+        for parent in (tx.parent1, tx.parent2):
+            if parent != self.GENESIS_HASH and parent not in self.transactions and parent not in self.pruned:
+                return False
         return True
     
+    def _store(self, tx: Transaction) -> None:
+        tx_hash = tx.hash
+        parent1, parent2 = tx.parent1, tx.parent2
+        if self.pruned and self._link_pruned(tx):
+            # Gepruned Eltern zählen im Index wie Genesis
+            parent1 = self.GENESIS_HASH if parent1 in self.pruned else parent1
+            parent2 = self.GENESIS_HASH if parent2 in self.pruned else parent2
+        self.transactions[tx_hash] = tx
+        self.parents[tx_hash] = (parent1, parent2)
+        
+        if parent1 != self.GENESIS_HASH:
+            self.children[parent1].append(tx_hash)
+        if parent2 != self.GENESIS_HASH and parent2 != parent1:
+            self.children[parent2].append(tx_hash)
+    
+    def _link_pruned(self, tx: Transaction) -> bool:
+        """Zählt Verweise auf bereits geprunte Eltern; True, falls es welche gibt"""
+        linked = False
+        for parent in {tx.parent1, tx.parent2}:
+            if parent in self.pruned:
+                self.pruned[parent] += 1
+                linked = True
+        return linked
+    
+    def prune(self, tx_hashes: Iterable[str]) -> List[Transaction]:
+        """Entfernt Transaktionen aus allen Indizes und liefert ihre Bodies.
+        
+        Lebende Kinder behalten ihre Eltern-Hashes im Body; im Index zeigen
+        sie danach auf Genesis. Solange solche Verweise bestehen, bleibt der
+        Hash in `pruned` bekannt.
+        """
+        removed = [tx_hash for tx_hash in dict.fromkeys(tx_hashes) if tx_hash in self.transactions]
+        removed_set = set(removed)
+        bodies = [self.transactions[tx_hash] for tx_hash in removed]
+        for tx in bodies:
+            for parent in {tx.parent1, tx.parent2}:
+                count = self.pruned.get(parent)
+                if count is not None:
+                    if count > 1:
+                        self.pruned[parent] = count - 1
+                    else:
+                        del self.pruned[parent]
+        for tx_hash in removed:
+            live = sum(1 for child in self.children.get(tx_hash, ()) if child not in removed_set)
+            if live:
+                self.pruned[tx_hash] = live
+        self._remove(removed_set)
+        self._tx_root_stale = True
+        for tx_hash in removed:
+            self.tips.discard(tx_hash)
+            if self.reachability is not None:
+                self.reachability.discard(tx_hash)
+        return bodies
+    
+    def _remove(self, removed: Set[str]) -> None:
+        genesis = self.GENESIS_HASH
+        for tx_hash in removed:
+            del self.transactions[tx_hash]
+            for parent in set(self.parents.pop(tx_hash)):
+                if parent != genesis and parent not in removed:
+                    self.children[parent].remove(tx_hash)
+            for child in self.children.pop(tx_hash, ()):
+                if child not in removed:
+                    first, second = self.parents[child]
+                    self.parents[child] = (
+                        genesis if first == tx_hash else first,
+                        genesis if second == tx_hash else second
+                    )
+            self.confirmations.pop(tx_hash, None)
+            self.weights.pop(tx_hash, None)
+    
     def _update_confirmations(self, new_tx_hash: str) -> None:
-        parents = self.parents.get(new_tx_hash, (None, None))
-        for parent in parents:
-            if parent and parent != self.GENESIS_HASH:
-                self.confirmations[parent] += 1
+        """Aktualisiert Tiefe und Gewicht im Past-Cone der neuen Transaktion.
+        
+        Gewicht und Tiefe wachsen monoton in Richtung Vergangenheit. Ist ein
+        Vorgänger bereits gesättigt und verbessert sich seine Tiefe nicht,
+        sind es alle seine Vorgänger auch – dort bricht der Walk ab.
+        """
+        self.weights[new_tx_hash] = 1
+        self._propagate(new_tx_hash, self.confirmations[new_tx_hash] + 1, count_weight=True)
+    
+    def _propagate(self, tx_hash: str, depth: int, count_weight: bool = False) -> None:
+        cap = self.confirmation_threshold
+        weight_cap = self.weight_cap
+        genesis = self.GENESIS_HASH
+        parents = self.parents
+        confirmations = self.confirmations
+        weights = self.weights
+        visited: Set[str] = set()
+        depth = min(depth, cap)
+        first, second = parents[tx_hash]
+        stack = [(first, depth)] if first == second else [(first, depth), (second, depth)]
+        while stack:
+            current, candidate = stack.pop()
+            if current == genesis:
+                continue
+            expand = False
+            if count_weight and current not in visited:
+                visited.add(current)
+                if weights[current] < weight_cap:
+                    weights[current] += 1
+                    expand = True
+            if candidate > confirmations[current]:
+                self._set_depth(current, candidate)
+                expand = True
+            if expand:
+                next_depth = min(confirmations[current] + 1, cap)
+                first, second = parents[current]
+                stack.append((first, next_depth))
+                if second != first:
+                    stack.append((second, next_depth))
+    
+    def _propagate_weights(self, tx_hash: str) -> None:
+        """Erhöht das Gewicht jedes Vorgängers genau einmal (bis weight_cap)"""
+        weight_cap = self.weight_cap
+        genesis = self.GENESIS_HASH
+        parents = self.parents
+        weights = self.weights
+        visited: Set[str] = set()
+        stack = list(parents[tx_hash])
+        while stack:
+            current = stack.pop()
+            if current == genesis or current in visited:
+                continue
+            visited.add(current)
+            if weights[current] < weight_cap:
+                weights[current] += 1
+                stack.extend(parents[current])
+    
+    def _propagate_depths(self, tx_hashes: List[str]) -> None:
+        """Ein gemeinsamer Tiefen-Pass für viele neue Transaktionen.
+        
+        Die jüngsten Transaktionen liegen oben auf dem Stack; ihre (größeren)
+        Tiefen sättigen die Vorgänger zuerst, ältere Pfade enden dann sofort.
+        """
+        cap = self.confirmation_threshold
+        genesis = self.GENESIS_HASH
+        parents = self.parents
+        confirmations = self.confirmations
+        stack = []
+        for tx_hash in tx_hashes:
+            first, second = parents[tx_hash]
+            depth = min(confirmations[tx_hash] + 1, cap)
+            stack.append((first, depth))
+            if second != first:
+                stack.append((second, depth))
+        while stack:
+            current, candidate = stack.pop()
+            if current == genesis or candidate <= confirmations[current]:
+                continue
+            self._set_depth(current, candidate)
+            next_depth = min(candidate + 1, cap)
+            first, second = parents[current]
+            stack.append((first, next_depth))
+            if second != first:
+                stack.append((second, next_depth))
+    
+    def _set_depth(self, tx_hash: str, depth: int) -> None:
+        previous = self.confirmations[tx_hash]
+        self.confirmations[tx_hash] = depth
+        if previous < self.confirmation_threshold <= depth:
+            self.newly_confirmed.append(tx_hash)
+    
+    def drain_confirmed(self) -> List[Transaction]:
+        """Gibt neu bestätigte Transaktionen genau einmal zurück und leert die Queue"""
+        drained = []
+        while self.newly_confirmed:
+            tx = self.transactions.get(self.newly_confirmed.popleft())
+            if tx is not None:
+                drained.append(tx)
+        return drained
+    
+    def add_confirmation(self, tx_hash: str, count: int = 1) -> bool:
+        """Simulierte Bestätigung: wirkt wie eine zusätzliche Approver-Kette"""
+        if tx_hash not in self.transactions:
+            return False
+        current = self.confirmations[tx_hash]
+        self._set_depth(tx_hash, min(current + count, self.confirmation_threshold))
+        self._propagate(tx_hash, self.confirmations[tx_hash] + 1)
+        return True
+    
+    def restore(
+        self,
+        transactions: Iterable[Transaction],
+        confirmations: Optional[Dict[str, int]] = None,
+        pruned: Iterable[str] = ()
+    ) -> None:
+        """Lädt gespeicherte Transaktionen und baut alle Indizes neu auf.
+        
+        Die Transaktionen müssen in Einfügereihenfolge vorliegen (Eltern vor
+        Kindern). Gespeicherte Bestätigungen werden als simulierte
+        Bestätigungen übernommen; `pruned` sind die noch referenzierten
+        Hashes bereits geprunter Eltern.
+        """
+        self.pruned = dict.fromkeys(pruned, 0)
+        for tx in transactions:
+            self.add_transaction(tx)
+        self.pruned = {tx_hash: count for tx_hash, count in self.pruned.items() if count}
+        for tx_hash, stored in (confirmations or {}).items():
+            missing = stored - self.confirmations.get(tx_hash, 0)
+            if missing > 0:
+                self.add_confirmation(tx_hash, missing)
+    
+    def export_columns(self) -> Tuple[List[Transaction], array, array, array, array, array]:
+        """Gegenstück zu restore_columns: Transaktionen in Einfügereihenfolge,
+        Eltern-Positionen (zwei Spalten), Tiefen, Gewichte und Tip-Positionen"""
+        transactions = list(self.transactions.values())
+        positions = {tx_hash: pos for pos, tx_hash in enumerate(self.transactions)}
+        parent1 = array('q')
+        parent2 = array('q')
+        for tx_hash in self.transactions:
+            first, second = self.parents[tx_hash]
+            parent1.append(positions.get(first, -1))
+            parent2.append(positions.get(second, -1))
+        depths = array('i', (self.confirmations.get(tx_hash, 0) for tx_hash in self.transactions))
+        weights = array('i', (self.weights.get(tx_hash, 0) for tx_hash in self.transactions))
+        tips = array('q', (positions.get(tx_hash, -1) for tx_hash in self.tips))
+        return transactions, parent1, parent2, depths, weights, tips
+    
+    def restore_columns(
+        self,
+        transactions: List[Transaction],
+        parent1: Sequence[int],
+        parent2: Sequence[int],
+        depths: Sequence[int],
+        weights: Sequence[int],
+        tips: Sequence[int],
+        pruned: Dict[str, int]
+    ) -> None:
+        """Lädt einen Snapshot direkt in die Indizes, ohne Propagation.
+        
+        Eltern und Tips sind Positionen in `transactions` (-1 = Genesis oder
+        gepruned); Tiefen und Gewichte werden unverändert übernommen.
+        """
+        genesis = self.GENESIS_HASH
+        hashes = [tx.hash for tx in transactions]
+        self.transactions = dict(zip(hashes, transactions))
+        self.parents = {}
+        self.children = defaultdict(list)
+        for tx_hash, first, second in zip(hashes, parent1, parent2):
+            first_hash = hashes[first] if first >= 0 else genesis
+            second_hash = hashes[second] if second >= 0 else genesis
+            self.parents[tx_hash] = (first_hash, second_hash)
+            if first >= 0:
+                self.children[first_hash].append(tx_hash)
+            if second >= 0 and second != first:
+                self.children[second_hash].append(tx_hash)
+        self.confirmations = defaultdict(int, zip(hashes, depths))
+        self.weights = defaultdict(int, zip(hashes, weights))
+        self._restore_common(transactions, hashes, tips, pruned)
+    
+    def restore_encoded(
+        self,
+        table: Buffer,
+        offsets: Sequence[int],
+        digests: Buffer,
+        parent1: Sequence[int],
+        parent2: Sequence[int],
+        depths: Sequence[int],
+        weights: Sequence[int],
+        tips: Sequence[int],
+        pruned: Dict[str, int]
+    ) -> None:
+        """Wie restore_columns, aber aus der kanonischen Kodierung (Snapshot-Sektionen).
+        
+        `offsets` hat einen Eintrag mehr als Transaktionen (Ende des letzten
+        Bodies), `digests` je 32 Bytes pro Transaktion. Die Puffer dürfen
+        nach dem Aufruf freigegeben werden.
+        """
+        transactions = [
+            decode_transaction(table, offsets[i], bytes(digests[32 * i:32 * i + 32]))[0]
+            for i in range(len(offsets) - 1)
+        ]
+        self.restore_columns(transactions, parent1, parent2, depths, weights, tips, pruned)
+    
+    def _restore_common(
+        self,
+        transactions: List[Transaction],
+        hashes: List[str],
+        tips: Sequence[int],
+        pruned: Dict[str, int]
+    ) -> None:
+        self._restore_tips((hashes[tip] if tip >= 0 else self.GENESIS_HASH for tip in tips), pruned)
+        if self.reachability is not None:
+            for tx in transactions:
+                self.reachability.add(tx.hash, (tx.parent1, tx.parent2))
+    
+    def _restore_tips(self, tips: Iterable[str], pruned: Dict[str, int]) -> None:
+        self.tips = TipPool(tips, max_size=self.max_tips)
+        self.pruned = dict(pruned)
+        self._tx_root_stale = True
+    
+    def transaction_root(self) -> bytes:
+        """Merkle-Root über alle Transaktions-Digests in Einfügereihenfolge"""
+        if self._tx_root_stale:
+            self.tx_accumulator.reset(self._digests())
+            self._tx_root_stale = False
+        return self.tx_accumulator.root()
+    
+    def load_transaction_peaks(self, entries: List[list]) -> None:
+        """Übernimmt gespeicherte Akkumulator-Peaks (z.B. aus einem geprüften Snapshot)"""
+        self.tx_accumulator.load_list(entries)
+        self._tx_root_stale = self.tx_accumulator.count != len(self.transactions)
+    
+    def _digests(self) -> Iterator[bytes]:
+        return (tx.digest for tx in self.transactions.values())
+    
+    def close(self) -> None:
+        """Gibt externe Ressourcen frei (hier keine)"""
     
     def select_tips(self, count: int = 2) -> List[str]:
-        available = list(self.tips)
-        if not available:
+        """Eltern für neue Transaktionen; aus dem Pool verdrängte Tips (max_tips) zuerst"""
+        if not self.tips:
             return [self.GENESIS_HASH] * count
-        if len(available) <= count:
-            result = available.copy()
-            while len(result) < count:
-                result.append(self.GENESIS_HASH)
-            return result
-        return random.sample(available, count)
+        result = self.tips.evicted(count)
+        if self.tip_selection == self.TIP_SELECTION_MCMC and self.transactions:
+            return result + [self._random_walk() for _ in range(count - len(result))]
+        result += self.tips.sample(count - len(result))
+        while len(result) < count:
+            result.append(self.GENESIS_HASH)
+        return result
     
-    def get_confirmation_count(self, tx_hash: str) -> int:
-        """Gibt Anzahl der Bestätigungen für eine Transaktion zurück"""
+    def _random_walk(self) -> str:
+        """Gewichteter Random Walk (MCMC) über die gecachten kumulativen Gewichte.
+        
+        Startet MCMC_WALK_DEPTH Schritte hinter einem zufälligen Tip und läuft
+        dann vorwärts; ein Kind wird mit Wahrscheinlichkeit proportional zu
+        exp(alpha * Gewicht) gewählt. Faule Tips werden so selten referenziert.
+        """
+        current = self.tips.choice()
+        for _ in range(self.MCMC_WALK_DEPTH):
+            parents = [p for p in self.parents.get(current, ()) if p != self.GENESIS_HASH]
+            if not parents:
+                break
+            current = random.choice(parents)
+        while True:
+            children = self.children.get(current)
+            if not children:
+                break
+            weights = [self.weights[child] for child in children]
+            heaviest = max(weights)
+            probabilities = [math.exp(self.alpha * (w - heaviest)) for w in weights]
+            current = random.choices(children, probabilities)[0]
+        if current not in self.tips:
+            # Tip wurde aus dem Pool verdrängt
+            return self.tips.choice()
+        return current
+    
+    def approves(self, tx_hash: str, ancestor_hash: str) -> bool:
+        """Bestätigt `tx_hash` direkt oder indirekt `ancestor_hash`?"""
+        if self.reachability is not None:
+            return self.reachability.approves(tx_hash, ancestor_hash)
+        return ancestor_hash != self.GENESIS_HASH and ancestor_hash in self._walk(tx_hash, self.parents)
+    
+    def past_cone(self, tx_hash: str) -> Set[str]:
+        """Alle Transaktionen, die `tx_hash` direkt oder indirekt bestätigt"""
+        if self.reachability is not None:
+            return self.reachability.past_cone(tx_hash)
+        cone = self._walk(tx_hash, self.parents)
+        cone.discard(self.GENESIS_HASH)
+        return cone
+    
+    def future_cone(self, tx_hash: str) -> Set[str]:
+        """Alle Transaktionen, die `tx_hash` direkt oder indirekt bestätigen"""
+        if self.reachability is not None:
+            return self.reachability.future_cone(tx_hash)
+        return self._walk(tx_hash, self.children)
+    
+    def _walk(self, tx_hash: str, edges) -> Set[str]:
+        """BFS ohne Index (nur wenn reachability nicht aktiviert ist)"""
+        if tx_hash not in self.transactions:
+            return set()
+        seen: Set[str] = set()
+        queue = deque([tx_hash])
+        while queue:
+            for neighbor in edges.get(queue.popleft(), ()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return seen
+    
+    def get_confirmation_depth(self, tx_hash: str) -> int:
+        """Bestätigungstiefe in O(1), gesättigt bei confirmation_threshold"""
         if tx_hash == self.GENESIS_HASH:
             return float('inf')
         return self.confirmations.get(tx_hash, 0)
     
+    def get_cumulative_weight(self, tx_hash: str) -> int:
+        """Kumulatives Gewicht in O(1), gesättigt bei weight_cap"""
+        if tx_hash == self.GENESIS_HASH:
+            return float('inf')
+        return self.weights.get(tx_hash, 0)
+    
+    def get_confirmation_count(self, tx_hash: str) -> int:
+        """Gibt Anzahl der Bestätigungen für eine Transaktion zurück"""
+        return self.get_confirmation_depth(tx_hash)
+    
+    def timestamp(self, tx_hash: str) -> int:
+        return self.transactions[tx_hash].timestamp
+    
     def is_confirmed(self, tx_hash: str, min_confirmations: int = 3) -> bool:
         """Prüft, ob Transaktion genügend Bestätigungen hat"""
-        return self.get_confirmation_count(tx_hash) >= min_confirmations
+        return self.get_confirmation_depth(tx_hash) >= min_confirmations
     
     def get_all_transactions(self) -> List[Transaction]:
         return list(self.transactions.values())
     
     def validate_tips(self) -> None:
         """Entfernt ungültige Tips aus der Menge"""
-        valid_tips = set()
         for tip in self.tips:
-            if tip == self.GENESIS_HASH or tip in self.transactions:
-                valid_tips.add(tip)
-        self.tips = valid_tips
\ No newline at end of file
+            if tip != self.GENESIS_HASH and tip not in self.transactions:
+                self.tips.discard(tip)
\ No newline at end of file
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import struct
+from typing import Any, Dict, Optional, Tuple, Union
+
+# Kanonische Binärkodierung einer Transaktion (alle Zahlen little-endian):
+#
+#   u8   Version (0 = Legacy-JSON-Hash, 1 = Hash über diese Kodierung)
+#   32B  parent1, 32B parent2 (roh)
+#   u16  Länge + node_id (UTF-8)
+#   i64  timestamp
+#   u8   Payload-Art
+#        1 = Energie:  f64 amount_kwh, u16 Länge + source_id (UTF-8)
+#        0 = generisch: u32 Länge + JSON (sort_keys, kompakt)
+#   u16  Länge + Signatur (roh, 0 = keine)
+#
+# Die Signatur wird über dieselbe Kodierung ohne Signatur gebildet.
+
+VERSION_LEGACY = 0
+VERSION_BINARY = 1
+
+KIND_GENERIC = 0
+KIND_ENERGY = 1
+
+ENERGY_CONTRIBUTION = "energy_contribution"
+
+_HEAD = struct.Struct("<B32s32sH")
+_TIMESTAMP = struct.Struct("<q")
+_ENERGY = struct.Struct("<BdH")
+_GENERIC = struct.Struct("<BI")
+_U16 = struct.Struct("<H")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def encode_payload(tx: Any) -> bytes:
+    if tx.extra is None and tx.type == ENERGY_CONTRIBUTION:
+        source = tx.source_id.encode()
+        return _ENERGY.pack(KIND_ENERGY, tx.amount_kwh, len(source)) + source
+    data = json.dumps(tx.payload, sort_keys=True, separators=(",", ":")).encode()
+    return _GENERIC.pack(KIND_GENERIC, len(data)) + data
+
+
+def encode_transaction(tx: Any, include_signature: bool = True) -> bytes:
+    node_id = tx.node_id.encode()
+    signature = bytes.fromhex(tx.signature) if include_signature and tx.signature else b""
+    return b"".join((
+        _HEAD.pack(tx.version, bytes.fromhex(tx.parent1), bytes.fromhex(tx.parent2), len(node_id)),
+        node_id,
+        _TIMESTAMP.pack(tx.timestamp),
+        encode_payload(tx),
+        _U16.pack(len(signature)),
+        signature
+    ))
+
+
+def _read_str(data: Buffer, offset: int, length: int) -> Tuple[str, int]:
+    end = offset + length
+    return bytes(data[offset:end]).decode(), end
+
+
+def decode_fields(data: Buffer, offset: int = 0) -> Tuple[Dict[str, Any], int]:
+    """Dekodiert eine Transaktion ab `offset`; liefert Felder und End-Offset"""
+    version, parent1, parent2, node_len = _HEAD.unpack_from(data, offset)
+    node_id, offset = _read_str(data, offset + _HEAD.size, node_len)
+    (timestamp,) = _TIMESTAMP.unpack_from(data, offset)
+    offset += _TIMESTAMP.size
+    if data[offset] == KIND_ENERGY:
+        _, amount_kwh, source_len = _ENERGY.unpack_from(data, offset)
+        source_id, offset = _read_str(data, offset + _ENERGY.size, source_len)
+        payload = {"type": ENERGY_CONTRIBUTION, "amount_kwh": amount_kwh, "source_id": source_id}
+    else:
+        _, length = _GENERIC.unpack_from(data, offset)
+        raw, offset = _read_str(data, offset + _GENERIC.size, length)
+        payload = json.loads(raw)
+    (sig_len,) = _U16.unpack_from(data, offset)
+    offset += _U16.size
+    signature = bytes(data[offset:offset + sig_len]).hex() if sig_len else None
+    offset += sig_len
+    fields = {
+        "version": version,
+        "payload": payload,
+        "parent1": parent1.hex(),
+        "parent2": parent2.hex(),
+        "node_id": node_id,
+        "timestamp": timestamp,
+        "signature": signature
+    }
+    return fields, offset
+
+
+def read_timestamp(data: Buffer, offset: int = 0) -> int:
+    """Nur den Zeitstempel einer kodierten Transaktion lesen"""
+    (node_len,) = _U16.unpack_from(data, offset + _HEAD.size - _U16.size)
+    return _TIMESTAMP.unpack_from(data, offset + _HEAD.size + node_len)[0]
+
+
+def _decode_energy(cls: Any, data: Buffer, offset: int, digest: Optional[bytes]):
+    """Energie-Transaktionen direkt in Slots dekodieren; None für andere Payloads"""
+    version, parent1, parent2, node_len = _HEAD.unpack_from(data, offset)
+    start = offset + _HEAD.size
+    kind_offset = start + node_len + _TIMESTAMP.size
+    if data[kind_offset] != KIND_ENERGY:
+        return None
+    node_id = bytes(data[start:start + node_len]).decode()
+    (timestamp,) = _TIMESTAMP.unpack_from(data, kind_offset - _TIMESTAMP.size)
+    _, amount_kwh, source_len = _ENERGY.unpack_from(data, kind_offset)
+    pos = kind_offset + _ENERGY.size
+    source_id = bytes(data[pos:pos + source_len]).decode()
+    pos += source_len
+    (sig_len,) = _U16.unpack_from(data, pos)
+    pos += _U16.size
+    signature = bytes(data[pos:pos + sig_len]).hex() if sig_len else None
+    end = pos + sig_len
+    encoded = bytes(data[offset:end])
+    if digest is None:
+        digest = hashlib.sha256(encoded).digest()
+    tx = cls.from_energy(
+        version, digest, parent1.hex(), parent2.hex(), node_id, timestamp, signature, amount_kwh, source_id
+    )
+    tx._encoded = encoded
+    return tx, end
+
+
+def legacy_digest(fields: Dict[str, Any]) -> bytes:
+    """Alter Hash: SHA-256 über sortiertes JSON (für bestehende Zustandsdateien)"""
+    data = {key: fields[key] for key in ("payload", "parent1", "parent2", "node_id", "timestamp", "signature")}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).digest()
+
+
+def transaction_digest(data: Buffer) -> bytes:
+    """Digest einer einzelnen kodierten Transaktion (Legacy: JSON-Hash der Felder)"""
+    if data[0] == VERSION_LEGACY:
+        return legacy_digest(decode_fields(data)[0])
+    return hashlib.sha256(data).digest()
+
+
+def decode_transaction(data: Buffer, offset: int = 0, digest: Optional[bytes] = None):
+    """Liest eine Transaktion aus `data`; liefert (Transaction, End-Offset).
+    
+    Der Hash wird aus den Bytes selbst abgeleitet, muss also nicht
+    mitgespeichert werden (ein bekannter `digest` spart die Berechnung).
+    Die kodierten Bytes bleiben am Objekt gecacht.
+    """
+    from core.transaction import Transaction
+    if digest is not None or data[offset] != VERSION_LEGACY:
+        fast = _decode_energy(Transaction, data, offset, digest)
+        if fast is not None:
+            return fast
+    fields, end = decode_fields(data, offset)
+    encoded = bytes(data[offset:end])
+    if digest is None:
+        if fields["version"] == VERSION_LEGACY:
+            digest = legacy_digest(fields)
+        else:
+            digest = hashlib.sha256(encoded).digest()
+    fields["hash"] = digest.hex()
+    tx = Transaction.from_dict(fields)
+    tx._encoded = encoded
+    return tx, end
\ No newline at end of file
@@ -0,0 +1,193 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from core.encoding import Buffer, transaction_digest
+
+
+EMPTY_ROOT = bytes(32)
+# Blätter pro Worker-Chunk bei paralleler Verifikation (Zweierpotenz)
+CHUNK_LEAVES = 1 << 15
+
+
+def _pair(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(left + right).digest()
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    """Merkle-Root über 32-Byte-Blätter (SHA-256, ungerade Ebenen doppeln das letzte Element)"""
+    if not leaves:
+        return EMPTY_ROOT
+    level: List[bytes] = list(leaves)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256(level[i] + level[i + 1]).digest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+def subtree_root(leaves: Sequence[bytes], height: int) -> bytes:
+    """Root eines Teilbaums der Höhe `height`, dessen Blätter nur links belegt sind.
+    
+    So sieht der letzte, unvollständige Chunk im Gesamtbaum aus: oberhalb
+    seines eigenen Roots wird bis `height` mit sich selbst gepaart.
+    """
+    root = merkle_root(leaves)
+    natural = max(len(leaves) - 1, 0).bit_length()
+    for _ in range(natural, height):
+        root = _pair(root, root)
+    return root
+
+
+class MerkleAccumulator:
+    """Append-only Akkumulator: hält nur die Peaks (vollständige Teilbäume).
+    
+    `append` kostet amortisiert einen Hash, `root()` O(log n); das Ergebnis
+    ist identisch mit `merkle_root()` über alle bisherigen Blätter.
+    """
+    
+    def __init__(self, leaves: Iterable[bytes] = ()):
+        self._peaks: Dict[int, bytes] = {}
+        self.count = 0
+        for leaf in leaves:
+            self.append(leaf)
+    
+    def append(self, leaf: bytes) -> None:
+        carry = leaf
+        height = 0
+        while height in self._peaks:
+            carry = _pair(self._peaks.pop(height), carry)
+            height += 1
+        self._peaks[height] = carry
+        self.count += 1
+    
+    def root(self) -> bytes:
+        if not self._peaks:
+            return EMPTY_ROOT
+        top = max(self._peaks)
+        carry = None
+        for height in range(top + 1):
+            peak = self._peaks.get(height)
+            if carry is None:
+                if peak is None:
+                    continue
+                if height == top:
+                    return peak
+                # Letztes Element einer ungeraden Ebene: mit sich selbst paaren
+                carry = _pair(peak, peak)
+            elif peak is not None:
+                carry = _pair(peak, carry)
+            else:
+                carry = _pair(carry, carry)
+        return carry
+    
+    def reset(self, leaves: Iterable[bytes]) -> None:
+        self._peaks = {}
+        self.count = 0
+        for leaf in leaves:
+            self.append(leaf)
+    
+    def to_list(self) -> List[list]:
+        return [[height, peak.hex()] for height, peak in sorted(self._peaks.items())]
+    
+    def load_list(self, entries: List[list]) -> None:
+        self._peaks = {height: bytes.fromhex(peak) for height, peak in entries}
+        self.count = sum(1 << height for height in self._peaks)
+
+
+class MerkleTree:
+    """Merkle-Baum mit allen Ebenen im Speicher; Blätter sind über ihre
+    Position in O(log n) änderbar. Root wie `merkle_root()`."""
+    
+    def __init__(self, leaves: Iterable[bytes] = ()):
+        self._levels: List[List[bytes]] = [[]]
+        for leaf in leaves:
+            self.append(leaf)
+    
+    def __len__(self) -> int:
+        return len(self._levels[0])
+    
+    def append(self, leaf: bytes) -> int:
+        index = len(self._levels[0])
+        self._levels[0].append(leaf)
+        self._update_path(index)
+        return index
+    
+    def update(self, index: int, leaf: bytes) -> None:
+        self._levels[0][index] = leaf
+        self._update_path(index)
+    
+    def _update_path(self, index: int) -> None:
+        depth = 0
+        while len(self._levels[depth]) > 1:
+            level = self._levels[depth]
+            left = index & ~1
+            right = left + 1 if left + 1 < len(level) else left
+            parent = _pair(level[left], level[right])
+            if depth + 1 == len(self._levels):
+                self._levels.append([])
+            upper = self._levels[depth + 1]
+            index //= 2
+            if index < len(upper):
+                upper[index] = parent
+            else:
+                upper.append(parent)
+            depth += 1
+    
+    def root(self) -> bytes:
+        if not self._levels[0]:
+            return EMPTY_ROOT
+        for level in self._levels:
+            if len(level) == 1:
+                return level[0]
+        return EMPTY_ROOT
+
+
+def _chunk_root(args: Tuple[bytes, List[int], bytes, int]) -> Optional[bytes]:
+    """Worker: hasht die Bodies eines Chunks, prüft sie gegen die Digests
+    und liefert den Teilbaum-Root (None bei Abweichung)"""
+    table, offsets, digests, height = args
+    leaves = []
+    for i in range(len(offsets) - 1):
+        digest = digests[32 * i:32 * i + 32]
+        if transaction_digest(table[offsets[i]:offsets[i + 1]]) != digest:
+            return None
+        leaves.append(digest)
+    return subtree_root(leaves, height)
+
+
+def transaction_root(
+    table: Buffer,
+    offsets: Sequence[int],
+    digests: Buffer,
+    workers: Optional[int] = None,
+    chunk_leaves: int = CHUNK_LEAVES
+) -> Optional[bytes]:
+    """Merkle-Root über kodierte Transaktionen (`table` mit `offsets`).
+    
+    Jeder Body wird gegen seinen gespeicherten Digest geprüft; größere
+    Mengen werden in Chunks zu `chunk_leaves` Blättern auf einen
+    ProcessPoolExecutor verteilt. None, falls ein Body nicht passt.
+    """
+    count = len(offsets) - 1
+    height = (chunk_leaves - 1).bit_length()
+    chunks = []
+    for start in range(0, count, chunk_leaves):
+        end = min(start + chunk_leaves, count)
+        base = offsets[start]
+        chunks.append((
+            bytes(table[base:offsets[end]]),
+            [offset - base for offset in offsets[start:end + 1]],
+            bytes(digests[32 * start:32 * end]),
+            height
+        ))
+    if len(chunks) <= 1:
+        # Ein einzelner Chunk ist bereits der ganze Baum (ohne Auffüllen)
+        return _chunk_root(chunks[0][:3] + (0,)) if chunks else EMPTY_ROOT
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        roots = list(pool.map(_chunk_root, chunks))
+    if any(root is None for root in roots):
+        return None
+    return merkle_root(roots)
\ No newline at end of file
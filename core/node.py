@@ -1,21 +1,27 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from core.crypto import Wallet
 from core.transaction import Transaction
 
 
 class Node:
-    def __init__(self, node_id: str):
+    def __init__(self, node_id: str, wallet: Optional[Wallet] = None):
         self.node_id = node_id
+        self.wallet = wallet
     
     def create_energy_transaction(
         self,
         amount_kwh: float,
         source_id: str,
         parent1: str,
-        parent2: str
+        parent2: str,
+        timestamp: Optional[float] = None
     ) -> Transaction:
         payload = {
             "type": "energy_contribution",
             "amount_kwh": amount_kwh,
             "source_id": source_id
         }
-        return Transaction(payload, parent1, parent2, self.node_id)
\ No newline at end of file
+        tx = Transaction(payload, parent1, parent2, self.node_id, timestamp=timestamp)
+        if self.wallet is not None:
+            self.wallet.sign_transaction(tx)
+        return tx
\ No newline at end of file
@@ -0,0 +1,281 @@
+import heapq
+import os
+import struct
+import time
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from core.dag import DAG
+from core.encoding import decode_transaction
+from core.merkle import EMPTY_ROOT, merkle_root
+from core.transaction import Transaction
+
+_LENGTH = struct.Struct("<I")
+
+
+def append_archive(path: str, txs: List[Transaction]) -> None:
+    """Hängt Transaktionen binär kodiert (u32 Länge + Kodierung) an das Archiv an"""
+    with open(path, "ab") as f:
+        for tx in txs:
+            encoded = tx.encoded()
+            f.write(_LENGTH.pack(len(encoded)))
+            f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_archive(path: str) -> Iterator[Transaction]:
+    """Liest archivierte Transaktionen; ein abgeschnittener letzter Eintrag wird ignoriert"""
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        start = offset + _LENGTH.size
+        if start + length > len(data):
+            break
+        tx, _ = decode_transaction(data, start)
+        yield tx
+        offset = start + length
+
+
+def _parents_first(txs: List[Transaction]) -> List[Transaction]:
+    """Ordnet Transaktionen so, dass Eltern aus derselben Liste vorn stehen"""
+    by_hash = {tx.hash: tx for tx in txs}
+    ordered = []
+    done: Set[str] = set()
+    for tx in txs:
+        stack = [(tx, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current.hash in done:
+                continue
+            if expanded:
+                done.add(current.hash)
+                ordered.append(current)
+                continue
+            stack.append((current, True))
+            for parent in (current.parent1, current.parent2):
+                if parent in by_hash and parent not in done:
+                    stack.append((by_hash[parent], False))
+    return ordered
+
+
+class Pruner:
+    """Faltet abgerechnete Historie in Checkpoints und entfernt sie aus dem DAG.
+    
+    Abgerechnet ist eine Transaktion, wenn sie bestätigt ist und nicht mehr
+    in `newly_confirmed` auf das Minting wartet; der Aufrufer meldet sie per
+    `settle` (nach drain_confirmed). Bis zum Prunen liegen sie in einem Heap
+    nach Zeitstempel, ein Pass fasst also nur fällige Einträge an statt der
+    ganzen Historie. Gepruned werden die ältesten abgerechneten, solange mehr
+    als `keep_last` Transaktionen im DAG sind, sowie alle älter als `max_age`
+    Sekunden. Jeder Checkpoint enthält Merkle-Root, Anzahl und kWh-Summen
+    und verweist auf die Root des vorherigen Checkpoints.
+    
+    Gepruned wird nur zusammen mit allen lebenden Vorfahren. Eine erneut
+    eingereichte Transaktion verweist daher auf einen Elternteil, der nicht
+    mehr im DAG ist, oder hängt direkt an Genesis und liegt zeitlich vor dem
+    Horizont des letzten Checkpoints; `was_pruned` lehnt beides ab, ohne
+    Digests geprunter Transaktionen zu führen.
+    """
+    
+    MIN_BATCH = 1000
+    
+    def __init__(
+        self,
+        keep_last: Optional[int] = None,
+        max_age: Optional[float] = None,
+        min_batch: int = MIN_BATCH,
+        archive_path: Optional[str] = None
+    ):
+        self.keep_last = keep_last
+        self.max_age = max_age
+        self.min_batch = min_batch
+        self.archive_path = archive_path
+        self.checkpoints: List[Dict[str, Any]] = []
+        # (Zeitstempel, Eingangsnummer, Hash) abgerechneter Transaktionen
+        self._settled: List[Tuple[int, int, str]] = []
+        self._settled_count = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.keep_last is not None or self.max_age is not None
+    
+    @property
+    def horizon(self) -> Optional[int]:
+        """Jüngster Zeitstempel einer geprunten Transaktion mit Genesis-Eltern"""
+        return self.checkpoints[-1].get("horizon") if self.checkpoints else None
+    
+    def was_pruned(self, dag: DAG, tx: Transaction, batch: Collection[str] = ()) -> bool:
+        """Liegt die Transaktion hinter dem Checkpoint-Horizont (schon abgerechnet)?
+        
+        `batch` sind Hashes, die im selben Aufruf vorher eingefügt werden.
+        Auch eine neue Transaktion mit Genesis-Eltern und Zeitstempel bis
+        zum Horizont wird abgelehnt.
+        """
+        genesis = dag.GENESIS_HASH
+        for parent in (tx.parent1, tx.parent2):
+            if parent != genesis and parent not in dag.transactions and parent not in batch:
+                return True
+        horizon = self.horizon
+        return tx.parent1 == tx.parent2 == genesis and horizon is not None and tx.timestamp <= horizon
+    
+    def settle(self, txs: List[Transaction], now: Optional[float] = None) -> None:
+        """Merkt abgerechnete Transaktionen (aus drain_confirmed) zum Prunen vor.
+        
+        Bei gleichem Zeitstempel stehen Eltern vor ihren Kindern im Heap.
+        Zeitstempel in der Zukunft zählen als `now`: auch eine solche
+        Transaktion (und damit ihre Nachfahren) ist nach `max_age` fällig.
+        """
+        if self.enabled:
+            self._push(((tx.hash, tx.timestamp) for tx in _parents_first(txs)), now)
+    
+    def _push(self, entries: Iterable[Tuple[str, int]], now: Optional[float] = None) -> None:
+        latest = int(time.time() if now is None else now)
+        for tx_hash, timestamp in entries:
+            heapq.heappush(self._settled, (min(timestamp, latest), self._settled_count, tx_hash))
+            self._settled_count += 1
+    
+    def resume(self, dag: DAG) -> None:
+        """Baut die Vormerkungen nach dem Laden einmalig aus dem DAG auf"""
+        self._settled = []
+        if not self.enabled:
+            return
+        pending = set(dag.newly_confirmed)
+        threshold = dag.confirmation_threshold
+        # dag.transactions steht in Einfügereihenfolge, Eltern also vorn
+        self._push(
+            (tx_hash, dag.timestamp(tx_hash)) for tx_hash in dag.transactions
+            if tx_hash not in pending and dag.is_confirmed(tx_hash, threshold)
+        )
+    
+    def candidates(self, dag: DAG, now: Optional[float] = None) -> List[str]:
+        """Hashes prunbarer Transaktionen, älteste Zeitstempel zuerst.
+        
+        Entnimmt dem Heap nur fällige Einträge (nach Anzahl oder Alter); sind
+        es weniger als `min_batch`, bleiben sie vorgemerkt und das Ergebnis
+        ist leer. Zurückgegebene Hashes müssen per `apply` gepruned werden.
+        """
+        heap = self._settled
+        if not self.enabled or not heap:
+            return []
+        excess = len(dag.transactions) - self.keep_last if self.keep_last is not None else 0
+        cutoff = None
+        if self.max_age is not None:
+            cutoff = (time.time() if now is None else now) - self.max_age
+        if excess < self.min_batch and (cutoff is None or heap[0][0] >= cutoff):
+            return []
+        
+        taken = []
+        seen = set()
+        while heap and (len(taken) < excess or cutoff is not None and heap[0][0] < cutoff):
+            entry = heapq.heappop(heap)
+            # Schon gepruned (etwa per WAL-Replay) oder doppelt vorgemerkt
+            if entry[2] not in seen and entry[2] in dag.transactions:
+                seen.add(entry[2])
+                taken.append(entry)
+        batch = self._close_over_parents(dag, taken, excess, cutoff, now)
+        if len(batch) < self.min_batch:
+            batch = {}
+        for entry in taken:
+            if entry[2] not in batch:
+                heapq.heappush(heap, entry)
+        return list(batch)
+    
+    def _close_over_parents(
+        self,
+        dag: DAG,
+        taken: List[Tuple[int, int, str]],
+        excess: int,
+        cutoff: Optional[float],
+        now: Optional[float] = None
+    ) -> Dict[str, None]:
+        """Ergänzt jeden Eintrag um seine lebenden Vorfahren (siehe was_pruned).
+        
+        Ein Vorfahr wird mitgenommen, wenn er abgerechnet ist und sein
+        Zeitstempel nicht jünger als der des Eintrags ist (etwa Gleichstand
+        innerhalb einer Sekunde). Sonst bleibt der Eintrag vorgemerkt, bis
+        der Vorfahr selbst fällig ist. Nur nach Anzahl fällige Einträge
+        werden genommen, bis `excess` erreicht ist.
+        """
+        genesis = dag.GENESIS_HASH
+        parents = dag.parents
+        threshold = dag.confirmation_threshold
+        pending = set(dag.newly_confirmed)
+        latest = int(time.time() if now is None else now)
+        batch: Dict[str, None] = {}
+        for key, _, tx_hash in taken:
+            if tx_hash in batch or len(batch) >= excess and (cutoff is None or key >= cutoff):
+                continue
+            closure = {tx_hash: None}
+            stack = [tx_hash]
+            while stack and closure is not None:
+                for parent in set(parents[stack.pop()]):
+                    if parent == genesis or parent in batch or parent in closure:
+                        continue
+                    if parent in pending or not dag.is_confirmed(parent, threshold) or min(dag.timestamp(parent), latest) > key:
+                        closure = None
+                        break
+                    closure[parent] = None
+                    stack.append(parent)
+            if closure is not None:
+                batch.update(closure)
+        return batch
+    
+    def prune(
+        self,
+        dag: DAG,
+        now: Optional[float] = None,
+        processed: Optional[Set[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Pruned einen Batch und liefert den neuen Checkpoint (oder None).
+        
+        Gepruned Hashes werden auch aus `processed` (gemintete Hashes)
+        entfernt; `was_pruned` erkennt sie weiter, sodass sie nicht
+        erneut eingefügt und bestätigt werden können.
+        """
+        tx_hashes = self.candidates(dag, now)
+        if not tx_hashes:
+            return None
+        return self.apply(dag, tx_hashes, processed)
+    
+    def apply(
+        self,
+        dag: DAG,
+        tx_hashes: List[str],
+        processed: Optional[Set[str]] = None,
+        checkpoint: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Pruned genau diese Hashes.
+        
+        Mit `checkpoint` (Wiederherstellung aus einem Log) wird dieser
+        übernommen statt neu berechnet, und es wird nichts archiviert.
+        """
+        removed = dag.prune(tx_hashes)
+        if processed is not None:
+            processed.difference_update(tx_hashes)
+        if checkpoint is not None:
+            self.checkpoints.append(checkpoint)
+            return checkpoint
+        if self.archive_path:
+            append_archive(self.archive_path, removed)
+        
+        previous = self.checkpoints[-1] if self.checkpoints else None
+        energy_kwh = sum(tx.get_energy_kwh() for tx in removed)
+        genesis = dag.GENESIS_HASH
+        roots = [tx.timestamp for tx in removed if tx.parent1 == tx.parent2 == genesis]
+        horizon = max(roots + ([self.horizon] if self.horizon is not None else []), default=None)
+        checkpoint = {
+            "sequence": len(self.checkpoints),
+            "merkle_root": merkle_root([tx.digest for tx in removed]).hex(),
+            "previous_root": previous["merkle_root"] if previous else EMPTY_ROOT.hex(),
+            "count": len(removed),
+            "energy_kwh": energy_kwh,
+            "total_count": len(removed) + (previous["total_count"] if previous else 0),
+            "total_kwh": energy_kwh + (previous["total_kwh"] if previous else 0.0),
+            "first_timestamp": min(tx.timestamp for tx in removed),
+            "last_timestamp": max(tx.timestamp for tx in removed),
+            "horizon": horizon,
+            "created_at": int(time.time())
+        }
+        self.checkpoints.append(checkpoint)
+        return checkpoint
\ No newline at end of file
@@ -0,0 +1,176 @@
+import heapq
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+_NO_FAR: FrozenSet[int] = frozenset()
+
+
+class ReachabilityIndex:
+    """Inkrementeller Erreichbarkeits-Index über Sequenznummern.
+    
+    Jede Transaktion bekommt beim Einfügen eine fortlaufende Nummer; da
+    Eltern vor Kindern eingefügt werden, ist das eine topologische Ordnung.
+    Die Nummern sind in Epochen fester Größe geteilt. Pro Transaktion werden
+    gespeichert:
+    
+    - `local`: Bitset aller Vorfahren in der eigenen Epoche
+    - `prev`: Bitset aller Vorfahren in der Epoche davor
+    - `far`: direkte Verweise über mehr als eine Epoche (selten, geteilte frozensets)
+    - `children`: direkte Kinder, für Abfragen nach vorn
+    
+    Abfragen nach hinten steigen Epoche für Epoche ab und expandieren dabei
+    nur die maximalen Elemente (alle anderen sind in deren `local`
+    enthalten), die Kosten hängen also von der Breite des DAG ab, nicht von
+    seiner Größe. `future_cone` läuft über `children` und kostet nur so viel
+    wie der Future-Cone selbst.
+    """
+    
+    EPOCH_SIZE = 1024
+    
+    def __init__(self, epoch_size: int = EPOCH_SIZE):
+        self.epoch_size = epoch_size
+        self._seq: Dict[str, int] = {}
+        self._hashes: Dict[int, str] = {}
+        self._local: Dict[int, int] = {}
+        self._prev: Dict[int, int] = {}
+        self._far: Dict[int, FrozenSet[int]] = {}
+        # Verweise auf entfernte Kinder bleiben stehen und werden beim Lesen übersprungen
+        self._children: Dict[int, List[int]] = {}
+        self._next = 0
+    
+    def __contains__(self, tx_hash: object) -> bool:
+        return tx_hash in self._seq
+    
+    def __len__(self) -> int:
+        return len(self._seq)
+    
+    def add(self, tx_hash: str, parents: Iterable[str]) -> None:
+        """Nimmt eine Transaktion auf; unbekannte Eltern (Genesis, gepruned) werden ignoriert"""
+        if tx_hash in self._seq:
+            return
+        seq = self._next
+        self._next += 1
+        start = seq - seq % self.epoch_size
+        prev_start = start - self.epoch_size
+        local = 0
+        prev = 0
+        far = _NO_FAR
+        for parent in set(parents):
+            parent_seq = self._seq.get(parent)
+            if parent_seq is None:
+                continue
+            children = self._children.get(parent_seq)
+            if children is None:
+                self._children[parent_seq] = [seq]
+            else:
+                children.append(seq)
+            if parent_seq >= start:
+                local |= self._local[parent_seq] | 1 << (parent_seq - start)
+                prev |= self._prev[parent_seq]
+                parent_far = self._far[parent_seq]
+                if parent_far and parent_far is not far:
+                    far = parent_far if not far else far | parent_far
+            elif parent_seq >= prev_start:
+                prev |= 1 << (parent_seq - prev_start)
+            elif parent_seq not in far:
+                far = far | {parent_seq}
+        self._seq[tx_hash] = seq
+        self._hashes[seq] = tx_hash
+        self._local[seq] = local
+        self._prev[seq] = prev
+        self._far[seq] = far
+    
+    def discard(self, tx_hash: str) -> None:
+        seq = self._seq.pop(tx_hash, None)
+        if seq is not None:
+            del self._hashes[seq]
+            del self._local[seq]
+            del self._prev[seq]
+            del self._far[seq]
+            self._children.pop(seq, None)
+    
+    def _cone_masks(self, seq: int, lowest_epoch: int = 0) -> Dict[int, int]:
+        """Bitsets des Past-Cones pro Epoche (bis hinunter zu `lowest_epoch`)"""
+        size = self.epoch_size
+        epoch = seq // size
+        masks = {epoch: self._local[seq]}
+        pending: Dict[int, int] = {}
+        heap = []
+        
+        def mark(target_epoch: int, bits: int) -> None:
+            if target_epoch < lowest_epoch or not bits:
+                return
+            if target_epoch not in pending:
+                pending[target_epoch] = 0
+                heapq.heappush(heap, -target_epoch)
+            pending[target_epoch] |= bits
+        
+        # Die Transaktion selbst ist das einzige maximale Element ihrer Epoche
+        mark(epoch - 1, self._prev[seq])
+        for far_seq in self._far[seq]:
+            mark(far_seq // size, 1 << (far_seq % size))
+        
+        while heap:
+            current_epoch = -heapq.heappop(heap)
+            remaining = pending.pop(current_epoch)
+            base = current_epoch * size
+            closed = 0
+            below = 0
+            while remaining:
+                top = remaining.bit_length() - 1
+                node = base + top
+                local = self._local.get(node)
+                closed |= 1 << top
+                if local is not None:
+                    closed |= local
+                    below |= self._prev[node]
+                    for far_seq in self._far[node]:
+                        mark(far_seq // size, 1 << (far_seq % size))
+                remaining &= ~closed
+            masks[current_epoch] = closed
+            mark(current_epoch - 1, below)
+        return masks
+    
+    def approves(self, tx_hash: str, ancestor_hash: str) -> bool:
+        """True, wenn `tx_hash` direkt oder indirekt `ancestor_hash` bestätigt"""
+        seq = self._seq.get(tx_hash)
+        target = self._seq.get(ancestor_hash)
+        if seq is None or target is None or target >= seq:
+            return False
+        target_epoch = target // self.epoch_size
+        masks = self._cone_masks(seq, target_epoch)
+        return bool(masks.get(target_epoch, 0) >> (target % self.epoch_size) & 1)
+    
+    def past_cone(self, tx_hash: str) -> Set[str]:
+        """Alle (noch bekannten) Vorfahren einer Transaktion"""
+        seq = self._seq.get(tx_hash)
+        if seq is None:
+            return set()
+        cone = set()
+        for epoch, mask in self._cone_masks(seq).items():
+            base = epoch * self.epoch_size
+            while mask:
+                low = mask & -mask
+                ancestor = self._hashes.get(base + low.bit_length() - 1)
+                if ancestor is not None:
+                    cone.add(ancestor)
+                mask ^= low
+        return cone
+    
+    def future_cone(self, tx_hash: str) -> Set[str]:
+        """Alle (noch bekannten) Nachfahren, über die Kinder-Listen"""
+        seq = self._seq.get(tx_hash)
+        if seq is None:
+            return set()
+        seen = {seq}
+        stack = [seq]
+        cone = set()
+        while stack:
+            for child in self._children.get(stack.pop(), ()):
+                if child in seen:
+                    continue
+                seen.add(child)
+                descendant = self._hashes.get(child)
+                if descendant is not None:
+                    cone.add(descendant)
+                    stack.append(child)
+        return cone
\ No newline at end of file
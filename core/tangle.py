@@ -1,5 +1,5 @@
-import random
 from collections import defaultdict
+from core.tip_pool import TipPool
 
 
 class Tangle:
@@ -9,7 +9,7 @@ class Tangle:
     
     def __init__(self):
         self.transactions = {}  # hash -> Transaction
-        self.tips = {self.GENESIS_HASH}  # Unbestätigte Transactions
+        self.tips = TipPool([self.GENESIS_HASH])  # Unbestätigte Transactions
         self.children = defaultdict(list)  # parent_hash -> [child_hashes]
         self.parents = {}  # tx_hash -> (parent1, parent2)
         self.confirmations = defaultdict(int)  # tx_hash -> count
@@ -32,11 +32,9 @@ class Tangle:
         if tx.parent2 != self.GENESIS_HASH and tx.parent2 != tx.parent1:
             self.children[tx.parent2].append(tx.hash)
         
+        self.tips.discard(tx.parent1)
+        self.tips.discard(tx.parent2)
         self.tips.add(tx.hash)
-        if tx.parent1 in self.tips:
-            self.tips.discard(tx.parent1)
-        if tx.parent2 in self.tips:
-            self.tips.discard(tx.parent2)
         
         self._update_confirmations(tx.hash)
         
@@ -49,18 +47,13 @@ class Tangle:
                 self.confirmations[parent] += 1
     
     def select_tips(self, count=2):
-        available_tips = list(self.tips)
-        
-        if not available_tips:
+        if not self.tips:
             return [self.GENESIS_HASH] * count
         
-        if len(available_tips) <= count:
-            result = available_tips.copy()
-            while len(result) < count:
-                result.append(self.GENESIS_HASH)
-            return result
-        
-        return random.sample(available_tips, count)
+        result = self.tips.sample(count)
+        while len(result) < count:
+            result.append(self.GENESIS_HASH)
+        return result
     
     def get_confirmed_transactions(self, min_confirmations=3):
         confirmed = []
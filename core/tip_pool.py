@@ -0,0 +1,105 @@
+import random
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+
+
+class TipPool:
+    """Tip-Menge mit O(1) für Einfügen, Entfernen und Ziehen.
+    
+    Die Tips liegen in einem Array; beim Entfernen wird das letzte Element
+    an die frei gewordene Stelle getauscht (Swap-Remove). Mit `max_size`
+    werden die ältesten Tips aus der Zufallsauswahl verdrängt, damit sie
+    beschränkt bleibt. Verdrängte Tips bleiben Tips: `evicted` zieht
+    zufällig aus ihnen bevorzugte Eltern, bis sie bestätigt sind; jede neue
+    Transaktion baut so bis zu zwei von ihnen ab. Auch die verdrängten sind
+    auf `max_evicted` (Standard: `max_size`) begrenzt; darüber hinaus
+    werden die ältesten aufgegeben und nicht mehr als Eltern gewählt.
+    """
+    
+    def __init__(
+        self,
+        tips: Iterable[str] = (),
+        max_size: Optional[int] = None,
+        max_evicted: Optional[int] = None
+    ):
+        self.max_size = max_size
+        self.max_evicted = max_size if max_evicted is None else max_evicted
+        self._items: List[str] = []
+        self._index: Dict[str, int] = {}
+        # Einfügereihenfolge für die Verdrängung (entfernte Einträge bleiben liegen)
+        self._order: Deque[str] = deque()
+        # Verdrängte, noch unbestätigte Tips (ebenfalls Swap-Remove)
+        self._evicted: List[str] = []
+        self._evicted_index: Dict[str, int] = {}
+        self._evicted_order: Deque[str] = deque()
+        for tip in tips:
+            self.add(tip)
+    
+    def add(self, tip: str) -> None:
+        if tip in self._index or tip in self._evicted_index:
+            return
+        self._index[tip] = len(self._items)
+        self._items.append(tip)
+        if self.max_size is not None:
+            self._order.append(tip)
+            while len(self._items) > self.max_size:
+                self._evict_oldest()
+            if len(self._order) > 2 * len(self._items) + 64:
+                self._order = deque(t for t in self._order if t in self._index)
+    
+    def discard(self, tip: str) -> None:
+        _swap_remove(self._evicted, self._evicted_index, tip)
+        _swap_remove(self._items, self._index, tip)
+    
+    def _evict_oldest(self) -> None:
+        while self._order:
+            tip = self._order.popleft()
+            if _swap_remove(self._items, self._index, tip):
+                self._evicted_index[tip] = len(self._evicted)
+                self._evicted.append(tip)
+                self._evicted_order.append(tip)
+                break
+        order = self._evicted_order
+        while len(self._evicted) > self.max_evicted:
+            _swap_remove(self._evicted, self._evicted_index, order.popleft())
+        if len(order) > 2 * len(self._evicted) + 64:
+            self._evicted_order = deque(t for t in order if t in self._evicted_index)
+    
+    def evicted(self, count: int) -> List[str]:
+        """Bis zu `count` verdrängte Tips, zufällig gezogen (bleiben bis zum Bestätigen)"""
+        if count >= len(self._evicted):
+            return list(self._evicted)
+        return [self._evicted[i] for i in random.sample(range(len(self._evicted)), count)]
+    
+    def sample(self, count: int) -> List[str]:
+        """Zieht bis zu `count` verschiedene nicht verdrängte Tips gleichverteilt in O(count)"""
+        if count >= len(self._items):
+            return list(self._items)
+        return [self._items[i] for i in random.sample(range(len(self._items)), count)]
+    
+    def choice(self) -> str:
+        if not self._items:
+            return self._evicted[random.randrange(len(self._evicted))]
+        return self._items[random.randrange(len(self._items))]
+    
+    def __contains__(self, tip: object) -> bool:
+        return tip in self._index or tip in self._evicted_index
+    
+    def __len__(self) -> int:
+        return len(self._items) + len(self._evicted)
+    
+    def __iter__(self) -> Iterator[str]:
+        # Verdrängte zuerst: ein neu aufgebauter Pool verdrängt sie wieder zuerst
+        evicted = [tip for tip in self._evicted_order if tip in self._evicted_index]
+        return iter([*dict.fromkeys(evicted), *self._items])
+
+
+def _swap_remove(items: List[str], index: Dict[str, int], tip: str) -> bool:
+    pos = index.pop(tip, None)
+    if pos is None:
+        return False
+    last = items.pop()
+    if pos < len(items):
+        items[pos] = last
+        index[last] = pos
+    return True
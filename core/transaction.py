@@ -1,52 +1,221 @@
+import sys
 import time
 import hashlib
 import json
 from typing import Any, Dict, Optional
+from core.encoding import VERSION_BINARY, VERSION_LEGACY, encode_transaction
 
 
 class Transaction:
+    """DAG-Transaktion mit festen Slots.
+    
+    Der Hash liegt als 32-Byte-Digest vor, Hex entsteht erst bei Zugriff auf
+    `hash`. Energie-Payloads werden in typisierte Attribute zerlegt; Payload-,
+    Dict- und JSON-Sichten werden beim ersten Zugriff erzeugt und gecacht
+    (die zurückgegebenen Objekte daher nicht verändern).
+    
+    Ab VERSION_BINARY wird über die kanonische Binärkodierung (core.encoding)
+    gehasht und signiert; VERSION_LEGACY erzeugt die alten JSON-Hashes.
+    """
+    
+    ENERGY_CONTRIBUTION = "energy_contribution"
+    DEFAULT_VERSION = VERSION_BINARY
+    
+    __slots__ = (
+        "digest",
+        "parent1",
+        "parent2",
+        "node_id",
+        "timestamp",
+        "signature",
+        "type",
+        "amount_kwh",
+        "source_id",
+        "extra",
+        "version",
+        "_encoded",
+        "_payload",
+        "_dict",
+        "_json"
+    )
+    
     def __init__(
         self,
         payload: Dict[str, Any],
         parent1: str,
         parent2: str,
         node_id: str,
-        signature: Optional[str] = None
+        signature: Optional[str] = None,
+        version: Optional[int] = None,
+        timestamp: Optional[float] = None
     ):
-        self.payload = payload
+        self.version = self.DEFAULT_VERSION if version is None else version
+        self._encoded = None
+        self._set_payload(payload)
         self.parent1 = parent1
         self.parent2 = parent2
-        self.node_id = node_id
-        self.timestamp = int(time.time())
+        self.node_id = sys.intern(node_id)
+        self.timestamp = int(time.time() if timestamp is None else timestamp)
         self.signature = signature
-        self.hash = self._compute_hash()
+        self._dict = None
+        self._json = None
+        self.digest = self._compute_digest()
     
-    def _compute_hash(self) -> str:
+    def _set_payload(self, payload: Dict[str, Any]) -> None:
+        kind = payload.get("type")
+        self.type = sys.intern(kind) if isinstance(kind, str) else None
+        amount_kwh = payload.get("amount_kwh", 0.0)
+        self.amount_kwh = float(amount_kwh) if isinstance(amount_kwh, (int, float)) else 0.0
+        source_id = payload.get("source_id", "")
+        self.source_id = sys.intern(source_id) if isinstance(source_id, str) else str(source_id)
+        # Payloads, die sich nicht verlustfrei aus den Attributen rekonstruieren
+        # lassen, werden unverändert gehalten (sonst ändert sich der Hash)
+        canonical = (
+            len(payload) == 3
+            and self.type is not None
+            and type(payload.get("amount_kwh")) is float
+            and isinstance(source_id, str)
+        )
+        self.extra = None if canonical else payload
+        self._payload = self.extra
+    
+    @property
+    def hash(self) -> str:
+        return self.digest.hex()
+    
+    @hash.setter
+    def hash(self, value: str) -> None:
+        self.digest = bytes.fromhex(value)
+        self._dict = None
+        self._json = None
+    
+    @property
+    def payload(self) -> Dict[str, Any]:
+        if self._payload is None:
+            self._payload = self._build_payload()
+        return self._payload
+    
+    def _build_payload(self) -> Dict[str, Any]:
+        if self.extra is not None:
+            return self.extra
+        return {
+            "type": self.type,
+            "amount_kwh": self.amount_kwh,
+            "source_id": self.source_id
+        }
+    
+    def encoded(self) -> bytes:
+        """Kanonische Binärkodierung inkl. Signatur (einmal berechnet, dann gecacht)"""
+        if self._encoded is None:
+            self._encoded = encode_transaction(self)
+        return self._encoded
+    
+    def signing_bytes(self) -> bytes:
+        """Zu signierende Bytes: die Kodierung ohne Signatur"""
+        if self.signature is None:
+            return self.encoded()
+        return encode_transaction(self, include_signature=False)
+    
+    def attach_signature(self, signature: str) -> None:
+        """Setzt die Signatur und berechnet Kodierung und Hash neu"""
+        self.signature = signature
+        self._encoded = None
+        self._dict = None
+        self._json = None
+        self.digest = self._compute_digest()
+    
+    def _compute_digest(self) -> bytes:
+        if self.version != VERSION_LEGACY:
+            return hashlib.sha256(self.encoded()).digest()
         data = {
-            "payload": self.payload,
+            "payload": self._payload if self._payload is not None else self._build_payload(),
             "parent1": self.parent1,
             "parent2": self.parent2,
             "node_id": self.node_id,
             "timestamp": self.timestamp,
             "signature": self.signature
         }
-        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).digest()
+    
+    def has_valid_digest(self) -> bool:
+        """Passt der Digest zum Inhalt? (from_dict übernimmt den Hash ungeprüft)"""
+        return self._compute_digest() == self.digest
+    
+    def _compute_hash(self) -> str:
+        return self._compute_digest().hex()
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Transaction":
+        """Stellt eine gespeicherte Transaktion ohne Neuberechnung des Hashes wieder her"""
+        tx = cls.__new__(cls)
+        tx.version = data.get("version", VERSION_LEGACY)
+        tx._encoded = None
+        tx._set_payload(data["payload"])
+        tx.parent1 = data["parent1"]
+        tx.parent2 = data["parent2"]
+        tx.node_id = sys.intern(data["node_id"])
+        tx.timestamp = data["timestamp"]
+        tx.signature = data.get("signature")
+        tx._dict = None
+        tx._json = None
+        tx.digest = bytes.fromhex(data["hash"])
+        return tx
+    
+    @classmethod
+    def from_energy(
+        cls,
+        version: int,
+        digest: bytes,
+        parent1: str,
+        parent2: str,
+        node_id: str,
+        timestamp: int,
+        signature: Optional[str],
+        amount_kwh: float,
+        source_id: str
+    ) -> "Transaction":
+        """Schnellpfad für Dekoder: kanonische Energie-Transaktion ohne Payload-Dict"""
+        tx = cls.__new__(cls)
+        tx.version = version
+        tx._encoded = None
+        tx.type = cls.ENERGY_CONTRIBUTION
+        tx.amount_kwh = amount_kwh
+        tx.source_id = sys.intern(source_id)
+        tx.extra = None
+        tx._payload = None
+        tx.parent1 = parent1
+        tx.parent2 = parent2
+        tx.node_id = sys.intern(node_id)
+        tx.timestamp = timestamp
+        tx.signature = signature
+        tx._dict = None
+        tx._json = None
+        tx.digest = digest
+        return tx
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "hash": self.hash,
-            "payload": self.payload,
-            "parent1": self.parent1,
-            "parent2": self.parent2,
-            "node_id": self.node_id,
-            "timestamp": self.timestamp,
-            "signature": self.signature
-        }
+        if self._dict is None:
+            self._dict = {
+                "hash": self.hash,
+                "payload": self.payload,
+                "parent1": self.parent1,
+                "parent2": self.parent2,
+                "node_id": self.node_id,
+                "timestamp": self.timestamp,
+                "signature": self.signature,
+                "version": self.version
+            }
+        return self._dict
+    
+    def to_json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps(self.to_dict(), separators=(",", ":"))
+        return self._json
     
     def is_energy_contribution(self) -> bool:
-        return self.payload.get("type") == "energy_contribution"
+        return self.type == self.ENERGY_CONTRIBUTION
     
     def get_energy_kwh(self) -> float:
         if self.is_energy_contribution():
-            return float(self.payload.get("amount_kwh", 0.0))
+            return self.amount_kwh
         return 0.0
\ No newline at end of file
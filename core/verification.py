@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from core.transaction import Transaction
+
+
+PublicKeyLike = Union[bytes, str, ed25519.Ed25519PublicKey]
+
+
+def public_key_bytes(public_key: PublicKeyLike) -> bytes:
+    """Normalisiert Public Keys (Objekt, Hex oder Rohbytes) auf 32 Rohbytes"""
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return public_key.public_bytes_raw()
+    if isinstance(public_key, str):
+        return bytes.fromhex(public_key)
+    return bytes(public_key)
+
+
+class PublicKeyRegistry:
+    """Ordnet Node-IDs ihren ed25519 Public Keys zu.
+    
+    Keys werden bei der Registrierung einmal deserialisiert und als Objekt
+    gecacht; für Prozess-Worker sind zusätzlich die Rohbytes abrufbar.
+    """
+    
+    def __init__(self):
+        self._raw: Dict[str, bytes] = {}
+        self._keys: Dict[str, ed25519.Ed25519PublicKey] = {}
+    
+    def register(self, node_id: str, public_key: PublicKeyLike) -> None:
+        raw = public_key_bytes(public_key)
+        if self._raw.get(node_id) == raw:
+            return
+        self._keys[node_id] = ed25519.Ed25519PublicKey.from_public_bytes(raw)
+        self._raw[node_id] = raw
+    
+    def get(self, node_id: str) -> Optional[ed25519.Ed25519PublicKey]:
+        return self._keys.get(node_id)
+    
+    def raw(self, node_id: str) -> Optional[bytes]:
+        return self._raw.get(node_id)
+    
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._raw
+    
+    def __len__(self) -> int:
+        return len(self._raw)
+    
+    def to_dict(self) -> Dict[str, str]:
+        return {node_id: raw.hex() for node_id, raw in self._raw.items()}
+    
+    def load_dict(self, data: Dict[str, str]) -> None:
+        for node_id, raw_hex in data.items():
+            self.register(node_id, raw_hex)
+
+
+def _verify_with_keys(items: Sequence[Tuple[ed25519.Ed25519PublicKey, bytes, bytes]]) -> List[bool]:
+    results = []
+    for key, signature, message in items:
+        try:
+            key.verify(signature, message)
+            results.append(True)
+        except InvalidSignature:
+            results.append(False)
+    return results
+
+
+def _verify_raw(items: Sequence[Tuple[bytes, bytes, bytes]]) -> List[bool]:
+    """Worker für Prozess-Pools: Keys kommen als Rohbytes (picklebar)"""
+    keys: Dict[bytes, ed25519.Ed25519PublicKey] = {}
+    prepared = []
+    for raw, signature, message in items:
+        key = keys.get(raw)
+        if key is None:
+            key = keys[raw] = ed25519.Ed25519PublicKey.from_public_bytes(raw)
+        prepared.append((key, signature, message))
+    return _verify_with_keys(prepared)
+
+
+class SignatureVerifier:
+    """Prüft Transaktions-Signaturen stapelweise auf einem Thread- oder Prozess-Pool.
+    
+    Ergebnisse landen in einem LRU-Cache mit Schlüssel (Public Key, Digest),
+    damit erneut übertragene Transaktionen nicht nochmals geprüft werden.
+    Transaktionen ohne Signatur oder ohne registrierten Key sind ungültig.
+    """
+    
+    CACHE_SIZE = 100_000
+    CHUNK_SIZE = 256
+    
+    def __init__(
+        self,
+        registry: PublicKeyRegistry,
+        workers: Optional[int] = None,
+        use_processes: bool = False,
+        cache_size: int = CACHE_SIZE,
+        chunk_size: int = CHUNK_SIZE
+    ):
+        self.registry = registry
+        self.workers = workers
+        self.use_processes = use_processes
+        self.cache_size = cache_size
+        self.chunk_size = chunk_size
+        self._cache: "OrderedDict[Tuple[bytes, bytes], bool]" = OrderedDict()
+        self._pool: Optional[Executor] = None
+    
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            pool_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.workers)
+        return self._pool
+    
+    def verify(self, tx: Transaction) -> bool:
+        return self.verify_batch([tx])[0]
+    
+    def verify_batch(self, txs: Sequence[Transaction]) -> List[bool]:
+        results: List[Optional[bool]] = [None] * len(txs)
+        pending: List[Tuple[int, Tuple[bytes, bytes]]] = []
+        items = []
+        for index, tx in enumerate(txs):
+            raw = self.registry.raw(tx.node_id)
+            if raw is None or not tx.signature:
+                results[index] = False
+                continue
+            cache_key = (raw, tx.digest)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                results[index] = cached
+                continue
+            try:
+                signature = bytes.fromhex(tx.signature)
+            except ValueError:
+                results[index] = False
+                continue
+            key = raw if self.use_processes else self.registry.get(tx.node_id)
+            pending.append((index, cache_key))
+            items.append((key, signature, tx.signing_bytes()))
+        
+        if pending:
+            for (index, cache_key), verdict in zip(pending, self._verify_items(items)):
+                results[index] = verdict
+                self._remember(cache_key, verdict)
+        return results
+    
+    def _verify_items(self, items: list) -> List[bool]:
+        worker = _verify_raw if self.use_processes else _verify_with_keys
+        if len(items) <= self.chunk_size:
+            return worker(items)
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        verdicts: List[bool] = []
+        for chunk_result in self._executor().map(worker, chunks):
+            verdicts.extend(chunk_result)
+        return verdicts
+    
+    def _remember(self, cache_key: Tuple[bytes, bytes], verdict: bool) -> None:
+        self._cache[cache_key] = verdict
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
\ No newline at end of file
@@ -0,0 +1,124 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from core.transaction import Transaction
+from energy.contribution import EnergyContribution
+
+
+class _Interner:
+    """Bildet Strings auf fortlaufende Indizes ab (Reihenfolge des ersten Auftretens)"""
+    
+    def __init__(self):
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+    
+    def intern(self, value: str) -> int:
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+class ContributionBatch:
+    """Energiemeldungen als Spalten für die vektorisierte Validierung.
+    
+    kWh liegen in einem float64-Array, Node- und Quellen-IDs als int32-
+    Indizes in `nodes` bzw. `sources` (jede ID nur einmal als String).
+    `from_transactions` liest die typisierten Transaktionsattribute direkt,
+    ohne `to_dict()`-Umweg; EnergyContribution-Objekte entstehen erst in
+    `contributions()` und nur für ausgewählte Zeilen. Rohe Ablesungen
+    (`from_readings`) haben noch keine Transaktion, `tx_hashes` ist dann None.
+    """
+    
+    def __init__(
+        self,
+        node_index: np.ndarray,
+        amount_kwh: np.ndarray,
+        source_index: np.ndarray,
+        nodes: List[str],
+        sources: List[str],
+        tx_hashes: Optional[Sequence[str]]
+    ):
+        self.node_index = node_index
+        self.amount_kwh = amount_kwh
+        self.source_index = source_index
+        self.nodes = nodes
+        self.sources = sources
+        self.tx_hashes = tx_hashes
+    
+    def __len__(self) -> int:
+        return len(self.amount_kwh)
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, float, str, str]]) -> "ContributionBatch":
+        """Aus (node_id, amount_kwh, source_id, transaction_hash)-Tupeln"""
+        nodes = _Interner()
+        sources = _Interner()
+        node_index = []
+        amounts = []
+        source_index = []
+        tx_hashes = []
+        for node_id, amount_kwh, source_id, tx_hash in records:
+            node_index.append(nodes.intern(node_id))
+            amounts.append(amount_kwh)
+            source_index.append(sources.intern(source_id))
+            tx_hashes.append(tx_hash)
+        return cls(
+            np.array(node_index, dtype=np.int32),
+            np.array(amounts, dtype=np.float64),
+            np.array(source_index, dtype=np.int32),
+            nodes.values,
+            sources.values,
+            tx_hashes
+        )
+    
+    @classmethod
+    def from_readings(
+        cls,
+        node_ids: Sequence[str],
+        amounts: Sequence[float],
+        source_ids: Sequence[str]
+    ) -> "ContributionBatch":
+        """Aus Ablesungen, für die noch keine Transaktion existiert"""
+        nodes = _Interner()
+        sources = _Interner()
+        return cls(
+            np.array([nodes.intern(node_id) for node_id in node_ids], dtype=np.int32),
+            np.array(amounts, dtype=np.float64),
+            np.array([sources.intern(source_id) for source_id in source_ids], dtype=np.int32),
+            nodes.values,
+            sources.values,
+            None
+        )
+    
+    @classmethod
+    def from_transactions(cls, txs: Iterable[Transaction]) -> "ContributionBatch":
+        return cls.from_records((tx.node_id, tx.amount_kwh, tx.source_id, tx.hash) for tx in txs)
+    
+    @classmethod
+    def from_contributions(cls, contributions: Iterable[EnergyContribution]) -> "ContributionBatch":
+        return cls.from_records(
+            (contrib.node_id, contrib.amount_kwh, contrib.source_id, contrib.transaction_hash)
+            for contrib in contributions
+        )
+    
+    def contributions(self, mask: np.ndarray) -> List[EnergyContribution]:
+        """EnergyContribution-Objekte für die Zeilen mit gesetzter Maske"""
+        rows = np.flatnonzero(mask)
+        nodes = self.nodes
+        sources = self.sources
+        tx_hashes = self.tx_hashes
+        return [
+            EnergyContribution(
+                node_id=nodes[node],
+                amount_kwh=amount_kwh,
+                source_id=sources[source],
+                transaction_hash=tx_hashes[row]
+            )
+            for row, node, amount_kwh, source in zip(
+                rows.tolist(),
+                self.node_index[rows].tolist(),
+                self.amount_kwh[rows].tolist(),
+                self.source_index[rows].tolist()
+            )
+        ]
\ No newline at end of file
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import Any, Dict
+from core.transaction import Transaction
 
 
 @dataclass
@@ -17,4 +18,14 @@ class EnergyContribution:
             amount_kwh=float(payload["amount_kwh"]),
             source_id=str(payload["source_id"]),
             transaction_hash=tx_hash
+        )
+    
+    @classmethod
+    def from_tx(cls, tx: Transaction) -> "EnergyContribution":
+        """Liest die typisierten Attribute direkt, ohne Dict-Umweg"""
+        return cls(
+            node_id=tx.node_id,
+            amount_kwh=tx.amount_kwh,
+            source_id=tx.source_id,
+            transaction_hash=tx.hash
         )
\ No newline at end of file
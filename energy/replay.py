@@ -0,0 +1,149 @@
+import heapq
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+ReportKey = Tuple[str, str, int]
+
+
+class BloomFilter:
+    """Bloom-Filter über einem bytearray.
+    
+    Die k Positionen entstehen per Double Hashing aus Pythons hash(); der
+    Filter ist daher nur prozesslokal gültig und wird beim Laden neu befüllt.
+    """
+    
+    def __init__(self, size_bits: int, hashes: int = 4):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self._bits = bytearray((size_bits + 7) // 8)
+    
+    def _positions(self, key: Hashable) -> List[int]:
+        h1 = hash(key)
+        h2 = hash((h1, self.hashes)) | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.hashes)]
+    
+    def add(self, key: Hashable) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class ReplayGuard:
+    """Erkennt wiederholte Energiemeldungen in O(1).
+    
+    Schlüssel ist (node_id, source_id, Ablesefenster); das Fenster ergibt
+    sich aus dem Ablesezeitpunkt geteilt durch `window`. Einträge verfallen
+    `retention` Sekunden nach dem Ende ihres Fensters; Meldungen, deren
+    Fenster so alt ist, gelten immer als Replay. Zusätzlich begrenzt
+    `max_entries` den Speicher (früheste Ablaufzeit zuerst).
+    
+    Optional merkt sich ein rotierender Bloom-Filter (ca. 1-2 Bytes pro
+    Meldung) auch die Einträge, die wegen `max_entries` vor ihrem Ablauf
+    verdrängt wurden. Er wird nur befragt, solange solche Einträge gültig
+    wären; der Normalfall bleibt ein einzelner Dict-Zugriff. Dabei sind
+    seltene Fehlalarme (Ablehnung einer neuen Meldung) möglich.
+    """
+    
+    WINDOW_SECONDS = 900
+    RETENTION_SECONDS = 24 * 3600
+    MAX_ENTRIES = 1_000_000
+    
+    def __init__(
+        self,
+        window: float = WINDOW_SECONDS,
+        retention: float = RETENTION_SECONDS,
+        max_entries: int = MAX_ENTRIES,
+        bloom_bits: Optional[int] = None
+    ):
+        self.window = window
+        self.retention = retention
+        self.max_entries = max_entries
+        self.bloom_bits = bloom_bits
+        self._expires: Dict[ReportKey, float] = {}
+        # Heap nach Ablaufzeit (Meldungen kommen nicht in Fensterreihenfolge)
+        self._order: List[Tuple[float, ReportKey]] = []
+        self._bloom: Optional[BloomFilter] = None
+        self._previous_bloom: Optional[BloomFilter] = None
+        self._bloom_rotated = 0.0
+        # Bis hierhin wären wegen max_entries verdrängte Einträge noch gültig
+        self._overflow_until = 0.0
+        if bloom_bits:
+            self._bloom = BloomFilter(bloom_bits)
+            self._bloom_rotated = time.time()
+    
+    def __len__(self) -> int:
+        return len(self._expires)
+    
+    def key(self, node_id: str, source_id: str, reading_time: Optional[float] = None) -> ReportKey:
+        if reading_time is None:
+            reading_time = time.time()
+        return node_id, source_id, int(reading_time // self.window)
+    
+    def expires(self, key: ReportKey) -> float:
+        """Ende des Ablesefensters plus `retention`"""
+        return (key[2] + 1) * self.window + self.retention
+    
+    def is_duplicate(self, key: ReportKey, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        if self.expires(key) <= now:
+            # Älter als retention: nicht mehr nachprüfbar, also abgelehnt
+            return True
+        self._evict(now)
+        if key in self._expires:
+            return True
+        if self._bloom is None or now >= self._overflow_until:
+            return False
+        return key in self._bloom or (self._previous_bloom is not None and key in self._previous_bloom)
+    
+    def remember(self, key: ReportKey, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        expires = self.expires(key)
+        if key in self._expires or expires <= now:
+            return
+        self._expires[key] = expires
+        heapq.heappush(self._order, (expires, key))
+        if self._bloom is not None:
+            self._bloom.add(key)
+        while len(self._expires) > self.max_entries:
+            evicted_expires, evicted = heapq.heappop(self._order)
+            if self._expires.pop(evicted, None) is not None:
+                self._overflow_until = max(self._overflow_until, evicted_expires)
+    
+    def check_and_remember(self, key: ReportKey, now: Optional[float] = None) -> bool:
+        """True, wenn die Meldung neu ist (und ab jetzt bekannt), False bei Replay"""
+        if self.is_duplicate(key, now):
+            return False
+        self.remember(key, now)
+        return True
+    
+    def _evict(self, now: float) -> None:
+        order = self._order
+        while order and order[0][0] <= now:
+            expires, key = heapq.heappop(order)
+            if self._expires.get(key) == expires:
+                del self._expires[key]
+        if self._bloom is not None and now - self._bloom_rotated >= self.retention:
+            # Nach einer Rotation kennt der alte Filter alle noch gültigen Einträge
+            self._previous_bloom = self._bloom
+            self._bloom = BloomFilter(self.bloom_bits)
+            self._bloom_rotated = now
+    
+    def to_list(self) -> List[list]:
+        return [[node_id, source_id, window, expires] for (node_id, source_id, window), expires in self._expires.items()]
+    
+    def load_list(self, entries: List[list]) -> None:
+        """Ersetzt den Inhalt durch gespeicherte Einträge"""
+        self._expires = {}
+        self._order = []
+        if self._bloom is not None:
+            self._bloom = BloomFilter(self.bloom_bits)
+            self._previous_bloom = None
+        for node_id, source_id, window, expires in sorted(entries, key=lambda entry: entry[3]):
+            key = (node_id, source_id, window)
+            self._expires[key] = expires
+            # Sortiert ist die Liste bereits ein Heap
+            self._order.append((expires, key))
+            if self._bloom is not None:
+                self._bloom.add(key)
\ No newline at end of file
@@ -0,0 +1,343 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from core.transaction import Transaction
+from energy.batch import ContributionBatch
+from energy.validator import EnergyValidator
+
+# Reihen-Schlüssel: (Art, Name)
+TOTAL = ("total", "")
+NODE = "node"
+SOURCE = "source"
+SOURCE_TYPE = "type"
+
+Key = Tuple[str, str]
+
+
+class _Tier:
+    """Tumbling-Fenster einer Auflösung als Ringpuffer über alle Reihen.
+    
+    `windows[slot]` ist die Fensternummer (Zeit // Breite), die der Slot
+    gerade hält (-1 = leer). Die kWh liegen blockweise: der Ring ist in
+    Blöcke zu BLOCK Slots geteilt, `blocks[reihe, block]` zeigt auf eine
+    Zeile von `pool` (-1 = nichts gebucht). Ein Block wird erst bei der
+    ersten Buchung der Reihe belegt und wieder frei, sobald alle seine
+    Fenster abgelaufen sind; eine Reihe kostet so 4 Bytes je Block plus
+    die Blöcke, in denen sie tatsächlich Werte hat.
+    """
+    
+    __slots__ = ("width", "windows", "blocks", "pool", "used", "free")
+    
+    BLOCK = 32
+    
+    def __init__(self, width: int, slots: int, rows: int):
+        self.width = width
+        self.windows = np.full(slots, -1, dtype=np.int64)
+        self.blocks = np.full((rows, -(-slots // self.BLOCK)), -1, dtype=np.int32)
+        self.pool = np.zeros((self.BLOCK, self.BLOCK), dtype=np.float64)
+        # Belegte Pool-Zeilen (Hochwassermarke) und wieder freigegebene darunter
+        self.used = 0
+        self.free: List[int] = []
+    
+    def grow(self, rows: int) -> None:
+        blocks = np.full((rows, self.blocks.shape[1]), -1, dtype=np.int32)
+        blocks[:len(self.blocks)] = self.blocks
+        self.blocks = blocks
+    
+    def _allocate(self, count: int) -> np.ndarray:
+        reused = self.free[-count:] if count else []
+        del self.free[len(self.free) - len(reused):]
+        fresh = count - len(reused)
+        if self.used + fresh > len(self.pool):
+            pool = np.zeros((max(2 * len(self.pool), self.used + fresh), self.BLOCK), dtype=np.float64)
+            pool[:self.used] = self.pool[:self.used]
+            self.pool = pool
+        ids = np.concatenate((np.array(reused, dtype=np.int32), np.arange(self.used, self.used + fresh, dtype=np.int32)))
+        self.used += fresh
+        return ids
+    
+    def _expire(self, slots: List[int]) -> None:
+        """Leert Slots in allen Reihen; Blöcke ohne Werte werden frei"""
+        slots = np.array(slots, dtype=np.int64)
+        for block in np.unique(slots // self.BLOCK).tolist():
+            rows = np.flatnonzero(self.blocks[:, block] >= 0)
+            if not len(rows):
+                continue
+            ids = self.blocks[rows, block]
+            offsets = slots[slots // self.BLOCK == block] % self.BLOCK
+            self.pool[np.ix_(ids, offsets)] = 0.0
+            empty = ~self.pool[ids].any(axis=1)
+            self.blocks[rows[empty], block] = -1
+            self.free.extend(ids[empty].tolist())
+    
+    def add(self, rows: np.ndarray, times: np.ndarray, amounts: np.ndarray) -> None:
+        """Bucht `amounts[i]` auf alle Reihen `rows[i]` im Fenster von `times[i]`"""
+        size = len(self.windows)
+        windows = (times // self.width).astype(np.int64)
+        slots = windows % size
+        expired = []
+        for window in np.unique(windows).tolist():
+            slot = window % size
+            if self.windows[slot] < window:
+                # Der Slot hält ein abgelaufenes Fenster
+                self.windows[slot] = window
+                expired.append(slot)
+        if expired:
+            self._expire(expired)
+        # Meldungen älter als die Aufbewahrung fallen weg
+        keep = self.windows[slots] == windows
+        per_row = rows.shape[1]
+        self.book(rows[keep].ravel(), np.repeat(slots[keep], per_row), np.repeat(amounts[keep], per_row))
+    
+    def book(self, rows: np.ndarray, slots: np.ndarray, amounts: np.ndarray) -> None:
+        """Addiert `amounts` auf die Zellen (rows, slots); belegt fehlende Blöcke"""
+        blocks = slots // self.BLOCK
+        ids = self.blocks[rows, blocks]
+        missing = ids < 0
+        if missing.any():
+            width = self.blocks.shape[1]
+            pairs = np.unique(rows[missing] * width + blocks[missing])
+            self.blocks[pairs // width, pairs % width] = self._allocate(len(pairs))
+            ids = self.blocks[rows, blocks]
+        np.add.at(self.pool, (ids, slots % self.BLOCK), amounts)
+    
+    def read(self, rows: List[int], slots: np.ndarray) -> np.ndarray:
+        """Summe der Reihen `rows` je Slot"""
+        ids = self.blocks[np.ix_(rows, slots // self.BLOCK)]
+        values = self.pool[np.maximum(ids, 0), slots % self.BLOCK]
+        return np.where(ids >= 0, values, 0.0).sum(axis=0)
+    
+    def cells(self, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(Reihen, Slots, kWh) aller Zellen mit Wert, Reihen unter `count`"""
+        rows, blocks = np.nonzero(self.blocks[:count] >= 0)
+        ids = self.blocks[rows, blocks]
+        index, offsets = np.nonzero(self.pool[ids])
+        return rows[index], blocks[index] * self.BLOCK + offsets, self.pool[ids[index], offsets]
+    
+    def newest(self) -> int:
+        return int(self.windows.max())
+    
+    def nbytes(self) -> int:
+        return self.windows.nbytes + self.blocks.nbytes + self.pool.nbytes
+
+
+class EnergyRollups:
+    """Inkrementelle kWh-Summen pro Node, Quelle, Quellentyp und gesamt.
+    
+    Drei Auflösungen (Minute, Stunde, Tag) als Ringpuffer mit fester Zahl
+    von Fenstern (`retention`); jede Meldung wird beim Einfügen in alle drei
+    gebucht, ein Stundenfenster ist also die Summe seiner Minuten. Ältere
+    Fenster verfallen pro Auflösung, sobald ihr Slot wiederverwendet wird:
+    Minuten nach zwei Stunden, Stunden nach zwei Wochen, Tage nach zwei
+    Jahren. Abfragen lesen nur die Fenster des Bereichs (O(Fenster) statt
+    O(Historie)); ein Quellentyp ist das erlaubte Präfix des EnergyValidator
+    ("solar", "wind", ...). Speicher pro Reihe: 8 Bytes je Fenster nur in
+    den Blöcken, in denen sie gebucht hat (siehe _Tier), sonst 4 Bytes je
+    Block von 32 Fenstern.
+    
+    Gezählt werden Energiemeldungen, die der EnergyValidator akzeptiert,
+    zum Zeitstempel der Transaktion.
+    """
+    
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+    WIDTHS = {MINUTE: 60, HOUR: 3600, DAY: 86400}
+    RETENTION = {MINUTE: 120, HOUR: 24 * 14, DAY: 2 * 366}
+    INITIAL_ROWS = 64
+    
+    def __init__(self, retention: Optional[Dict[str, int]] = None):
+        self.retention = {**self.RETENTION, **(retention or {})}
+        self._lock = threading.Lock()
+        self._keys: List[Key] = []
+        self._rows: Dict[Key, int] = {}
+        self._tiers = {
+            resolution: _Tier(width, self.retention[resolution], self.INITIAL_ROWS)
+            for resolution, width in self.WIDTHS.items()
+        }
+        self._row(TOTAL)
+    
+    def __len__(self) -> int:
+        """Anzahl der Reihen"""
+        return len(self._keys)
+    
+    def _row(self, key: Key) -> int:
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self._keys)
+            self._keys.append(key)
+            capacity = len(self._tiers[self.MINUTE].blocks)
+            if row >= capacity:
+                for tier in self._tiers.values():
+                    tier.grow(2 * capacity)
+        return row
+    
+    def _rows_for(self, kind: str, names: List[str], used: np.ndarray) -> np.ndarray:
+        """Reihen zu den internierten Namen eines Batches (nur für benutzte Indizes)"""
+        rows = np.zeros(len(names), dtype=np.int64)
+        for index in np.unique(used).tolist():
+            rows[index] = self._row((kind, names[index]))
+        return rows[used]
+    
+    def add(self, node_id: str, amount_kwh: float, source_id: str, at: float) -> bool:
+        """Einzelne Meldung; False, wenn der EnergyValidator sie ablehnt"""
+        batch = ContributionBatch.from_readings([node_id], [amount_kwh], [source_id])
+        return bool(self.add_batch(batch, np.array([at], dtype=np.float64))[0])
+    
+    def add_transactions(self, txs: Iterable[Transaction]) -> int:
+        """Bucht die gültigen Energiemeldungen unter `txs`; liefert ihre Anzahl"""
+        txs = [tx for tx in txs if tx.is_energy_contribution()]
+        if not txs:
+            return 0
+        times = np.fromiter((tx.timestamp for tx in txs), dtype=np.float64, count=len(txs))
+        return int(self.add_batch(ContributionBatch.from_transactions(txs), times).sum())
+    
+    def add_batch(self, batch: ContributionBatch, times: np.ndarray) -> np.ndarray:
+        """Validiert den Batch und bucht die gültigen Zeilen; liefert die Maske"""
+        valid, _ = EnergyValidator.validate_columns(batch)
+        selected = np.flatnonzero(valid)
+        if not len(selected):
+            return valid
+        source_index = batch.source_index[selected]
+        types = [EnergyValidator.source_type(source_id) or "" for source_id in batch.sources]
+        with self._lock:
+            rows = np.column_stack((
+                np.zeros(len(selected), dtype=np.int64),
+                self._rows_for(NODE, batch.nodes, batch.node_index[selected]),
+                self._rows_for(SOURCE, batch.sources, source_index),
+                self._rows_for(SOURCE_TYPE, types, source_index)
+            ))
+            amounts = batch.amount_kwh[selected]
+            for tier in self._tiers.values():
+                tier.add(rows, times[selected], amounts)
+        return valid
+    
+    def _select(self, node_id: Optional[str], source_prefix: Optional[str]) -> List[int]:
+        if node_id is not None and source_prefix is not None:
+            raise ValueError("Filter either by node_id or by source_prefix")
+        if node_id is not None:
+            row = self._rows.get((NODE, node_id))
+            return [] if row is None else [row]
+        if source_prefix is not None:
+            row = self._rows.get((SOURCE_TYPE, source_prefix))
+            if row is not None:
+                return [row]
+            return [
+                row for (kind, name), row in self._rows.items()
+                if kind == SOURCE and name.startswith(source_prefix)
+            ]
+        return [0]
+    
+    def series(
+        self,
+        start: float,
+        end: float,
+        resolution: str = HOUR,
+        node_id: Optional[str] = None,
+        source_prefix: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(Fensteranfänge, kWh) für alle Fenster, die [start, end) überlappen.
+        
+        Ohne Filter die Gesamtsumme, sonst eine Node oder alle Quellen mit
+        dem Präfix. Fenster außerhalb der Aufbewahrung fehlen im Ergebnis.
+        """
+        with self._lock:
+            tier = self._tiers[resolution]
+            rows = self._select(node_id, source_prefix)
+            newest = tier.newest()
+            first = max(int(start // tier.width), newest - len(tier.windows) + 1)
+            stop = min(int(-(-end // tier.width)), newest + 1)
+            windows = np.arange(first, max(first, stop), dtype=np.int64)
+            slots = windows % len(tier.windows)
+            values = tier.read(rows, slots)
+            values[tier.windows[slots] != windows] = 0.0
+        return windows * tier.width, values
+    
+    def total(
+        self,
+        start: float,
+        end: float,
+        resolution: str = HOUR,
+        node_id: Optional[str] = None,
+        source_prefix: Optional[str] = None
+    ) -> float:
+        """kWh über alle Fenster, die [start, end) überlappen"""
+        _, values = self.series(start, end, resolution, node_id, source_prefix)
+        return float(values.sum())
+    
+    def memory_usage(self) -> int:
+        """Bytes der Fenster-, Block- und Pool-Arrays (ohne Reihen-Schlüssel)"""
+        return sum(tier.nbytes() for tier in self._tiers.values())
+    
+    def keys(self, kind: str) -> List[str]:
+        """Namen aller Reihen einer Art (NODE, SOURCE oder SOURCE_TYPE)"""
+        return [name for key_kind, name in self._keys if key_kind == kind]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-Form; Zellen nur, wo kWh gebucht sind"""
+        with self._lock:
+            count = len(self._keys)
+            tiers = {}
+            for resolution, tier in self._tiers.items():
+                rows, slots, values = tier.cells(count)
+                tiers[resolution] = {
+                    "windows": tier.windows.tolist(),
+                    "cells": [list(cell) for cell in zip(rows.tolist(), slots.tolist(), values.tolist())]
+                }
+            return {"retention": dict(self.retention), "keys": [list(key) for key in self._keys], "tiers": tiers}
+    
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Ersetzt den Inhalt durch gespeicherte Summen (Format von to_dict)"""
+        with self._lock:
+            self._reset(data["retention"], data["keys"])
+            for resolution, stored in data["tiers"].items():
+                tier = self._tiers[resolution]
+                tier.windows[:] = stored["windows"]
+                if stored["cells"]:
+                    rows, slots, values = zip(*stored["cells"])
+                    tier.book(np.array(rows, dtype=np.int64), np.array(slots, dtype=np.int64), np.array(values))
+    
+    def to_bytes(self) -> Tuple[Dict[str, Any], bytes]:
+        """(Metadaten, little-endian Arrays je Auflösung: Fenster und Zellen).
+        
+        Zellen sind Reihen (i8), Slots (i8) und kWh (f8) der gebuchten
+        Werte; ihre Anzahl je Auflösung steht in den Metadaten.
+        """
+        with self._lock:
+            count = len(self._keys)
+            parts = []
+            cells = {}
+            for resolution, tier in self._tiers.items():
+                rows, slots, values = tier.cells(count)
+                cells[resolution] = len(rows)
+                parts.append(tier.windows.astype("<i8").tobytes())
+                parts.append(rows.astype("<i8").tobytes())
+                parts.append(slots.astype("<i8").tobytes())
+                parts.append(values.astype("<f8").tobytes())
+            meta = {"retention": dict(self.retention), "keys": [list(key) for key in self._keys], "cells": cells}
+            return meta, b"".join(parts)
+    
+    def load_bytes(self, meta: Dict[str, Any], data: Any) -> None:
+        with self._lock:
+            self._reset(meta["retention"], meta["keys"])
+            offset = 0
+            for resolution, tier in self._tiers.items():
+                size = len(tier.windows)
+                tier.windows[:] = np.frombuffer(data, dtype="<i8", count=size, offset=offset)
+                offset += 8 * size
+                cells = meta["cells"][resolution]
+                rows = np.frombuffer(data, dtype="<i8", count=cells, offset=offset)
+                slots = np.frombuffer(data, dtype="<i8", count=cells, offset=offset + 8 * cells)
+                values = np.frombuffer(data, dtype="<f8", count=cells, offset=offset + 16 * cells)
+                offset += 24 * cells
+                tier.book(rows.astype(np.int64), slots.astype(np.int64), values)
+    
+    def _reset(self, retention: Dict[str, int], keys: Iterable[Iterable[str]]) -> None:
+        self.retention = dict(retention)
+        self._keys = [tuple(key) for key in keys]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        rows = max(self.INITIAL_ROWS, len(self._keys))
+        self._tiers = {
+            resolution: _Tier(width, self.retention[resolution], rows)
+            for resolution, width in self.WIDTHS.items()
+        }
\ No newline at end of file
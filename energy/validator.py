@@ -1,4 +1,8 @@
-from typing import Dict, Any, List
+import functools
+import re
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from energy.batch import ContributionBatch
 from energy.contribution import EnergyContribution
 
 
@@ -6,6 +10,35 @@ class EnergyValidator:
     MIN_KWH = 0.1
     MAX_KWH = 10000.0
     ALLOWED_SOURCE_PREFIXES = {"solar", "wind", "hydro", "geothermal"}
+    # Ein vorkompiliertes Muster statt any(startswith) über die Präfixe
+    _SOURCE_PATTERN = re.compile("|".join(sorted(map(re.escape, ALLOWED_SOURCE_PREFIXES))))
+    
+    # Ablehnungsgründe von validate_columns (bei mehreren gilt der erste Regelverstoß)
+    VALID = 0
+    NON_POSITIVE = 1
+    MISSING_ID = 2
+    MISSING_HASH = 3
+    OUT_OF_RANGE = 4
+    UNKNOWN_SOURCE = 5
+    REASON_NAMES = {
+        NON_POSITIVE: "invalid_amount",
+        MISSING_ID: "missing_id",
+        MISSING_HASH: "missing_hash",
+        OUT_OF_RANGE: "amount_out_of_range",
+        UNKNOWN_SOURCE: "unknown_source"
+    }
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def source_allowed(source_id: str) -> bool:
+        """Präfixprüfung mit Ergebnis-Cache pro Quellen-ID"""
+        return EnergyValidator._SOURCE_PATTERN.match(source_id) is not None
+    
+    @staticmethod
+    def source_type(source_id: str) -> Optional[str]:
+        """Das erlaubte Präfix der Quelle ("solar_panel_1" → "solar"), sonst None"""
+        match = EnergyValidator._SOURCE_PATTERN.match(source_id)
+        return match.group(0) if match else None
     
     @staticmethod
     def validate_contribution(contribution: EnergyContribution) -> bool:
@@ -22,11 +55,40 @@ class EnergyValidator:
             return False
         
         # Quellen-Validierung (erlaubt: "solar_panel_1", "wind_turbine_alpha")
-        if not any(contribution.source_id.startswith(prefix) for prefix in EnergyValidator.ALLOWED_SOURCE_PREFIXES):
+        if not EnergyValidator.source_allowed(contribution.source_id):
             return False
         
         return True
     
     @staticmethod
     def validate_batch(contributions: List[EnergyContribution]) -> List[EnergyContribution]:
-        return [c for c in contributions if EnergyValidator.validate_contribution(c)]
\ No newline at end of file
+        batch = ContributionBatch.from_contributions(contributions)
+        valid, _ = EnergyValidator.validate_columns(batch)
+        return [contrib for contrib, ok in zip(contributions, valid.tolist()) if ok]
+    
+    @staticmethod
+    def validate_columns(batch: ContributionBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """Wendet alle Regeln als Masken auf den Batch an.
+        
+        Liefert (gültig, Grund) mit einem Eintrag pro Zeile; String-Regeln
+        werden nur einmal pro Node- bzw. Quellen-ID ausgewertet. Ohne
+        `tx_hashes` (rohe Ablesungen) entfällt die Hash-Regel.
+        """
+        amounts = batch.amount_kwh
+        node_ok = np.array([bool(node_id) for node_id in batch.nodes], dtype=bool)
+        source_present = np.array([bool(source_id) for source_id in batch.sources], dtype=bool)
+        source_ok = np.array([EnergyValidator.source_allowed(source_id) for source_id in batch.sources], dtype=bool)
+        
+        # Rückwärts zuweisen, damit die erste verletzte Regel gewinnt
+        reasons = np.zeros(len(batch), dtype=np.uint8)
+        if len(source_ok):
+            reasons[~source_ok[batch.source_index]] = EnergyValidator.UNKNOWN_SOURCE
+        in_range = (amounts >= EnergyValidator.MIN_KWH) & (amounts <= EnergyValidator.MAX_KWH)
+        reasons[~in_range] = EnergyValidator.OUT_OF_RANGE
+        if batch.tx_hashes is not None:
+            hash_ok = np.fromiter((bool(tx_hash) for tx_hash in batch.tx_hashes), dtype=bool, count=len(batch))
+            reasons[~hash_ok] = EnergyValidator.MISSING_HASH
+        if len(node_ok):
+            reasons[~(node_ok[batch.node_index] & source_present[batch.source_index])] = EnergyValidator.MISSING_ID
+        reasons[amounts <= 0] = EnergyValidator.NON_POSITIVE
+        return reasons == EnergyValidator.VALID, reasons
\ No newline at end of file
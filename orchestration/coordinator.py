@@ -1,186 +1,1071 @@
+import hashlib
+import itertools
 import json
 import os
-from collections import defaultdict
-from typing import List, Dict, Any
+import random
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
+from core.compact_dag import CompactDAG
+from core import merkle
+from core.crypto import Wallet
 from core.dag import DAG
+from core.encoding import decode_transaction
 from core.node import Node
+from core.pruning import Pruner
 from core.transaction import Transaction
+from core.verification import PublicKeyLike, PublicKeyRegistry, SignatureVerifier
+from energy.batch import ContributionBatch
 from energy.contribution import EnergyContribution
-from tokens.ledger import TokenLedger
+from energy.replay import ReplayGuard
+from energy.rollups import EnergyRollups
+from energy.validator import EnergyValidator
+from tokens.columnar_ledger import ColumnarTokenLedger
+from tokens.history import BalanceHistory
+from tokens.ledger import TokenLedger, to_units
 from tokens.minting import TokenMinter
+from tokens.processed import ProcessedIndex
 from compute.scheduler import JobScheduler
+from compute.escrow import TokenEscrow
 from compute.executor import ComputeExecutor
 from compute.job import ComputeJob
+from storage import snapshot, wal
+from storage.sqlite_store import SQLiteStore
+from storage.wal import WriteAheadLog
+
+
+def _json_bytes(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
 
 
 class Coordinator:
     STATE_FILE = "atlas_state.json"
+    # Obergrenze der Tips, die für einen Batch einmalig gezogen werden
+    BATCH_TIP_SAMPLE = 256
+    # Nach so vielen WAL-Records schreibt save_state einen Snapshot
+    COMPACT_EVERY = 50_000
     
-    def __init__(self):
-        self.dag = DAG()
-        self.ledger = TokenLedger()
+    def __init__(
+        self,
+        tip_selection: str = DAG.TIP_SELECTION_UNIFORM,
+        max_tips: Optional[int] = None,
+        compact_dag: bool = False,
+        body_path: Optional[str] = None,
+        columnar_ledger: bool = False,
+        balance_history: bool = False,
+        energy_rollups: bool = False,
+        job_weights: Optional[Dict[str, float]] = None,
+        compute_pool: bool = False,
+        compute_workers: Optional[int] = None,
+        compute_processes: bool = False,
+        job_timeout: Optional[float] = None,
+        require_signatures: bool = False,
+        verify_workers: Optional[int] = None,
+        verify_processes: bool = False,
+        verify_state: bool = True,
+        prune_keep_last: Optional[int] = None,
+        prune_max_age: Optional[float] = None,
+        archive_path: Optional[str] = None,
+        reachability: bool = False,
+        replay_window: Optional[float] = None,
+        replay_bloom_bits: Optional[int] = None,
+        journal_dir: Optional[str] = None,
+        database: Optional[str] = None,
+        fsync_interval: float = WriteAheadLog.FSYNC_INTERVAL,
+        compact_every: int = COMPACT_EVERY,
+        snapshot_compression: Optional[str] = None
+    ):
+        self.tip_selection = tip_selection
+        self.max_tips = max_tips
+        # Bodies in eine Datei auslagern (setzt die CompactDAG-Engine voraus);
+        # mit `database` liest die CompactDAG sie stattdessen aus SQLite
+        self.body_path = body_path
+        self.compact_dag = compact_dag or body_path is not None
+        self.reachability = reachability
+        self.pruner = Pruner(keep_last=prune_keep_last, max_age=prune_max_age, archive_path=archive_path)
+        # Replay-Schutz für Energiemeldungen (aktiv, wenn ein Fenster gesetzt ist)
+        self.replay_guard = None
+        if replay_window is not None:
+            self.replay_guard = ReplayGuard(window=replay_window, bloom_bits=replay_bloom_bits)
+        self.require_signatures = require_signatures
+        self.key_registry = PublicKeyRegistry()
+        # Geladene Zustände gegen die gespeicherten Merkle-Roots prüfen
+        self.verify_state = verify_state
+        self.verifier = SignatureVerifier(
+            self.key_registry,
+            workers=verify_workers,
+            use_processes=verify_processes
+        )
+        # Guthaben als NumPy-Spalte (Festkomma) statt Dict
+        self.columnar_ledger = columnar_ledger
+        # Buchungen mit Zeitpunkt festhalten (ledger.balance_at / supply_at)
+        self.balance_history = balance_history
+        self.ledger = self._new_ledger()
+        # kWh pro Node/Quelle in Minuten-, Stunden- und Tagesfenstern (rollups.series)
+        self.energy_rollups = energy_rollups
+        self.rollups = EnergyRollups() if energy_rollups else None
         self.minter = TokenMinter(self.ledger)
-        self.scheduler = JobScheduler(self.ledger)
-        self.executor = ComputeExecutor(self.ledger)
+        # Anteile der Nodes am Compute-Durchsatz (Weighted Fair Queueing, Standard 1.0)
+        self.job_weights = job_weights
+        self.scheduler = JobScheduler(self.ledger, job_weights)
+        # Pool-Modus: Kosten beim Einreichen reservieren, Jobs per dispatch_jobs()
+        # auf einem Thread- oder Prozess-Pool ausführen, collect_results() rechnet ab
+        self.compute_pool = compute_pool
+        self.compute_workers = compute_workers
+        self.compute_processes = compute_processes
+        self.job_timeout = job_timeout
+        self.executor = self._new_executor()
+        self.escrow = TokenEscrow(self.ledger)
+        # Jobs, die beim Verteilen scheiterten; collect_results() meldet sie
+        self._dispatch_errors: List[Dict[str, Any]] = []
         self.nodes: Dict[str, Node] = {}
+        # Persistenz über ein Write-Ahead-Log oder SQLite statt kompletter JSON-Dateien;
+        # beide Backends nehmen dieselben Records entgegen
+        self.journal: Optional[Union[WriteAheadLog, SQLiteStore]] = None
+        if database:
+            self.journal = SQLiteStore(database, fsync_interval=fsync_interval)
+        elif journal_dir:
+            self.journal = WriteAheadLog(journal_dir, fsync_interval=fsync_interval)
+        self.dag = self._new_dag()
+        self.compact_every = compact_every
+        self.snapshot_compression = snapshot_compression
+        self._replaying = False
+        # Kurzer kritischer Abschnitt für DAG (Tips, Bestätigungen), Journal,
+        # Nodes, Replay-Schutz und Pruner. Hashing, Signieren und Prüfen der
+        # Signaturen laufen außerhalb; Ledger und Scheduler haben eigene Locks.
+        self._lock = threading.RLock()
+    
+    def _new_dag(self) -> DAG:
+        options = {
+            "tip_selection": self.tip_selection,
+            "max_tips": self.max_tips,
+            "reachability": self.reachability
+        }
+        if not self.compact_dag:
+            return DAG(**options)
+        if isinstance(self.journal, SQLiteStore):
+            # Die Tabelle `transactions` hält die Bodies ohnehin
+            return CompactDAG(body_table=self.journal.bodies(), **options)
+        return CompactDAG(body_path=self.body_path, **options)
+    
+    def _new_ledger(self) -> TokenLedger:
+        history = BalanceHistory() if self.balance_history else None
+        if self.columnar_ledger:
+            return ColumnarTokenLedger(history)
+        return TokenLedger(history)
     
-    def register_node(self, node_id: str) -> Node:
-        if node_id in self.nodes:
-            return self.nodes[node_id]
-        node = Node(node_id)
-        self.nodes[node_id] = node
+    def _new_executor(self) -> ComputeExecutor:
+        return ComputeExecutor(
+            self.ledger,
+            workers=self.compute_workers,
+            use_processes=self.compute_processes,
+            timeout=self.job_timeout
+        )
+    
+    def register_node(
+        self,
+        node_id: str,
+        public_key: Optional[PublicKeyLike] = None,
+        wallet: Optional[Wallet] = None
+    ) -> Node:
+        """Registriert eine Node; mit Wallet signiert sie ihre Transaktionen selbst"""
+        if wallet is not None:
+            public_key = wallet.public_key
+        with self._lock:
+            if public_key is not None:
+                self.key_registry.register(node_id, public_key)
+            node = self.nodes.get(node_id)
+            if node is None:
+                node = Node(node_id, wallet)
+                self.nodes[node_id] = node
+            elif wallet is not None:
+                node.wallet = wallet
+            elif public_key is None:
+                return node
+            self._log(wal.NODE_REGISTERED, {
+                "node_id": node_id,
+                "public_key": self.key_registry.to_dict().get(node_id) if public_key is not None else None
+            })
         return node
     
+    def _log(self, kind: int, data: Any) -> None:
+        if self.journal is not None and not self._replaying:
+            with self._lock:
+                self.journal.append_json(kind, data)
+    
+    def _log_tx(self, tx: Transaction) -> None:
+        if self.journal is not None and not self._replaying:
+            with self._lock:
+                self.journal.append_tx(tx)
+    
+    def _roll_up(self, txs: List[Transaction]) -> None:
+        if self.rollups is not None and txs:
+            self.rollups.add_transactions(txs)
+    
+    def _remember_report(self, replay_key: Tuple[str, str, int]) -> None:
+        seen_at = time.time()
+        self.replay_guard.remember(replay_key, seen_at)
+        self._log(wal.REPORT_SEEN, {
+            "key": list(replay_key),
+            "at": seen_at,
+            "expires": self.replay_guard.expires(replay_key)
+        })
+    
     def submit_energy(
         self,
         node_id: str,
         amount_kwh: float,
-        source_id: str
+        source_id: str,
+        reading_time: Optional[float] = None
     ) -> str:
+        """Meldet Energie; `reading_time` ist der Ablesezeitpunkt und Zeitstempel der Transaktion (Standard: jetzt)"""
+        replay_key = None
+        if self.replay_guard is not None:
+            replay_key = self.replay_guard.key(node_id, source_id, reading_time)
+            with self._lock:
+                if self.replay_guard.is_duplicate(replay_key):
+                    raise RuntimeError("Duplicate energy report")
         node = self.register_node(node_id)
-        tips = self.dag.select_tips(2)
-        tx = node.create_energy_transaction(amount_kwh, source_id, tips[0], tips[1])
-        success = self.dag.add_transaction(tx)
-        if not success:
-            raise RuntimeError("Failed to add transaction to DAG")
+        with self._lock:
+            tips = self.dag.select_tips(2)
+        tx = node.create_energy_transaction(amount_kwh, source_id, tips[0], tips[1], reading_time)
+        if self.require_signatures and not self.verifier.verify(tx):
+            raise RuntimeError("Invalid or missing signature")
+        with self._lock:
+            # Eine parallele Meldung kann seit der ersten Prüfung eingegangen sein
+            if replay_key is not None and self.replay_guard.is_duplicate(replay_key):
+                raise RuntimeError("Duplicate energy report")
+            success = self.dag.add_transaction(tx)
+            if not success:
+                raise RuntimeError("Failed to add transaction to DAG")
+            self._log_tx(tx)
+            self._roll_up([tx])
+            if replay_key is not None:
+                self._remember_report(replay_key)
         return tx.hash
     
+    def submit_energy_batch(
+        self,
+        records: Iterable[Tuple[Any, ...]]
+    ) -> List[Dict[str, Any]]:
+        """Reicht viele (node_id, kwh, source_id[, reading_time])-Meldungen auf einmal ein.
+        
+        Tips werden einmal für den ganzen Batch gezogen und lokal
+        fortgeschrieben (jede neue Transaktion ersetzt die von ihr bestätigten
+        Tips), danach wird alles mit einem Tip-Update eingefügt. Ein
+        `reading_time` wird Zeitstempel der Transaktion (Rollups, Pruning).
+        Liefert pro Meldung {"index", "tx_hash"} oder {"index", "error"}.
+        """
+        records = list(records)
+        genesis = self.dag.GENESIS_HASH
+        with self._lock:
+            sampled = self.dag.select_tips(min(2 * len(records), self.BATCH_TIP_SAMPLE))
+        local_tips = [tip for tip in dict.fromkeys(sampled) if tip != genesis]
+        
+        results: List[Dict[str, Any]] = []
+        txs = []
+        pending = []
+        replay_keys = {}
+        for index, record in enumerate(records):
+            error = self._validate_record(record)
+            if error:
+                results.append({"index": index, "error": error})
+                continue
+            node_id, amount_kwh, source_id, *reading_time = record
+            if self.replay_guard is not None:
+                replay_key = self.replay_guard.key(node_id, source_id, *reading_time)
+                if replay_key in replay_keys or self._is_duplicate(replay_key):
+                    results.append({"index": index, "error": "duplicate_report"})
+                    continue
+                replay_keys[replay_key] = len(results)
+            parent1, parent2 = self._take_local_tips(local_tips)
+            tx = self.register_node(node_id).create_energy_transaction(
+                float(amount_kwh), source_id, parent1, parent2, *reading_time
+            )
+            local_tips.append(tx.hash)
+            txs.append(tx)
+            pending.append(len(results))
+            results.append({"index": index, "tx_hash": tx.hash})
+        
+        self._add_verified(txs, pending, results, replay_keys)
+        return results
+    
+    def submit_transactions(self, txs: Iterable[Transaction]) -> List[Dict[str, Any]]:
+        """Nimmt extern erzeugte (signierte) Transaktionen entgegen.
+        
+        Energiemeldungen werden über ihren Zeitstempel auf Replays geprüft.
+        Liefert pro Transaktion {"index", "tx_hash"} oder {"index", "error"}.
+        """
+        results: List[Dict[str, Any]] = []
+        accepted = []
+        pending = []
+        replay_keys = {}
+        for index, tx in enumerate(txs):
+            if self.replay_guard is not None and tx.is_energy_contribution():
+                replay_key = self.replay_guard.key(tx.node_id, tx.source_id, tx.timestamp)
+                if replay_key in replay_keys or self._is_duplicate(replay_key):
+                    results.append({"index": index, "error": "duplicate_report"})
+                    continue
+                replay_keys[replay_key] = len(results)
+            accepted.append(tx)
+            pending.append(len(results))
+            results.append({"index": index, "tx_hash": tx.hash})
+        self._add_verified(accepted, pending, results, replay_keys)
+        return results
+    
+    def _is_duplicate(self, replay_key: Tuple[str, str, int]) -> bool:
+        with self._lock:
+            return self.replay_guard.is_duplicate(replay_key)
+    
+    def _remember_reports(self, replay_keys: Dict[Any, int], results: List[Dict[str, Any]]) -> None:
+        """Merkt sich die Meldungen, die tatsächlich im DAG gelandet sind"""
+        for replay_key, position in replay_keys.items():
+            if "tx_hash" in results[position]:
+                self._remember_report(replay_key)
+    
+    def _add_verified(
+        self,
+        txs: List[Transaction],
+        positions: List[int],
+        results: List[Dict[str, Any]],
+        replay_keys: Dict[Any, int]
+    ) -> None:
+        """Prüft Signaturen stapelweise und fügt die gültigen in einem Rutsch ein.
+        
+        Nur das Einfügen und Protokollieren läuft unter dem Lock; Meldungen,
+        die ein paralleler Aufruf inzwischen eingereicht hat, werden dort als
+        Replay verworfen.
+        """
+        if self.require_signatures:
+            verdicts = self.verifier.verify_batch(txs)
+            accepted = []
+            accepted_positions = []
+            for tx, position, valid in zip(txs, positions, verdicts):
+                if valid:
+                    accepted.append(tx)
+                    accepted_positions.append(position)
+                else:
+                    results[position] = {"index": results[position]["index"], "error": "invalid_signature"}
+            txs, positions = accepted, accepted_positions
+        
+        with self._lock:
+            if replay_keys:
+                late = {
+                    position for replay_key, position in replay_keys.items()
+                    if self.replay_guard.is_duplicate(replay_key)
+                }
+                if late:
+                    for position in late:
+                        results[position] = {"index": results[position]["index"], "error": "duplicate_report"}
+                    kept = [(tx, position) for tx, position in zip(txs, positions) if position not in late]
+                    txs = [tx for tx, _ in kept]
+                    positions = [position for _, position in kept]
+            if self.pruner.checkpoints:
+                # Schon gepruned heißt schon gemintet: nicht erneut einfügen
+                pruned = set()
+                batch = set()
+                for tx, position in zip(txs, positions):
+                    if self.pruner.was_pruned(self.dag, tx, batch):
+                        pruned.add(position)
+                    else:
+                        batch.add(tx.hash)
+                if pruned:
+                    for position in pruned:
+                        results[position] = {"index": results[position]["index"], "error": "already_pruned"}
+                    kept = [(tx, position) for tx, position in zip(txs, positions) if position not in pruned]
+                    txs = [tx for tx, _ in kept]
+                    positions = [position for _, position in kept]
+            added_txs = []
+            for tx, position, added in zip(txs, positions, self.dag.add_transactions(txs)):
+                if added:
+                    self._log_tx(tx)
+                    added_txs.append(tx)
+                else:
+                    results[position] = {"index": results[position]["index"], "error": "rejected_by_dag"}
+            self._roll_up(added_txs)
+            self._remember_reports(replay_keys, results)
+    
+    @staticmethod
+    def _validate_record(record: Any) -> Optional[str]:
+        try:
+            node_id, amount_kwh, source_id, *reading_time = record
+        except (TypeError, ValueError):
+            return "malformed_record"
+        if len(reading_time) > 1:
+            return "malformed_record"
+        if reading_time and not isinstance(reading_time[0], (int, float)):
+            return "invalid_reading_time"
+        if not isinstance(node_id, str) or not node_id:
+            return "invalid_node_id"
+        if not isinstance(source_id, str) or not source_id:
+            return "invalid_source_id"
+        try:
+            if float(amount_kwh) <= 0:
+                return "invalid_amount"
+        except (TypeError, ValueError):
+            return "invalid_amount"
+        return None
+    
+    def _take_local_tips(self, local_tips: List[str]) -> Tuple[str, str]:
+        """Zieht zwei Tips aus der lokalen Liste und entfernt sie (Swap-Remove)"""
+        chosen = []
+        for _ in range(2):
+            if not local_tips:
+                break
+            pos = random.randrange(len(local_tips))
+            local_tips[pos], local_tips[-1] = local_tips[-1], local_tips[pos]
+            chosen.append(local_tips.pop())
+        while len(chosen) < 2:
+            chosen.append(self.dag.GENESIS_HASH)
+        return chosen[0], chosen[1]
+    
     def confirm_transactions(self) -> int:
-        tips = list(self.dag.tips)
-        confirmed_count = 0
-        for tip in tips:
-            if tip != self.dag.GENESIS_HASH:
-                self.dag.confirmations[tip] += 1
-                confirmed_count += 1
-        return confirmed_count
+        with self._lock:
+            tips = list(self.dag.tips)
+            confirmed_count = 0
+            for tip in tips:
+                if tip != self.dag.GENESIS_HASH:
+                    self.confirm(tip)
+                    confirmed_count += 1
+            return confirmed_count
+    
+    def confirm(self, tx_hash: str, count: int = 1) -> bool:
+        """Simulierte Bestätigung einer Transaktion (wird protokolliert)"""
+        with self._lock:
+            if not self.dag.add_confirmation(tx_hash, count):
+                return False
+            self._log(wal.CONFIRMATION, {"tx": tx_hash, "count": count, "depth": self.dag.confirmations[tx_hash]})
+        return True
     
     def process_minting(self) -> List[EnergyContribution]:
-        from core.consensus import get_confirmed_transactions
-        confirmed_txs = get_confirmed_transactions(self.dag, 3)
-        contributions = []
-        for tx in confirmed_txs:
-            contrib = EnergyContribution.from_transaction(tx.hash, tx.to_dict())
-            contributions.append(contrib)
-        
-        from energy.validator import EnergyValidator
-        valid_contribs = EnergyValidator.validate_batch(contributions)
-        minted = self.minter.mint_for_contributions(valid_contribs)
+        """Mintet nur für seit dem letzten Aufruf neu bestätigte Transaktionen"""
+        with self._lock:
+            newly_confirmed = self.dag.drain_confirmed()
+        batch = ContributionBatch.from_transactions(newly_confirmed)
+        valid, _ = EnergyValidator.validate_columns(batch)
+        valid_contribs = batch.contributions(valid)
+        # MINT-Records müssen vor einem PRUNED derselben Transaktionen im Journal stehen
+        with self._lock:
+            minted_at = time.time()
+            minted = self.minter.mint_for_contributions(valid_contribs, minted_at)
+            for contrib in minted:
+                self._log(wal.MINT, {
+                    "tx": contrib.transaction_hash,
+                    "node_id": contrib.node_id,
+                    "amount": contrib.amount_kwh * self.minter.KWH_TO_TOKEN_RATE,
+                    "at": minted_at
+                })
+            self.pruner.settle(newly_confirmed)
+            self.prune_history()
         return minted
     
+    def prune_history(self) -> Optional[Dict[str, Any]]:
+        """Faltet abgerechnete Transaktionen in einen Checkpoint (falls konfiguriert)"""
+        with self._lock:
+            tx_hashes = self.pruner.candidates(self.dag)
+            if not tx_hashes:
+                return None
+            checkpoint = self.pruner.apply(self.dag, tx_hashes, processed=self.minter.processed_transactions)
+            self._log(wal.PRUNED, {"hashes": tx_hashes, "checkpoint": checkpoint})
+        return checkpoint
+    
     def submit_compute_job(self, job: 'ComputeJob') -> bool:
-        return self.scheduler.submit_job(job)
+        # Queue und Journal gemeinsam ändern, damit ein Snapshot beide gleich sieht
+        with self._lock:
+            if job.job_id in self.escrow or not self.scheduler.submit_job(job):
+                return False
+            reserved_at = time.time()
+            if self.compute_pool and not self.escrow.reserve(job, reserved_at):
+                self.scheduler.cancel_job(job.job_id)
+                return False
+            self._log(wal.JOB_QUEUED, self._job_dict(job, self.scheduler.tag_of(job.job_id)))
+            if self.compute_pool:
+                self._log_reserved(job, reserved_at)
+        return True
+    
+    def _reserve(self, job: ComputeJob) -> bool:
+        reserved_at = time.time()
+        if not self.escrow.reserve(job, reserved_at):
+            return False
+        self._log_reserved(job, reserved_at)
+        return True
+    
+    def _log_reserved(self, job: ComputeJob, reserved_at: float) -> None:
+        # Ein Record für Abbuchung und Reservierung: das Replay stellt beide
+        # gemeinsam her, _finish_restore erstattet sie bei einem Absturz
+        self._log(wal.JOB_RESERVED, {
+            "job_id": job.job_id,
+            "node_id": job.node_id,
+            "amount": job.token_cost,
+            "at": reserved_at
+        })
+    
+    def _settle(self, job_id: str) -> None:
+        if self.escrow.settle(job_id) is not None:
+            self._log(wal.JOB_SETTLED, {"job_id": job_id})
+    
+    def _refund(self, job_id: str) -> None:
+        refunded_at = time.time()
+        held = self.escrow.refund(job_id, refunded_at)
+        if held is not None:
+            self._log(wal.JOB_REFUNDED, {"job_id": job_id, "node_id": held[0], "amount": held[1], "at": refunded_at})
+    
+    def cancel_compute_job(self, job_id: str) -> bool:
+        """Nimmt einen wartenden Job aus der Warteschlange (Reservierung wird erstattet)"""
+        with self._lock:
+            if self.scheduler.cancel_job(job_id) is None:
+                return False
+            self._log(wal.JOB_CANCELLED, {"job_id": job_id})
+            self._refund(job_id)
+        return True
+    
+    def _next_job(self, now: float) -> Optional[ComputeJob]:
+        """Entnimmt den nächsten Job; JOB_EXECUTED protokolliert _log_started"""
+        job = self.scheduler.get_next_job(now)
+        for expired in self.scheduler.take_expired():
+            self._log(wal.JOB_CANCELLED, {"job_id": expired.job_id})
+            self._refund(expired.job_id)
+        return job
+    
+    def _log_started(self, job: ComputeJob) -> None:
+        self._log(wal.JOB_EXECUTED, {"job_id": job.job_id, "virtual_time": self.scheduler.virtual_time})
     
     def execute_next_job(self) -> Dict[str, Any]:
-        job = self.scheduler.get_next_job()
-        if not job:
-            return {"error": "no_jobs_in_queue"}
-        return self.executor.execute_job(job)
+        """Führt den nächsten Job im aufrufenden Thread aus"""
+        with self._lock:
+            executed_at = time.time()
+            job = self._next_job(executed_at)
+            if not job:
+                return {"error": "no_jobs_in_queue"}
+            self._log_started(job)
+            escrowed = job.job_id in self.escrow
+            result = self.executor.execute_job(job, executed_at, escrowed=escrowed)
+            if escrowed:
+                self._settle(job.job_id)
+            elif "error" not in result:
+                self._log(wal.DEBIT, {"node_id": job.node_id, "amount": job.token_cost, "at": executed_at})
+        return result
     
-    def get_state(self) -> Dict[str, Any]:
+    def dispatch_jobs(self) -> int:
+        """Verteilt wartende Jobs auf die freien Plätze des Pools; kehrt sofort zurück.
+        
+        Jobs ohne Reservierung (etwa aus der Zeit vor dem Pool-Modus) werden
+        jetzt reserviert; reicht das Guthaben nicht, meldet collect_results()
+        den Fehler.
+        """
+        jobs = []
+        with self._lock:
+            now = time.time()
+            for _ in range(self.executor.free_slots()):
+                job = self._next_job(now)
+                if job is None:
+                    break
+                # Die Reservierung steht vor JOB_EXECUTED im Journal
+                reserved = job.job_id in self.escrow or self._reserve(job)
+                self._log_started(job)
+                if not reserved:
+                    self._dispatch_errors.append({"error": "insufficient_balance", "job_id": job.job_id})
+                    continue
+                jobs.append(job)
+            self.executor.dispatch(jobs)
+        return len(jobs)
+    
+    def collect_results(self, timeout: float = 0.0) -> List[Dict[str, Any]]:
+        """Ergebnisse fertiger Pool-Jobs; wartet höchstens `timeout` Sekunden
+        (ohne das Coordinator-Lock zu halten).
+        
+        Erfolgreiche Jobs behalten ihre Reservierung ein; Fehler und Timeouts
+        bekommen sie erstattet.
+        """
+        outcomes = self.executor.poll(timeout)
+        with self._lock:
+            results, self._dispatch_errors = self._dispatch_errors, []
+            for job, result in outcomes:
+                if "error" in result:
+                    self._refund(job.job_id)
+                else:
+                    self._settle(job.job_id)
+                results.append(result)
+        return results
+    
+    @staticmethod
+    def _job_dict(job: ComputeJob, tag: Optional[float] = None) -> Dict[str, Any]:
         return {
-            "dag_stats": {
-                "total_transactions": len(self.dag.transactions),
-                "tips": len(self.dag.tips),
-                "nodes": len(self.nodes)
-            },
-            "token_stats": {
-                "total_supply": self.ledger.total_supply,
-                "holders": len(self.ledger.balances)
-            },
-            "compute_stats": {
-                "queue_length": self.scheduler.get_queue_length()
-            }
+            "job_id": job.job_id,
+            "node_id": job.node_id,
+            "token_cost": job.token_cost,
+            "payload": job.payload,
+            "priority": job.priority,
+            "deadline": job.deadline,
+            # Virtuelles Ende im Scheduler (Platz in der fairen Reihenfolge)
+            "tag": tag
         }
     
-    def save_state(self) -> None:
-        """Persist current state to disk"""
-        data = {
-            "nodes": list(self.nodes.keys()),
-            "balances": self.ledger.balances,
-            "total_supply": self.ledger.total_supply,
-            "processed_transactions": list(self.minter.processed_transactions),
-            "dag": {
-                "transactions": [tx.to_dict() for tx in self.dag.transactions.values()],
-                "tips": list(self.dag.tips),
-                "confirmations": dict(self.dag.confirmations),
-                "parents": self.dag.parents
-            },
-            "job_queue": [
-                {
-                    "job_id": job.job_id,
-                    "node_id": job.node_id,
-                    "token_cost": job.token_cost,
-                    "payload": job.payload
+    def merkle_roots(self) -> Dict[str, str]:
+        """Roots über Transaktionen und Guthaben sowie der daraus gebildete State-Root.
+        
+        Replikate mit gleichem Zustand liefern denselben `state_root`.
+        """
+        with self._lock:
+            tx_root = self.dag.transaction_root()
+            ledger_root = self.ledger.root()
+            state_root = hashlib.sha256(
+                tx_root + ledger_root + struct.pack("<q", to_units(self.ledger.total_supply))
+            ).digest()
+        return {"tx_root": tx_root.hex(), "ledger_root": ledger_root.hex(), "state_root": state_root.hex()}
+    
+    def state_root(self) -> str:
+        return self.merkle_roots()["state_root"]
+    
+    def _check_roots(self, stored: Dict[str, Any], source: str) -> None:
+        if not self.verify_state or "state_root" not in stored:
+            return
+        roots = self.merkle_roots()
+        for key, value in roots.items():
+            if stored[key] != value:
+                raise RuntimeError(f"{source}: {key} mismatch (stored {stored[key]}, computed {value})")
+    
+    def _verify_transactions(self, table: Any, offsets: Any, digests: Any, tx_root: str, source: str) -> None:
+        """Prüft Bodies, Digests und Transaktions-Root parallel in Chunks"""
+        root = merkle.transaction_root(table, offsets, digests, workers=self.verifier.workers)
+        if root is None:
+            raise RuntimeError(f"{source}: transaction body does not match its digest")
+        if root.hex() != tx_root:
+            raise RuntimeError(f"{source}: tx_root mismatch (stored {tx_root}, computed {root.hex()})")
+    
+    def get_state(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "dag_stats": {
+                    "total_transactions": len(self.dag.transactions),
+                    "tips": len(self.dag.tips),
+                    "nodes": len(self.nodes)
+                },
+                "token_stats": {
+                    "total_supply": self.ledger.total_supply,
+                    "holders": self.ledger.account_count()
+                },
+                "compute_stats": {
+                    "queue_length": self.scheduler.get_queue_length(),
+                    "running": self.executor.running(),
+                    "escrowed_tokens": self.escrow.held()
                 }
-                for job in self.scheduler.job_queue
-            ]
-        }
-        with open(self.STATE_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+            }
     
-    def load_state(self) -> bool:
-        """Restore state from disk, return True if successful"""
-        if not os.path.exists(self.STATE_FILE):
-            return False
+    def save_state(self) -> None:
+        """Persist current state to disk.
+        
+        Mit Journal genügt ein Group Commit (Kosten proportional zu den
+        Änderungen); nach `compact_every` Records wird ein Snapshot geschrieben.
+        """
+        with self._lock:
+            if self.journal is not None:
+                self.journal.sync()
+                if self.journal.records_since_snapshot >= self.compact_every:
+                    self.compact()
+                return
+            with open(self.STATE_FILE, 'w') as f:
+                json.dump(self._state_dict(), f, indent=2)
+    
+    def compact(self) -> None:
+        """Schreibt einen Snapshot; die davon abgedeckten WAL-Segmente entfallen.
         
-        with open(self.STATE_FILE, 'r') as f:
-            data = json.load(f)
+        SQLite hält den Zustand bereits in Tabellen, dort wird nur aufgeräumt.
+        """
+        with self._lock:
+            if isinstance(self.journal, SQLiteStore):
+                self.journal.compact()
+                return
+            self.journal.write_snapshot(
+                lambda path, segment: self.save_snapshot(path, self.snapshot_compression, segment)
+            )
+    
+    def save_snapshot(
+        self,
+        path: str,
+        compression: Optional[str] = None,
+        wal_segment: int = 0
+    ) -> None:
+        """Schreibt den Zustand als binären Snapshot (Format: storage.snapshot).
         
+        Transaktionen liegen in ihrer kanonischen Kodierung samt Digest vor,
+        Eltern, Tiefen, Gewichte und Tips als Positions-Arrays; beim Laden
+        entfallen so Hash-Berechnung und Propagation.
+        """
+        with self._lock:
+            transactions, parent1, parent2, depths, weights, tips = self.dag.export_columns()
+            bodies = [tx.encoded() for tx in transactions]
+            offsets = array('q', [0])
+            offsets.extend(itertools.accumulate(len(body) for body in bodies))
+            roots = self.merkle_roots()
+            meta = {
+                "wal_segment": wal_segment,
+                "nodes": list(self.nodes.keys()),
+                "public_keys": self.key_registry.to_dict(),
+                "checkpoints": self.pruner.checkpoints,
+                "replay_guard": self.replay_guard.to_list() if self.replay_guard is not None else [],
+                "pruned": self.dag.pruned,
+                "newly_confirmed": list(self.dag.newly_confirmed),
+                "tx_peaks": self.dag.tx_accumulator.to_list(),
+                **roots
+            }
+            if self.ledger.history is not None:
+                # Zeitpunkte und Beträge aller Konten hintereinander, Aufteilung in META
+                names, counts, times, deltas = self.ledger.history.to_columns()
+                meta["balance_history"] = {"accounts": names, "counts": counts}
+            meta["job_virtual_time"] = self.scheduler.virtual_time
+            meta["escrow"] = self.escrow.to_dict()
+            if self.rollups is not None:
+                meta["energy_rollups"], rollups = self.rollups.to_bytes()
+            ledger = {"balances": self.ledger.balances, "total_supply": self.ledger.total_supply}
+            sections = {
+                snapshot.META: _json_bytes(meta),
+                snapshot.TX_TABLE: b"".join(bodies),
+                snapshot.TX_OFFSETS: snapshot.pack_array(offsets),
+                snapshot.DIGESTS: b"".join(tx.digest for tx in transactions),
+                snapshot.PARENTS: snapshot.pack_array(parent1) + snapshot.pack_array(parent2),
+                snapshot.CONFIRMATIONS: snapshot.pack_array(depths) + snapshot.pack_array(weights),
+                snapshot.TIPS: snapshot.pack_array(tips),
+                snapshot.LEDGER: _json_bytes(ledger),
+                snapshot.PROCESSED_BITMAP: self.minter.processed_transactions.bitmap(tx.digest for tx in transactions),
+                snapshot.JOB_QUEUE: _json_bytes([self._job_dict(job, tag) for job, tag in self.scheduler.queued()])
+            }
+            if self.ledger.history is not None:
+                sections[snapshot.HISTORY] = snapshot.pack_array(times) + snapshot.pack_array(deltas)
+            if self.rollups is not None:
+                sections[snapshot.ROLLUPS] = rollups
+        # Kompression und Schreiben blockieren die Ingestion nicht
+        snapshot.write_snapshot(path, sections, compression)
+    
+    def load_snapshot(self, path: str) -> int:
+        """Lädt einen binären Snapshot; liefert das vermerkte WAL-Segment"""
+        with self._lock:
+            self._replaying = True
+            try:
+                segment = self._apply_snapshot(path)
+            finally:
+                self._replaying = False
+            self._finish_restore()
+            return segment
+    
+    def _apply_snapshot(self, path: str) -> int:
+        with snapshot.SnapshotReader(path) as reader:
+            meta = json.loads(bytes(reader.section(snapshot.META)))
+            ledger = json.loads(bytes(reader.section(snapshot.LEDGER)))
+            self._apply_state({
+                "nodes": meta["nodes"],
+                "public_keys": meta["public_keys"],
+                "balances": ledger["balances"],
+                "total_supply": ledger["total_supply"],
+                "checkpoints": meta["checkpoints"],
+                "replay_guard": meta["replay_guard"],
+                "job_queue": json.loads(bytes(reader.section(snapshot.JOB_QUEUE))),
+                "job_virtual_time": meta.get("job_virtual_time", 0.0),
+                "escrow": meta.get("escrow", {})
+            })
+            if self.ledger.history is not None and snapshot.HISTORY in reader:
+                history = reader.section(snapshot.HISTORY)
+                split = len(history) // 2
+                self.ledger.history.load_columns(
+                    meta["balance_history"]["accounts"],
+                    meta["balance_history"]["counts"],
+                    snapshot.unpack_array('d', history[:split]),
+                    snapshot.unpack_array('q', history[split:])
+                )
+                del history
+            
+            table = reader.section(snapshot.TX_TABLE)
+            digests = reader.section(snapshot.DIGESTS)
+            offsets = snapshot.unpack_array('q', reader.section(snapshot.TX_OFFSETS))
+            if self.verify_state and "tx_root" in meta:
+                self._verify_transactions(table, offsets, digests, meta["tx_root"], path)
+            count = len(offsets) - 1
+            bitmap = reader.section(snapshot.PROCESSED_BITMAP)
+            self.minter.processed_transactions.load_bitmap(
+                (bytes(digests[i:i + 32]) for i in range(0, 32 * count, 32)), bitmap
+            )
+            del bitmap
+            parents = snapshot.unpack_array('q', reader.section(snapshot.PARENTS))
+            confirmations = snapshot.unpack_array('i', reader.section(snapshot.CONFIRMATIONS))
+            tips = snapshot.unpack_array('q', reader.section(snapshot.TIPS))
+            rollups_loaded = self.rollups is not None and snapshot.ROLLUPS in reader
+            if rollups_loaded:
+                self.rollups.load_bytes(meta["energy_rollups"], reader.section(snapshot.ROLLUPS))
+            # Die DAG kopiert, was sie behält; die Views enden mit dem Reader
+            self.dag.restore_encoded(
+                table,
+                offsets,
+                digests,
+                parents[:count],
+                parents[count:],
+                confirmations[:count],
+                confirmations[count:],
+                tips,
+                meta["pruned"]
+            )
+            del table, digests
+        
+        if "tx_peaks" in meta:
+            self.dag.load_transaction_peaks(meta["tx_peaks"])
+        if self.rollups is not None and not rollups_loaded:
+            self._roll_up(list(self.dag.transactions.values()))
+        self.dag.newly_confirmed = deque(meta["newly_confirmed"])
+        self._check_roots(meta, path)
+        return meta["wal_segment"]
+    
+    def _state_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "nodes": list(self.nodes.keys()),
+                "public_keys": self.key_registry.to_dict(),
+                "balances": self.ledger.balances,
+                "total_supply": self.ledger.total_supply,
+                # Ein Bit pro Transaktion in dag.transactions
+                "processed_bitmap": self.minter.processed_transactions.to_state(
+                    tx.digest for tx in self.dag.transactions.values()
+                ),
+                "checkpoints": self.pruner.checkpoints,
+                "replay_guard": self.replay_guard.to_list() if self.replay_guard is not None else [],
+                "dag": {
+                    "transactions": [tx.to_dict() for tx in self.dag.transactions.values()],
+                    "tips": list(self.dag.tips),
+                    "confirmations": dict(self.dag.confirmations),
+                    "parents": dict(self.dag.parents),
+                    "pruned": list(self.dag.pruned)
+                },
+                # In Ausführungsreihenfolge, mit Tags für die faire Einordnung
+                "job_queue": [self._job_dict(job, tag) for job, tag in self.scheduler.queued()],
+                "job_virtual_time": self.scheduler.virtual_time,
+                # Reservierte Kosten wartender und laufender Jobs
+                "escrow": self.escrow.to_dict(),
+                **self._history_dict(),
+                **self._rollups_dict(),
+                **self.merkle_roots()
+            }
+    
+    def _history_dict(self) -> Dict[str, Any]:
+        if self.ledger.history is None:
+            return {}
+        return {"balance_history": self.ledger.history.to_dict()}
+    
+    def _rollups_dict(self) -> Dict[str, Any]:
+        if self.rollups is None:
+            return {}
+        return {"energy_rollups": self.rollups.to_dict()}
+    
+    def load_state(self) -> bool:
+        """Restore state from disk, return True if successful"""
+        with self._lock:
+            if isinstance(self.journal, SQLiteStore):
+                return self._load_database()
+            if self.journal is not None:
+                return self._recover()
+            if not os.path.exists(self.STATE_FILE):
+                return False
+            
+            with open(self.STATE_FILE, 'r') as f:
+                data = json.load(f)
+            self._replaying = True
+            try:
+                self._apply_state(data)
+            finally:
+                self._replaying = False
+            self._finish_restore()
+            return True
+    
+    def _load_database(self) -> bool:
+        """Zustand aus den SQLite-Tabellen lesen (Tiefen werden neu propagiert)"""
+        store = self.journal
+        if store.empty():
+            # Umstieg: vorhandene JSON-Zustandsdatei einmalig übernehmen
+            if not os.path.exists(self.STATE_FILE):
+                return False
+            with open(self.STATE_FILE, 'r') as f:
+                store.import_state(json.load(f))
+        self._replaying = True
+        try:
+            self._apply_state(store.read_state())
+            self.dag.restore(store.transactions(), store.confirmations(), store.pruned())
+            # SQLite führt keine Rollups; Neuaufbau aus den (ungeprunten) Transaktionen
+            if self.rollups is not None:
+                self._roll_up(list(self.dag.transactions.values()))
+        finally:
+            self._replaying = False
+        self._finish_restore()
+        return True
+    
+    def _recover(self) -> bool:
+        """Snapshot laden und den WAL-Rest darüber abspielen"""
+        binary = os.path.exists(self.journal.snapshot_path)
+        state, segment = None, 0
+        replayed = 0
+        self._replaying = True
+        try:
+            if binary:
+                segment = self._apply_snapshot(self.journal.snapshot_path)
+            records = self.journal.records(segment)
+            first = next(records, None)
+            if not binary:
+                if first is None:
+                    # Umstieg: vorhandene JSON-Zustandsdatei einmalig als Snapshot übernehmen
+                    if not os.path.exists(self.STATE_FILE):
+                        return False
+                    with open(self.STATE_FILE, 'r') as f:
+                        state = json.load(f)
+                self._apply_state(state or {})
+            if first is not None:
+                for kind, body in itertools.chain([first], records):
+                    self._apply_record(kind, body)
+                    replayed += 1
+        finally:
+            self._replaying = False
+        self.journal.records_since_snapshot = replayed
+        self._finish_restore()
+        if state is not None:
+            # Migrierten JSON-Zustand binär festschreiben
+            self.compact()
+        return True
+    
+    def _apply_state(self, data: Dict[str, Any]) -> None:
         # Clear current state
-        self.dag = DAG()
-        self.ledger = TokenLedger()
-        self.scheduler = JobScheduler(self.ledger)
-        self.executor = ComputeExecutor(self.ledger)
+        self.dag.close()
+        self.dag = self._new_dag()
+        self.ledger = self._new_ledger()
+        self.rollups = EnergyRollups() if self.energy_rollups else None
+        self.scheduler = JobScheduler(self.ledger, self.job_weights)
+        self.executor.shutdown(wait=False)
+        self.executor = self._new_executor()
+        self.escrow = TokenEscrow(self.ledger)
+        self._dispatch_errors = []
         self.nodes = {}
         
         # Restore nodes
-        for node_id in data["nodes"]:
+        for node_id in data.get("nodes", []):
             self.register_node(node_id)
+        self.key_registry.load_dict(data.get("public_keys", {}))
         
         # Restore ledger
-        self.ledger.balances = data["balances"]
-        self.ledger.total_supply = data["total_supply"]
+        self.ledger.load_balances(data.get("balances", {}), data.get("total_supply", 0.0))
+        if self.ledger.history is not None:
+            if data.get("balance_history"):
+                self.ledger.history.load_dict(data["balance_history"])
+            else:
+                self.ledger.history.open(self.ledger.balances, self.ledger.total_supply)
         
         # Restore minter
         self.minter = TokenMinter(self.ledger)
-        self.minter.processed_transactions = set(data["processed_transactions"])
-        
-        # Restore DAG
-        dag_data = data["dag"]
-        for tx_dict in dag_data["transactions"]:
-            tx = Transaction(
-                payload=tx_dict["payload"],
-                parent1=tx_dict["parent1"],
-                parent2=tx_dict["parent2"],
-                node_id=tx_dict["node_id"],
-                signature=tx_dict["signature"]
-            )
-            # Reconstruct hash (since it's derived)
-            tx.hash = tx._compute_hash()
-            self.dag.transactions[tx.hash] = tx
-        
-        self.dag.tips = set(dag_data["tips"])
-        self.dag.confirmations = defaultdict(int, dag_data["confirmations"])
-        self.dag.parents = dag_data["parents"]
-        # Rebuild children index
-        self.dag.children = defaultdict(list)
-        for child_hash, (p1, p2) in self.dag.parents.items():
-            if p1 != self.dag.GENESIS_HASH:
-                self.dag.children[p1].append(child_hash)
-            if p2 != self.dag.GENESIS_HASH and p2 != p1:
-                self.dag.children[p2].append(child_hash)
+        self.minter.processed_transactions = ProcessedIndex.from_state(data)
+        self.pruner.checkpoints = data.get("checkpoints", [])
+        if self.replay_guard is not None:
+            self.replay_guard.load_list(data.get("replay_guard", []))
         
-        # Validate and repair tips
-        self.dag.validate_tips()
+        # Restore DAG (rebuilds children, tips, depths and weights)
+        dag_data = data.get("dag", {})
+        self.dag.restore(
+            (Transaction.from_dict(tx_dict) for tx_dict in dag_data.get("transactions", [])),
+            dag_data.get("confirmations", {}),
+            dag_data.get("pruned", ())
+        )
+        
+        # Restore rollups (ältere Zustände: Neuaufbau aus den vorhandenen Transaktionen)
+        if self.rollups is not None:
+            if data.get("energy_rollups"):
+                self.rollups.load_dict(data["energy_rollups"])
+            else:
+                self._roll_up(list(self.dag.transactions.values()))
         
         # Restore job queue
-        for job_data in data["job_queue"]:
-            job = ComputeJob(
-                job_id=job_data["job_id"],
-                node_id=job_data["node_id"],
-                token_cost=job_data["token_cost"],
-                payload=job_data["payload"]
+        self.scheduler.restore(
+            ((self._job_from_dict(job_data), job_data.get("tag")) for job_data in data.get("job_queue", [])),
+            data.get("job_virtual_time", 0.0)
+        )
+        self.escrow.load_dict(data.get("escrow", {}))
+        
+        if self.verify_state and "tx_root" in data:
+            transactions = list(self.dag.transactions.values())
+            bodies = [tx.encoded() for tx in transactions]
+            offsets = [0, *itertools.accumulate(len(body) for body in bodies)]
+            digests = b"".join(tx.digest for tx in transactions)
+            self._verify_transactions(b"".join(bodies), offsets, digests, data["tx_root"], "state")
+            self._check_roots(data, "state")
+    
+    def _apply_record(self, kind: int, body: bytes) -> None:
+        """Spielt einen WAL-Record auf den Zustand ab"""
+        if kind == wal.TX_ADDED:
+            tx, _ = decode_transaction(body)
+            if self.dag.add_transaction(tx):
+                self._roll_up([tx])
+            return
+        data = json.loads(body)
+        if kind == wal.NODE_REGISTERED:
+            self.register_node(data["node_id"], public_key=data.get("public_key"))
+        elif kind == wal.CONFIRMATION:
+            self.dag.add_confirmation(data["tx"], data["count"])
+        elif kind == wal.MINT:
+            self.ledger.credit_tokens(data["node_id"], data["amount"], data.get("at"))
+            self.minter.processed_transactions.add(data["tx"])
+        elif kind == wal.DEBIT:
+            self.ledger.debit_tokens(data["node_id"], data["amount"], data.get("at"))
+        elif kind == wal.JOB_QUEUED:
+            self.scheduler.restore_job(self._job_from_dict(data), data.get("tag"))
+        elif kind == wal.JOB_RESERVED:
+            self.ledger.debit_tokens(data["node_id"], data["amount"], data["at"])
+            self.escrow.hold(data["job_id"], data["node_id"], data["amount"])
+        elif kind == wal.JOB_EXECUTED:
+            self.scheduler.complete_job(data["job_id"])
+        elif kind == wal.JOB_CANCELLED:
+            self.scheduler.cancel_job(data["job_id"])
+        elif kind == wal.JOB_SETTLED:
+            self.escrow.settle(data["job_id"])
+        elif kind == wal.JOB_REFUNDED:
+            self.escrow.settle(data["job_id"])
+            self.ledger.refund_tokens(data["node_id"], data["amount"], data["at"])
+        elif kind == wal.PRUNED:
+            self.pruner.apply(
+                self.dag,
+                data["hashes"],
+                processed=self.minter.processed_transactions,
+                checkpoint=data["checkpoint"]
             )
-            self.scheduler.job_queue.append(job)
+        elif kind == wal.REPORT_SEEN and self.replay_guard is not None:
+            self.replay_guard.remember(tuple(data["key"]), data["at"])
+    
+    def _finish_restore(self) -> None:
+        # Validate and repair tips
+        self.dag.validate_tips()
+        # Already minted transactions must not be emitted again
+        self.dag.newly_confirmed = deque(
+            tx_hash for tx_hash in self.dag.newly_confirmed
+            if tx_hash not in self.minter.processed_transactions
+        )
+        # Abgerechnete Transaktionen für den Pruner vormerken
+        self.pruner.resume(self.dag)
+        # Jobs, die beim Beenden noch liefen, gelten als fehlgeschlagen
+        for job_id in self.escrow.job_ids():
+            if job_id not in self.scheduler:
+                self._refund(job_id)
+    
+    @staticmethod
+    def _job_from_dict(job_data: Dict[str, Any]) -> ComputeJob:
+        return ComputeJob(
+            job_id=job_data["job_id"],
+            node_id=job_data["node_id"],
+            token_cost=job_data["token_cost"],
+            payload=job_data["payload"],
+            priority=job_data.get("priority", 0),
+            deadline=job_data.get("deadline")
+        )
+    
+    def close(self) -> None:
+        """Schreibt ausstehende Journal-Records und schließt Log und Body-Datei.
         
-        return True
\ No newline at end of file
+        Noch laufende Pool-Jobs werden beim nächsten Laden erstattet.
+        """
+        with self._lock:
+            self.executor.shutdown(wait=False)
+            if self.journal is not None:
+                self.journal.close()
+            self.dag.close()
\ No newline at end of file
@@ -0,0 +1,278 @@
+import gzip
+import json
+import os
+import struct
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from core.transaction import Transaction
+from energy.batch import ContributionBatch
+from energy.validator import EnergyValidator
+from orchestration.coordinator import Coordinator
+
+GZIP_MAGIC = b"\x1f\x8b"
+CHUNK_LINES = 10_000
+
+# (Offset hinter dem Chunk, Zeilen als Bytes)
+Chunk = Tuple[int, List[bytes]]
+# (Meldungen für submit_energy_batch, Transaktionen, Ablehnungen pro Grund)
+ParsedChunk = Tuple[List[Tuple[Any, ...]], List[Transaction], Dict[str, int]]
+
+
+@dataclass
+class ImportStats:
+    offset: int = 0
+    lines: int = 0
+    accepted: int = 0
+    rejected: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+    
+    @property
+    def rate(self) -> float:
+        """Zeilen pro Sekunde"""
+        return self.lines / self.elapsed if self.elapsed else 0.0
+    
+    def reject(self, reason: str, count: int = 1) -> None:
+        if count:
+            self.rejected[reason] = self.rejected.get(reason, 0) + count
+
+
+def open_dump(path: str, offset: int = 0) -> BinaryIO:
+    """Öffnet einen JSONL-Dump ab `offset` (unkomprimierte Bytes); gzip wird an der Signatur erkannt"""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    stream = gzip.open(path, "rb") if magic == GZIP_MAGIC else open(path, "rb")
+    if offset:
+        stream.seek(offset)
+    return stream
+
+
+def read_chunks(path: str, offset: int = 0, chunk_lines: int = CHUNK_LINES) -> Iterator[Chunk]:
+    with open_dump(path, offset) as stream:
+        lines: List[bytes] = []
+        for line in stream:
+            offset += len(line)
+            lines.append(line)
+            if len(lines) >= chunk_lines:
+                yield offset, lines
+                lines = []
+        if lines:
+            yield offset, lines
+
+
+def _parse_reading(data: Any) -> Optional[Tuple[str, float, str, Optional[float]]]:
+    if not isinstance(data, dict):
+        return None
+    node_id = data.get("node_id")
+    amount_kwh = data.get("amount_kwh")
+    source_id = data.get("source_id")
+    reading_time = data.get("reading_time")
+    if not isinstance(node_id, str) or not isinstance(source_id, str):
+        return None
+    if isinstance(amount_kwh, bool) or not isinstance(amount_kwh, (int, float)):
+        return None
+    if reading_time is not None and (isinstance(reading_time, bool) or not isinstance(reading_time, (int, float))):
+        return None
+    return node_id, float(amount_kwh), source_id, reading_time
+
+
+def _count_reasons(rejected: Dict[str, int], valid: np.ndarray, reasons: np.ndarray) -> None:
+    codes, counts = np.unique(reasons[~valid], return_counts=True)
+    for code, count in zip(codes.tolist(), counts.tolist()):
+        name = EnergyValidator.REASON_NAMES[code]
+        rejected[name] = rejected.get(name, 0) + count
+
+
+def parse_chunk(lines: List[bytes]) -> ParsedChunk:
+    """Parst und validiert einen Chunk (läuft im Prozess-Pool).
+    
+    Eine Zeile ist entweder eine Ablesung ({"node_id", "amount_kwh",
+    "source_id"[, "reading_time"]}) oder eine exportierte, ggf. signierte
+    Transaktion (Format von Transaction.to_dict).
+    """
+    rejected: Dict[str, int] = {}
+    readings = []
+    txs = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            rejected["malformed_line"] = rejected.get("malformed_line", 0) + 1
+            continue
+        if isinstance(data, dict) and "payload" in data:
+            try:
+                tx = Transaction.from_dict(data)
+                digest_ok = tx.has_valid_digest()
+            except (KeyError, TypeError, ValueError, AttributeError, struct.error):
+                rejected["malformed_transaction"] = rejected.get("malformed_transaction", 0) + 1
+                continue
+            if not digest_ok:
+                rejected["hash_mismatch"] = rejected.get("hash_mismatch", 0) + 1
+                continue
+            txs.append(tx)
+            continue
+        reading = _parse_reading(data)
+        if reading is None:
+            rejected["malformed_line"] = rejected.get("malformed_line", 0) + 1
+            continue
+        readings.append(reading)
+    
+    records: List[Tuple[Any, ...]] = []
+    if readings:
+        node_ids, amounts, source_ids, _ = zip(*readings)
+        valid, reasons = EnergyValidator.validate_columns(
+            ContributionBatch.from_readings(node_ids, amounts, source_ids)
+        )
+        _count_reasons(rejected, valid, reasons)
+        records = [
+            reading if reading[3] is not None else reading[:3]
+            for reading, ok in zip(readings, valid.tolist()) if ok
+        ]
+    if txs:
+        valid, reasons = EnergyValidator.validate_columns(ContributionBatch.from_transactions(txs))
+        _count_reasons(rejected, valid, reasons)
+        txs = [tx for tx, ok in zip(txs, valid.tolist()) if ok]
+    return records, txs, rejected
+
+
+class ReadingImporter:
+    """Streamt JSONL-Dumps mit Zählerständen in den Coordinator.
+    
+    Generator-Pipeline: Chunks lesen (auch gzip) → Parsen und
+    EnergyValidator im Prozess-Pool → optional Signaturprüfung →
+    Batch-Einfügen in den DAG → Persistieren und Checkpoint. Höchstens
+    `max_pending` Chunks sind gleichzeitig unterwegs; ist der Pool voll,
+    liest der Reader nicht weiter (Backpressure). Der Speicher der
+    Pipeline hängt daher nur von `chunk_lines * max_pending` ab, nicht von
+    der Dateigröße; DAG und Ledger wachsen wie bei jeder Ingestion (für
+    lange Backfills `mint=True` mit Pruning und CompactDAG/body_path).
+    
+    Nach jedem Chunk wird der Coordinator gespeichert (mit Journal ein
+    Group Commit) und danach das Datei-Offset in `checkpoint_path`
+    festgehalten; ein erneuter Lauf setzt dort fort. Ohne Journal wird der
+    JSON-Zustand erst am Ende geschrieben, ebenso der Checkpoint.
+    """
+    
+    CHUNK_LINES = CHUNK_LINES
+    MAX_PENDING = 4
+    PROGRESS_INTERVAL = 1.0
+    
+    def __init__(
+        self,
+        coordinator: Coordinator,
+        workers: Optional[int] = None,
+        chunk_lines: int = CHUNK_LINES,
+        max_pending: int = MAX_PENDING,
+        checkpoint_path: Optional[str] = None,
+        verify_signatures: bool = False,
+        mint: bool = False,
+        progress: Optional[Callable[[ImportStats], None]] = None,
+        progress_interval: float = PROGRESS_INTERVAL
+    ):
+        self.coordinator = coordinator
+        # 0 = Parsen im aufrufenden Prozess
+        self.workers = workers
+        self.chunk_lines = chunk_lines
+        self.max_pending = max_pending
+        self.checkpoint_path = checkpoint_path
+        self.verify_signatures = verify_signatures
+        self.mint = mint
+        self.progress = progress
+        self.progress_interval = progress_interval
+    
+    def run(self, path: str) -> ImportStats:
+        source = os.path.abspath(path)
+        stats = self._resume(source)
+        started = time.perf_counter() - stats.elapsed
+        reported = time.perf_counter()
+        journaled = self.coordinator.journal is not None
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers != 0 else None
+        try:
+            chunks = read_chunks(path, stats.offset, self.chunk_lines)
+            for offset, line_count, parsed in self._parsed(chunks, pool):
+                self._insert(parsed, stats)
+                stats.offset = offset
+                stats.lines += line_count
+                stats.elapsed = time.perf_counter() - started
+                if journaled:
+                    self._persist(source, stats)
+                if self.progress is not None and time.perf_counter() - reported >= self.progress_interval:
+                    self.progress(stats)
+                    reported = time.perf_counter()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        if not journaled:
+            self._persist(source, stats)
+        if self.progress is not None:
+            self.progress(stats)
+        return stats
+    
+    def _parsed(
+        self,
+        chunks: Iterable[Chunk],
+        pool: Optional[Executor]
+    ) -> Iterator[Tuple[int, int, ParsedChunk]]:
+        """Verarbeitet Chunks parallel, liefert sie aber in Dateireihenfolge"""
+        pending: Deque[Tuple[int, int, Future]] = deque()
+        for offset, lines in chunks:
+            if pool is None:
+                future: Future = Future()
+                future.set_result(parse_chunk(lines))
+            else:
+                future = pool.submit(parse_chunk, lines)
+            pending.append((offset, len(lines), future))
+            if len(pending) >= self.max_pending:
+                offset, line_count, future = pending.popleft()
+                yield offset, line_count, future.result()
+        while pending:
+            offset, line_count, future = pending.popleft()
+            yield offset, line_count, future.result()
+    
+    def _insert(self, parsed: ParsedChunk, stats: ImportStats) -> None:
+        records, txs, rejected = parsed
+        for reason, count in rejected.items():
+            stats.reject(reason, count)
+        if records:
+            self._count(self.coordinator.submit_energy_batch(records), stats)
+        if txs:
+            if self.verify_signatures:
+                verdicts = self.coordinator.verifier.verify_batch(txs)
+                stats.reject("invalid_signature", verdicts.count(False))
+                txs = [tx for tx, valid in zip(txs, verdicts) if valid]
+            self._count(self.coordinator.submit_transactions(txs), stats)
+        if self.mint:
+            # Mintet, was durch die neuen Transaktionen bestätigt wurde (und pruned ggf.)
+            self.coordinator.process_minting()
+    
+    @staticmethod
+    def _count(results: List[Dict[str, Any]], stats: ImportStats) -> None:
+        for result in results:
+            if "error" in result:
+                stats.reject(result["error"])
+            else:
+                stats.accepted += 1
+    
+    def _persist(self, source: str, stats: ImportStats) -> None:
+        """Erst den Zustand, dann den Checkpoint schreiben (nie ein Offset vor den Daten)"""
+        self.coordinator.save_state()
+        if self.checkpoint_path is None:
+            return
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"source": source, **asdict(stats)}, f)
+        os.replace(temp_path, self.checkpoint_path)
+    
+    def _resume(self, source: str) -> ImportStats:
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return ImportStats()
+        with open(self.checkpoint_path) as f:
+            data = json.load(f)
+        if data.pop("source", None) != source:
+            return ImportStats()
+        return ImportStats(**data)
\ No newline at end of file
@@ -16,10 +16,8 @@ def main():
     
     # Explicitly confirm both transactions 3 times
     for _ in range(3):
-        if tx1 in coord.dag.transactions:
-            coord.dag.confirmations[tx1] += 1
-        if tx2 in coord.dag.transactions:
-            coord.dag.confirmations[tx2] += 1
+        coord.confirm(tx1)
+        coord.confirm(tx2)
     
     # Mint tokens
     minted = coord.process_minting()
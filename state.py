@@ -1,9 +1,11 @@
 # state.py
+import base64
 import json
 import os
 from core.tangle import Tangle
 from core.node import Node
 from tokens.engine import TokenEngine
+from tokens.processed import ProcessedIndex
 
 STATE_FILE = "atlas_state.json"
 
@@ -16,7 +18,8 @@ def save_state(tangle, token_engine, nodes):
         "confirmations": dict(tangle.confirmations),
         "tips": list(tangle.tips),
         "balances": token_engine.balances,
-        "processed_txs": list(token_engine.processed_txs)
+        # Ein Bit pro Eintrag in "transactions"
+        "processed_txs": token_engine.processed_txs.to_state(tx.digest for tx in tangle.get_all_transactions())
     }
     with open(STATE_FILE, 'w') as f:
         json.dump(data, f, indent=2)
@@ -38,7 +41,15 @@ def load_state():
     nodes = {addr: None for addr in data["nodes"]}
     token_engine = TokenEngine(tangle)
     token_engine.balances = data.get("balances", {})
-    token_engine.processed_txs = set(data.get("processed_txs", []))
+    processed = data.get("processed_txs", [])
+    if isinstance(processed, list):
+        # Älteres Format: Liste der Hashes
+        token_engine.processed_txs = ProcessedIndex(processed)
+    else:
+        token_engine.processed_txs.load_bitmap(
+            (bytes.fromhex(tx["hash"]) for tx in data["transactions"]),
+            base64.b64decode(processed)
+        )
     
     # Für Demo reicht das!
     return tangle, token_engine, nodes
\ No newline at end of file
@@ -0,0 +1,33 @@
+# storage/migrate.py
+"""Übernimmt eine atlas_state.json in eine SQLite-Datenbank (storage.sqlite_store)
+
+Aufruf: python -m storage.migrate [atlas_state.json] [atlas.db]
+"""
+import json
+import os
+import sys
+from storage.sqlite_store import SQLiteStore
+
+
+def migrate(state_path: str, database: str) -> SQLiteStore:
+    with open(state_path, 'r') as f:
+        data = json.load(f)
+    store = SQLiteStore(database)
+    store.import_state(data)
+    return store
+
+
+def main():
+    state_path = sys.argv[1] if len(sys.argv) > 1 else "atlas_state.json"
+    database = sys.argv[2] if len(sys.argv) > 2 else "atlas.db"
+    if not os.path.exists(state_path):
+        print(f"❌ {state_path} nicht gefunden")
+        sys.exit(1)
+    store = migrate(state_path, database)
+    nodes, transactions, jobs = store.counts()
+    store.close()
+    print(f"✅ {state_path} -> {database}: {nodes} Nodes, {transactions} Transaktionen, {jobs} Jobs")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
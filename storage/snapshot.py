@@ -0,0 +1,155 @@
+import lzma
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Union
+
+# Dateiaufbau (little-endian):
+#
+#   8B   Magic "ATLSNAP\0"
+#   u16  Format-Version, u16 Anzahl Sektionen
+#   je Sektion: u16 ID, u8 Kompression, u8 reserviert,
+#               u64 Offset, u64 gespeicherte Länge, u64 Rohlänge
+#   danach die Sektionsdaten
+#
+# Unkomprimierte Sektionen werden per mmap gelesen und als memoryview
+# ohne Kopie herausgegeben.
+
+MAGIC = b"ATLSNAP\x00"
+FORMAT_VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZMA = 2
+COMPRESSIONS = {None: COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "lzma": COMPRESSION_LZMA}
+
+# Sektions-IDs
+META = 1
+TX_TABLE = 2
+TX_OFFSETS = 3
+DIGESTS = 4
+PARENTS = 5
+CONFIRMATIONS = 6
+TIPS = 7
+LEDGER = 8
+JOB_QUEUE = 10
+HISTORY = 11
+PROCESSED_BITMAP = 12
+ROLLUPS = 13
+
+_HEAD = struct.Struct("<8sHH")
+_ENTRY = struct.Struct("<HBxQQQ")
+
+Buffer = Union[bytes, memoryview]
+
+
+def pack_array(values: array) -> bytes:
+    """Array-Inhalt als little-endian Bytes"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def unpack_array(typecode: str, data: Buffer) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def write_snapshot(
+    path: str,
+    sections: Dict[int, bytes],
+    compression: Union[None, str, Dict[int, Optional[str]]] = None
+) -> None:
+    """Schreibt Sektionen (ID -> Bytes).
+    
+    `compression` ist None, "zlib" oder "lzma" für alle Sektionen oder ein
+    Dict ID -> Verfahren; nicht aufgeführte Sektionen bleiben unkomprimiert.
+    """
+    methods = {}
+    stored = {}
+    for section_id, data in sections.items():
+        name = compression.get(section_id) if isinstance(compression, dict) else compression
+        method = methods[section_id] = COMPRESSIONS[name]
+        if method == COMPRESSION_ZLIB:
+            stored[section_id] = zlib.compress(data, 6)
+        elif method == COMPRESSION_LZMA:
+            stored[section_id] = lzma.compress(data)
+        else:
+            stored[section_id] = data
+    
+    offset = _HEAD.size + _ENTRY.size * len(sections)
+    entries = []
+    for section_id, data in stored.items():
+        entries.append(_ENTRY.pack(section_id, methods[section_id], offset, len(data), len(sections[section_id])))
+        offset += len(data)
+    with open(path, "wb") as f:
+        f.write(_HEAD.pack(MAGIC, FORMAT_VERSION, len(sections)))
+        f.write(b"".join(entries))
+        for data in stored.values():
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class SnapshotReader:
+    """Liest einen Snapshot über mmap; als Context Manager verwenden.
+    
+    `section()` liefert für unkomprimierte Sektionen eine memoryview in die
+    gemappte Datei. Die Views sind nur bis `close()` gültig.
+    """
+    
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._views: List[memoryview] = [self._view]
+        magic, version, count = _HEAD.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not an Atlas snapshot")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: unsupported snapshot version {version}")
+        self.version = version
+        self._sections = {}
+        for i in range(count):
+            section_id, method, offset, length, raw_length = _ENTRY.unpack_from(
+                self._map, _HEAD.size + i * _ENTRY.size
+            )
+            self._sections[section_id] = (method, offset, length, raw_length)
+    
+    def __contains__(self, section_id: int) -> bool:
+        return section_id in self._sections
+    
+    def section(self, section_id: int) -> Buffer:
+        method, offset, length, raw_length = self._sections[section_id]
+        view = self._view[offset:offset + length]
+        if method == COMPRESSION_NONE:
+            self._views.append(view)
+            return view
+        try:
+            if method == COMPRESSION_ZLIB:
+                return zlib.decompress(view, bufsize=max(raw_length, 1))
+            return lzma.decompress(view)
+        finally:
+            view.release()
+    
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+        self._file.close()
+    
+    def __enter__(self) -> "SnapshotReader":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
\ No newline at end of file
@@ -0,0 +1,437 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from core.body_store import BodyStore
+from core.encoding import decode_transaction
+from core.transaction import Transaction
+from storage import wal
+from tokens.ledger import to_units
+from tokens.processed import ProcessedIndex
+
+GENESIS_DIGEST = bytes(32)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    node_id TEXT PRIMARY KEY,
+    public_key TEXT
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY,
+    hash BLOB NOT NULL UNIQUE,
+    node_id TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_node ON transactions (node_id, timestamp);
+CREATE TABLE IF NOT EXISTS parents (
+    child BLOB NOT NULL,
+    parent BLOB NOT NULL,
+    PRIMARY KEY (child, parent)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parents_parent ON parents (parent);
+CREATE TABLE IF NOT EXISTS confirmations (
+    hash BLOB PRIMARY KEY,
+    depth INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pruned (
+    hash BLOB PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checkpoints (
+    sequence INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS balances (
+    node_id TEXT PRIMARY KEY,
+    amount REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS processed (
+    hash BLOB PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    token_cost REAL NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    deadline REAL,
+    tag REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_job_id ON jobs (job_id);
+CREATE TABLE IF NOT EXISTS escrow (
+    job_id TEXT PRIMARY KEY,
+    node_id TEXT NOT NULL,
+    amount REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reports (
+    node_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    window INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (node_id, source_id, window)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS reports_expires ON reports (expires);
+CREATE TABLE IF NOT EXISTS history (
+    seq INTEGER PRIMARY KEY,
+    node_id TEXT,
+    at REAL NOT NULL,
+    delta INTEGER NOT NULL
+);
+"""
+
+# Feste SQL-Texte: sqlite3 hält die vorbereiteten Statements im Cache
+_INSERT_NODE = (
+    "INSERT INTO nodes (node_id, public_key) VALUES (?, ?) "
+    "ON CONFLICT (node_id) DO UPDATE SET public_key = COALESCE(excluded.public_key, public_key)"
+)
+_INSERT_TX = "INSERT OR IGNORE INTO transactions (hash, node_id, timestamp, body) VALUES (?, ?, ?, ?)"
+_SELECT_BODY = "SELECT body FROM transactions WHERE hash = ?"
+_INSERT_PARENT = "INSERT OR IGNORE INTO parents (child, parent) VALUES (?, ?)"
+_UPSERT_DEPTH = (
+    "INSERT INTO confirmations (hash, depth) VALUES (?, ?) "
+    "ON CONFLICT (hash) DO UPDATE SET depth = MAX(depth, excluded.depth)"
+)
+_CREDIT = (
+    "INSERT INTO balances (node_id, amount) VALUES (?, ?) "
+    "ON CONFLICT (node_id) DO UPDATE SET amount = amount + excluded.amount"
+)
+_DEBIT = "UPDATE balances SET amount = amount - ? WHERE node_id = ?"
+_ADD_SUPPLY = (
+    "INSERT INTO meta (key, value) VALUES ('total_supply', ?) "
+    "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS REAL) + CAST(excluded.value AS REAL)"
+)
+_INSERT_PROCESSED = "INSERT OR IGNORE INTO processed (hash) VALUES (?)"
+_INSERT_JOB = (
+    "INSERT INTO jobs (job_id, node_id, token_cost, payload, priority, deadline, tag) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_DELETE_JOB = "DELETE FROM jobs WHERE seq = (SELECT MIN(seq) FROM jobs WHERE job_id = ?)"
+_INSERT_ESCROW = "INSERT OR REPLACE INTO escrow (job_id, node_id, amount) VALUES (?, ?, ?)"
+_DELETE_ESCROW = "DELETE FROM escrow WHERE job_id = ?"
+_SET_VIRTUAL_TIME = (
+    "INSERT INTO meta (key, value) VALUES ('job_virtual_time', ?) "
+    "ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+)
+# Spalten, die nach der ersten Version hinzukamen (ALTER TABLE für bestehende Datenbanken)
+_ADDED_COLUMNS = {
+    "jobs": [("priority", "INTEGER NOT NULL DEFAULT 0"), ("deadline", "REAL"), ("tag", "REAL")]
+}
+_DELETE_TX = "DELETE FROM transactions WHERE hash = ?"
+_DELETE_PARENTS = "DELETE FROM parents WHERE child = ?"
+_DELETE_DEPTH = "DELETE FROM confirmations WHERE hash = ?"
+_DELETE_PROCESSED = "DELETE FROM processed WHERE hash = ?"
+_INSERT_PRUNED = "INSERT OR IGNORE INTO pruned (hash) VALUES (?)"
+_INSERT_CHECKPOINT = "INSERT OR REPLACE INTO checkpoints (sequence, data) VALUES (?, ?)"
+_INSERT_REPORT = "INSERT OR IGNORE INTO reports (node_id, source_id, window, expires) VALUES (?, ?, ?, ?)"
+# Buchungsjournal (Festkomma); node_id NULL steht für die Gesamtmenge
+_INSERT_HISTORY = "INSERT INTO history (node_id, at, delta) VALUES (?, ?, ?)"
+
+
+class SQLiteStore:
+    """Persistenz-Backend auf SQLite (WAL-Modus) mit der Schnittstelle des WriteAheadLog.
+    
+    Nimmt dieselben Records entgegen wie `storage.wal` und schreibt sie
+    sofort in indizierte Tabellen; Commits werden wie beim Log gebündelt
+    (höchstens alle `fsync_interval` Sekunden sowie bei `sync()`).
+    Ein Neustart liest die Tabellen, statt ein Log abzuspielen.
+    """
+    
+    FSYNC_INTERVAL = 0.05
+    
+    def __init__(self, path: str, fsync_interval: float = FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.records_since_snapshot = 0
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = FULL")
+        self._conn.executescript(_SCHEMA)
+        self._add_columns()
+        self._in_transaction = False
+        self._last_sync = time.monotonic()
+    
+    def _add_columns(self) -> None:
+        for table, columns in _ADDED_COLUMNS.items():
+            present = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            for name, definition in columns:
+                if name not in present:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+    
+    @staticmethod
+    def _job_row(job: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
+            job["job_id"], job["node_id"], job["token_cost"], json.dumps(job["payload"]),
+            job.get("priority", 0), job.get("deadline"), job.get("tag")
+        )
+    
+    def _begin(self) -> sqlite3.Connection:
+        if not self._in_transaction:
+            self._conn.execute("BEGIN")
+            self._in_transaction = True
+        return self._conn
+    
+    def _written(self) -> None:
+        self.records_since_snapshot += 1
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+    
+    def append(self, kind: int, body: bytes) -> None:
+        if kind == wal.TX_ADDED:
+            tx, _ = decode_transaction(body)
+            self.append_tx(tx)
+        else:
+            self.append_json(kind, json.loads(body))
+    
+    def append_tx(self, tx: Transaction) -> None:
+        self._insert_tx(self._begin(), tx)
+        self._written()
+    
+    @staticmethod
+    def _insert_tx(conn: sqlite3.Connection, tx: Transaction) -> None:
+        conn.execute(_INSERT_TX, (tx.digest, tx.node_id, tx.timestamp, tx.encoded()))
+        conn.executemany(_INSERT_PARENT, [
+            (tx.digest, parent) for parent in {bytes.fromhex(tx.parent1), bytes.fromhex(tx.parent2)}
+            if parent != GENESIS_DIGEST
+        ])
+    
+    def append_json(self, kind: int, data: Any) -> None:
+        conn = self._begin()
+        if kind == wal.NODE_REGISTERED:
+            conn.execute(_INSERT_NODE, (data["node_id"], data.get("public_key")))
+        elif kind == wal.CONFIRMATION:
+            conn.execute(_UPSERT_DEPTH, (bytes.fromhex(data["tx"]), data["depth"]))
+        elif kind == wal.MINT:
+            if data["amount"] > 0:
+                conn.execute(_CREDIT, (data["node_id"], data["amount"]))
+                conn.execute(_ADD_SUPPLY, (data["amount"],))
+                at, units = data.get("at", time.time()), to_units(data["amount"])
+                conn.executemany(_INSERT_HISTORY, [(data["node_id"], at, units), (None, at, units)])
+            conn.execute(_INSERT_PROCESSED, (bytes.fromhex(data["tx"]),))
+        elif kind == wal.DEBIT:
+            conn.execute(_DEBIT, (data["amount"], data["node_id"]))
+            conn.execute(_INSERT_HISTORY, (data["node_id"], data.get("at", time.time()), -to_units(data["amount"])))
+        elif kind == wal.JOB_QUEUED:
+            conn.execute(_INSERT_JOB, self._job_row(data))
+        elif kind == wal.JOB_RESERVED:
+            conn.execute(_DEBIT, (data["amount"], data["node_id"]))
+            conn.execute(_INSERT_HISTORY, (data["node_id"], data["at"], -to_units(data["amount"])))
+            conn.execute(_INSERT_ESCROW, (data["job_id"], data["node_id"], data["amount"]))
+        elif kind == wal.JOB_EXECUTED:
+            conn.execute(_DELETE_JOB, (data["job_id"],))
+            if "virtual_time" in data:
+                conn.execute(_SET_VIRTUAL_TIME, (data["virtual_time"],))
+        elif kind == wal.JOB_CANCELLED:
+            conn.execute(_DELETE_JOB, (data["job_id"],))
+        elif kind == wal.JOB_SETTLED:
+            conn.execute(_DELETE_ESCROW, (data["job_id"],))
+        elif kind == wal.JOB_REFUNDED:
+            conn.execute(_DELETE_ESCROW, (data["job_id"],))
+            # Guthaben zurück, die Gesamtmenge bleibt
+            conn.execute(_CREDIT, (data["node_id"], data["amount"]))
+            conn.execute(_INSERT_HISTORY, (data["node_id"], data["at"], to_units(data["amount"])))
+        elif kind == wal.PRUNED:
+            digests = [(bytes.fromhex(tx_hash),) for tx_hash in data["hashes"]]
+            conn.executemany(_DELETE_TX, digests)
+            conn.executemany(_DELETE_PARENTS, digests)
+            conn.executemany(_DELETE_DEPTH, digests)
+            conn.executemany(_DELETE_PROCESSED, digests)
+            conn.executemany(_INSERT_PRUNED, digests)
+            checkpoint = data["checkpoint"]
+            conn.execute(_INSERT_CHECKPOINT, (checkpoint["sequence"], json.dumps(checkpoint)))
+        elif kind == wal.REPORT_SEEN:
+            conn.execute(_INSERT_REPORT, (*data["key"], data["expires"]))
+        self._written()
+    
+    def sync(self) -> None:
+        """Group Commit: die laufende Transaktion festschreiben"""
+        if self._in_transaction:
+            self._conn.execute("COMMIT")
+            self._in_transaction = False
+        self._last_sync = time.monotonic()
+    
+    def compact(self, now: Optional[float] = None) -> None:
+        """Entfernt abgelaufene Replay-Einträge und nicht mehr referenzierte
+        geprunte Hashes; überträgt das SQLite-WAL in die Datenbank"""
+        now = time.time() if now is None else now
+        conn = self._begin()
+        conn.execute("DELETE FROM reports WHERE expires <= ?", (now,))
+        conn.execute("DELETE FROM pruned WHERE hash NOT IN (SELECT parent FROM parents)")
+        self.sync()
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.records_since_snapshot = 0
+    
+    def empty(self) -> bool:
+        row = self._conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM nodes) OR EXISTS (SELECT 1 FROM transactions)"
+        ).fetchone()
+        return not row[0]
+    
+    def import_state(self, data: Dict[str, Any]) -> None:
+        """Ersetzt den Inhalt durch einen Zustand im Format von atlas_state.json"""
+        conn = self._begin()
+        for table in (
+            "meta", "nodes", "transactions", "parents", "confirmations", "pruned",
+            "checkpoints", "balances", "processed", "jobs", "escrow", "reports", "history"
+        ):
+            conn.execute(f"DELETE FROM {table}")
+        public_keys = data.get("public_keys", {})
+        conn.executemany(_INSERT_NODE, [
+            (node_id, public_keys.get(node_id)) for node_id in data.get("nodes", [])
+        ])
+        conn.executemany(_CREDIT, list(data.get("balances", {}).items()))
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('total_supply', ?)",
+            (data.get("total_supply", 0.0),)
+        )
+        conn.executemany(_INSERT_PROCESSED, [
+            (digest,) for digest in ProcessedIndex.from_state(data).digests()
+        ])
+        conn.executemany(_INSERT_CHECKPOINT, [
+            (checkpoint["sequence"], json.dumps(checkpoint)) for checkpoint in data.get("checkpoints", [])
+        ])
+        conn.executemany(_INSERT_REPORT, [tuple(entry) for entry in data.get("replay_guard", [])])
+        history = data.get("balance_history") or {}
+        conn.executemany(_INSERT_HISTORY, [
+            (node_id, at, delta) for node_id, entries in history.get("accounts", {}).items() for at, delta in entries
+        ])
+        conn.executemany(_INSERT_HISTORY, [(None, at, delta) for at, delta in history.get("supply", [])])
+        conn.executemany(_INSERT_JOB, [self._job_row(job) for job in data.get("job_queue", [])])
+        conn.execute(_SET_VIRTUAL_TIME, (data.get("job_virtual_time", 0.0),))
+        conn.executemany(_INSERT_ESCROW, [
+            (job_id, node_id, amount) for job_id, (node_id, amount) in data.get("escrow", {}).items()
+        ])
+        
+        dag_data = data.get("dag", {})
+        for tx_dict in dag_data.get("transactions", []):
+            self._insert_tx(conn, Transaction.from_dict(tx_dict))
+        conn.executemany(_UPSERT_DEPTH, [
+            (bytes.fromhex(tx_hash), depth) for tx_hash, depth in dag_data.get("confirmations", {}).items()
+        ])
+        conn.executemany(_INSERT_PRUNED, [(bytes.fromhex(tx_hash),) for tx_hash in dag_data.get("pruned", [])])
+        self.compact()
+    
+    def read_state(self) -> Dict[str, Any]:
+        """Alles außer den Transaktionen im Format von atlas_state.json"""
+        conn = self._conn
+        nodes = conn.execute("SELECT node_id, public_key FROM nodes ORDER BY rowid").fetchall()
+        total_supply = conn.execute("SELECT value FROM meta WHERE key = 'total_supply'").fetchone()
+        virtual_time = conn.execute("SELECT value FROM meta WHERE key = 'job_virtual_time'").fetchone()
+        accounts: Dict[str, List[list]] = {}
+        supply = []
+        for node_id, at, delta in conn.execute("SELECT node_id, at, delta FROM history ORDER BY seq"):
+            (supply if node_id is None else accounts.setdefault(node_id, [])).append([at, delta])
+        state = {
+            "nodes": [node_id for node_id, _ in nodes],
+            "public_keys": {node_id: public_key for node_id, public_key in nodes if public_key is not None},
+            "balances": dict(conn.execute("SELECT node_id, amount FROM balances")),
+            "total_supply": float(total_supply[0]) if total_supply else 0.0,
+            "processed_transactions": [row[0].hex() for row in conn.execute("SELECT hash FROM processed")],
+            "checkpoints": [
+                json.loads(row[0]) for row in conn.execute("SELECT data FROM checkpoints ORDER BY sequence")
+            ],
+            "replay_guard": [list(row) for row in conn.execute(
+                "SELECT node_id, source_id, window, expires FROM reports"
+            )],
+            "job_queue": [
+                {
+                    "job_id": job_id,
+                    "node_id": node_id,
+                    "token_cost": token_cost,
+                    "payload": json.loads(payload),
+                    "priority": priority,
+                    "deadline": deadline,
+                    "tag": tag
+                }
+                for job_id, node_id, token_cost, payload, priority, deadline, tag in conn.execute(
+                    "SELECT job_id, node_id, token_cost, payload, priority, deadline, tag FROM jobs ORDER BY seq"
+                )
+            ],
+            "job_virtual_time": float(virtual_time[0]) if virtual_time else 0.0,
+            "escrow": {
+                job_id: [node_id, amount]
+                for job_id, node_id, amount in conn.execute("SELECT job_id, node_id, amount FROM escrow")
+            }
+        }
+        if accounts or supply:
+            state["balance_history"] = {"accounts": accounts, "supply": supply}
+        return state
+    
+    def transactions(self) -> Iterator[Transaction]:
+        """Alle Transaktionen in Einfügereihenfolge (Eltern vor Kindern)"""
+        for digest, body in self._conn.execute("SELECT hash, body FROM transactions ORDER BY seq"):
+            yield decode_transaction(body, digest=digest)[0]
+    
+    def confirmations(self) -> Dict[str, int]:
+        return {digest.hex(): depth for digest, depth in self._conn.execute("SELECT hash, depth FROM confirmations")}
+    
+    def pruned(self) -> List[str]:
+        return [row[0].hex() for row in self._conn.execute("SELECT hash FROM pruned")]
+    
+    def bodies(self) -> "TransactionBodies":
+        """Body-Quelle für die CompactDAG über die Tabelle `transactions`"""
+        return TransactionBodies(self._conn)
+    
+    def children(self, tx_hash: str) -> List[str]:
+        """Direkte Approver einer Transaktion, ohne den DAG im Speicher zu halten"""
+        rows = self._conn.execute("SELECT child FROM parents WHERE parent = ?", (bytes.fromhex(tx_hash),))
+        return [row[0].hex() for row in rows]
+    
+    def balance(self, node_id: str) -> float:
+        row = self._conn.execute("SELECT amount FROM balances WHERE node_id = ?", (node_id,)).fetchone()
+        return row[0] if row else 0.0
+    
+    def counts(self) -> Tuple[int, int, int]:
+        """Anzahl Nodes, Transaktionen und wartender Jobs"""
+        return tuple(
+            self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("nodes", "transactions", "jobs")
+        )
+    
+    def close(self) -> None:
+        if self._conn is not None:
+            self.sync()
+            self._conn.close()
+            self._conn = None
+
+
+class TransactionBodies:
+    """Liest Transaktions-Bodies der CompactDAG aus der Tabelle `transactions`.
+    
+    Gegenstück zum BodyStore für das SQLite-Backend: die Zeilen schreibt der
+    SQLiteStore ohnehin (TX_ADDED), die DAG behält nur ihre Spalten und
+    liest Bodies per Digest nach. Zuletzt gelesene oder hinzugefügte Bodies
+    hält ein kleiner LRU-Cache; so sind auch Transaktionen lesbar, die der
+    Coordinator erst nach dem Einfügen in die DAG protokolliert.
+    """
+    
+    CACHE_SIZE = BodyStore.CACHE_SIZE
+    
+    def __init__(self, conn: sqlite3.Connection, cache_size: int = CACHE_SIZE):
+        self._conn = conn
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+    
+    def remember(self, digest: bytes, body: bytes) -> None:
+        self._cache[digest] = body
+        self._cache.move_to_end(digest)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def read(self, digest: bytes) -> bytes:
+        body = self._cache.get(digest)
+        if body is not None:
+            self._cache.move_to_end(digest)
+            return body
+        row = self._conn.execute(_SELECT_BODY, (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest.hex())
+        self.remember(digest, row[0])
+        return row[0]
+    
+    def close(self) -> None:
+        self._cache.clear()
\ No newline at end of file
@@ -0,0 +1,169 @@
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Any, Callable, Iterator, List, Tuple
+
+# Record-Arten
+NODE_REGISTERED = 1
+TX_ADDED = 2
+CONFIRMATION = 3
+MINT = 4
+DEBIT = 5
+JOB_QUEUED = 6
+JOB_EXECUTED = 7
+PRUNED = 8
+REPORT_SEEN = 9
+JOB_CANCELLED = 10
+# Reservierte Job-Kosten einbehalten bzw. erstatten
+JOB_SETTLED = 11
+JOB_REFUNDED = 12
+# Kosten eines Jobs abgebucht und reserviert (Abbuchung und Reservierung in einem Record)
+JOB_RESERVED = 13
+
+# u32 Länge des Bodys, u32 CRC32 über Art + Body, u8 Art
+_HEADER = struct.Struct("<IIB")
+
+
+class WriteAheadLog:
+    """Segmentiertes Append-only-Log mit Group Commit.
+    
+    Records landen in `wal-<n>.log`-Segmenten; ein neues Segment beginnt,
+    sobald `segment_size` überschritten ist. fsync erfolgt höchstens alle
+    `fsync_interval` Sekunden (0 = nach jedem Record) sowie bei `sync()`.
+    Ein Snapshot enthält den Zustand bis zum Beginn eines Segments, ältere
+    Segmente werden danach gelöscht. Ein abgeschnittener oder beschädigter
+    Record am Ende (Absturz mitten im Schreiben) beendet das Lesen.
+    """
+    
+    SEGMENT_SIZE = 64 * 1024 * 1024
+    FSYNC_INTERVAL = 0.05
+    SNAPSHOT_FILE = "snapshot.bin"
+    
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = SEGMENT_SIZE,
+        fsync_interval: float = FSYNC_INTERVAL
+    ):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync_interval = fsync_interval
+        self.records_since_snapshot = 0
+        os.makedirs(directory, exist_ok=True)
+        segments = self.segments()
+        self._segment = segments[-1] if segments else 0
+        self._file = None
+        self._size = 0
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        self._open_segment(self._segment)
+    
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"wal-{number:08d}.log")
+    
+    def segments(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith("wal-") and name.endswith(".log"):
+                numbers.append(int(name[4:-4]))
+        return sorted(numbers)
+    
+    def _open_segment(self, number: int) -> None:
+        path = self._segment_path(number)
+        if os.path.exists(path):
+            # Beschädigtes Ende abschneiden, damit neue Records lesbar bleiben
+            valid = self._valid_length(path)
+            if valid < os.path.getsize(path):
+                with open(path, "r+b") as f:
+                    f.truncate(valid)
+        self._file = open(path, "ab")
+        self._segment = number
+        self._size = self._file.tell()
+    
+    @staticmethod
+    def _valid_length(path: str) -> int:
+        with open(path, "rb") as f:
+            data = f.read()
+        return sum(_HEADER.size + len(body) for _, body in _parse(data))
+    
+    def append(self, kind: int, body: bytes) -> None:
+        crc = zlib.crc32(body, zlib.crc32(bytes((kind,))))
+        self._file.write(_HEADER.pack(len(body), crc, kind))
+        self._file.write(body)
+        self._size += _HEADER.size + len(body)
+        self._dirty = True
+        self.records_since_snapshot += 1
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        if self._size >= self.segment_size:
+            self.rotate()
+    
+    def append_tx(self, tx: Any) -> None:
+        self.append(TX_ADDED, tx.encoded())
+    
+    def append_json(self, kind: int, data: Any) -> None:
+        self.append(kind, json.dumps(data, separators=(",", ":")).encode())
+    
+    def sync(self) -> None:
+        """Group Commit: alles bisher Geschriebene dauerhaft machen"""
+        if self._file is not None and self._dirty:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+        self._last_sync = time.monotonic()
+    
+    def rotate(self) -> int:
+        """Beginnt ein neues Segment und liefert dessen Nummer"""
+        self.sync()
+        self._file.close()
+        self._open_segment(self._segment + 1)
+        return self._segment
+    
+    def records(self, start_segment: int = 0) -> Iterator[Tuple[int, bytes]]:
+        """Alle Records ab `start_segment` in Schreibreihenfolge"""
+        self._file.flush()
+        for number in self.segments():
+            if number < start_segment:
+                continue
+            with open(self._segment_path(number), "rb") as f:
+                data = f.read()
+            yield from _parse(data)
+    
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, self.SNAPSHOT_FILE)
+    
+    def write_snapshot(self, write: Callable[[str, int], None]) -> None:
+        """Schreibt atomar einen Snapshot und löscht die abgedeckten Segmente.
+        
+        `write(pfad, segment)` erzeugt die Datei; `segment` ist das erste
+        Segment, dessen Records nicht mehr im Snapshot enthalten sind.
+        """
+        segment = self.rotate()
+        tmp_path = self.snapshot_path + ".tmp"
+        write(tmp_path, segment)
+        os.replace(tmp_path, self.snapshot_path)
+        for number in self.segments():
+            if number < segment:
+                os.remove(self._segment_path(number))
+        self.records_since_snapshot = 0
+    
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+def _parse(data: bytes) -> Iterator[Tuple[int, bytes]]:
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, crc, kind = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        body = data[start:start + length]
+        if len(body) < length or zlib.crc32(body, zlib.crc32(bytes((kind,)))) != crc:
+            return
+        yield kind, body
+        offset = start + length
\ No newline at end of file
@@ -0,0 +1,22 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orchestration.coordinator import Coordinator
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Jeder Test in einem eigenen Verzeichnis (Zustandsdatei, Journale, Archive)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def fund(coord: Coordinator, node_id: str, amount_kwh: float, source_id: str = "solar_1") -> str:
+    """Meldet Energie, bestätigt sie und mintet (1 kWh = KWH_TO_TOKEN_RATE Tokens)"""
+    tx_hash = coord.submit_energy(node_id, amount_kwh, source_id)
+    coord.confirm(tx_hash, coord.dag.confirmation_threshold)
+    coord.process_minting()
+    return tx_hash
\ No newline at end of file
@@ -0,0 +1,128 @@
+import threading
+import time
+import pytest
+import compute.executor
+from compute.job import ComputeJob
+from conftest import fund
+from orchestration.coordinator import Coordinator
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """Lässt Pool-Jobs hängen, bis das Event gesetzt wird"""
+    release = threading.Event()
+    run_payload = compute.executor.run_payload
+    monkeypatch.setattr(compute.executor, "run_payload", lambda payload: (release.wait(10), run_payload(payload))[1])
+    yield release
+    release.set()
+
+
+def _collect(coord: Coordinator, count: int = 1):
+    results = []
+    deadline = time.monotonic() + 10
+    while len(results) < count and time.monotonic() < deadline:
+        results.extend(coord.collect_results(timeout=0.05))
+    return results
+
+
+def _funded(**options) -> Coordinator:
+    coord = Coordinator(compute_pool=True, compute_workers=1, **options)
+    fund(coord, "a", 5.0)
+    assert coord.ledger.get_balance("a") == 50.0
+    return coord
+
+
+def test_reservation_is_debited_on_submit():
+    coord = _funded()
+    assert coord.submit_compute_job(ComputeJob("j", "a", 10.0, {}))
+    assert coord.ledger.get_balance("a") == 40.0
+    assert coord.escrow.held("a") == 10.0
+    assert not coord.submit_compute_job(ComputeJob("k", "a", 45.0, {}))
+    assert coord.scheduler.get_queue_length() == 1
+
+
+def test_cancel_refunds_reservation():
+    coord = _funded()
+    supply = coord.ledger.total_supply
+    coord.submit_compute_job(ComputeJob("j", "a", 10.0, {}))
+    assert coord.cancel_compute_job("j")
+    assert coord.ledger.get_balance("a") == 50.0
+    assert coord.escrow.held() == 0
+    assert coord.ledger.total_supply == supply
+
+
+def test_completed_job_keeps_reservation():
+    coord = _funded()
+    coord.submit_compute_job(ComputeJob("j", "a", 10.0, {}))
+    assert coord.dispatch_jobs() == 1
+    [result] = _collect(coord)
+    assert result["status"] == "completed"
+    assert coord.ledger.get_balance("a") == 40.0
+    assert coord.escrow.held() == 0
+    coord.close()
+
+
+def test_failed_job_is_refunded():
+    coord = _funded()
+    coord.submit_compute_job(ComputeJob("j", "a", 10.0, {"rounds": "many"}))
+    coord.dispatch_jobs()
+    [result] = _collect(coord)
+    assert result["error"] == "job_failed"
+    assert coord.ledger.get_balance("a") == 50.0
+    assert coord.escrow.held() == 0
+    coord.close()
+
+
+def test_timeout_is_refunded_and_blocks_worker(blocked):
+    coord = _funded(job_timeout=0.05)
+    coord.submit_compute_job(ComputeJob("j", "a", 10.0, {}))
+    coord.dispatch_jobs()
+    [result] = _collect(coord)
+    assert result == {"error": "timeout", "job_id": "j"}
+    assert coord.ledger.get_balance("a") == 50.0
+    # Der hängende Worker zählt bis zu seinem Ende als belegt
+    assert coord.executor.stuck() == 1
+    assert coord.executor.free_slots() == 0
+    blocked.set()
+    deadline = time.monotonic() + 10
+    while coord.executor.stuck() and time.monotonic() < deadline:
+        coord.collect_results(timeout=0.05)
+    assert coord.executor.free_slots() > 0
+    # Das verspätete Ergebnis wird nicht mehr abgerechnet
+    assert coord.ledger.get_balance("a") == 50.0
+    coord.close()
+
+
+def test_expired_deadline_is_refunded():
+    coord = _funded()
+    coord.submit_compute_job(ComputeJob("j", "a", 10.0, {}, deadline=time.time() - 1))
+    assert coord.dispatch_jobs() == 0
+    assert coord.ledger.get_balance("a") == 50.0
+    assert coord.escrow.held() == 0
+
+
+@pytest.mark.parametrize("options", [{"journal_dir": "j"}, {"database": "atlas.db"}], ids=["wal", "sqlite"])
+def test_running_job_is_refunded_after_crash(blocked, options):
+    coord = Coordinator(**options)
+    fund(coord, "a", 5.0)
+    # Vor dem Pool-Modus eingereiht: dispatch_jobs reserviert erst beim Verteilen
+    coord.submit_compute_job(ComputeJob("j", "a", 10.0, {}))
+    coord.save_state()
+    coord.close()
+    
+    pool = Coordinator(compute_pool=True, compute_workers=1, **options)
+    assert pool.load_state()
+    assert pool.dispatch_jobs() == 1
+    assert pool.ledger.get_balance("a") == 40.0
+    assert pool.escrow.held("a") == 10.0
+    # Absturz während der Job läuft: kein close()
+    pool.save_state()
+    
+    restored = Coordinator(compute_pool=True, **options)
+    assert restored.load_state()
+    assert restored.ledger.get_balance("a") == 50.0
+    assert restored.escrow.held() == 0
+    assert restored.scheduler.get_queue_length() == 0
+    blocked.set()
+    pool.executor.shutdown()
+    restored.close()
\ No newline at end of file
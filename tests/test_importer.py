@@ -0,0 +1,22 @@
+import json
+import time
+from orchestration.coordinator import Coordinator
+from orchestration.importer import ReadingImporter
+
+HOUR = 3600
+
+
+def test_old_readings_land_in_their_window():
+    start = (int(time.time()) // HOUR - 72) * HOUR
+    with open("dump.jsonl", "w") as f:
+        for i in range(6):
+            f.write(json.dumps({"node_id": "n0", "amount_kwh": 1.0 + i, "source_id": "solar_1", "reading_time": start + i * 60}) + "\n")
+        f.write(json.dumps({"node_id": "n0", "amount_kwh": 10.0, "source_id": "solar_1", "reading_time": start + HOUR}) + "\n")
+    coord = Coordinator(energy_rollups=True)
+    stats = ReadingImporter(coord, workers=0).run("dump.jsonl")
+    assert stats.accepted == 7
+    assert {coord.dag.transactions[tx_hash].timestamp for tx_hash in coord.dag.transactions} >= {start, start + HOUR}
+    windows, values = coord.rollups.series(start, start + 2 * HOUR, node_id="n0")
+    assert windows.tolist() == [start, start + HOUR]
+    assert values.tolist() == [21.0, 10.0]
+    assert coord.rollups.total(time.time() - HOUR, time.time() + HOUR) == 0.0
@@ -0,0 +1,66 @@
+import pytest
+from core.transaction import Transaction
+from orchestration.coordinator import Coordinator
+
+KEEP_LAST = 2
+
+
+def _mint_and_prune(coord: Coordinator, count: int = 300):
+    """Mintet `count` Meldungen und prunt sie; liefert Kopien der ersten fünf"""
+    coord.pruner.min_batch = 100
+    hashes = [coord.submit_energy(f"n{i % 5}", 1.0, "solar_1", reading_time=i) for i in range(count)]
+    copies = [Transaction.from_dict(coord.dag.transactions[tx_hash].to_dict()) for tx_hash in hashes[:5]]
+    for tx_hash in hashes:
+        coord.confirm(tx_hash, coord.dag.confirmation_threshold)
+    coord.process_minting()
+    assert not any(copy.hash in coord.dag.transactions for copy in copies)
+    return copies
+
+
+def _assert_not_minted_again(coord: Coordinator, copies) -> None:
+    supply = coord.ledger.total_supply
+    results = coord.submit_transactions(copies)
+    assert [result.get("error") for result in results] == ["already_pruned"] * len(copies)
+    for copy in copies:
+        coord.confirm(copy.hash, coord.dag.confirmation_threshold)
+    coord.process_minting()
+    assert coord.ledger.total_supply == supply
+
+
+@pytest.mark.parametrize("compact_dag", [False, True])
+def test_pruned_transaction_is_not_minted_again(compact_dag):
+    coord = Coordinator(prune_keep_last=KEEP_LAST, compact_dag=compact_dag)
+    copies = _mint_and_prune(coord)
+    _assert_not_minted_again(coord, copies)
+
+
+@pytest.mark.parametrize("options, compact", [
+    ({"journal_dir": "j"}, False),
+    ({"journal_dir": "j"}, True),
+    ({"database": "atlas.db"}, False),
+    ({}, False)
+], ids=["wal-replay", "wal-snapshot", "sqlite", "json"])
+def test_pruned_transaction_is_rejected_after_restart(options, compact):
+    coord = Coordinator(prune_keep_last=KEEP_LAST, **options)
+    copies = _mint_and_prune(coord)
+    coord.save_state()
+    if compact:
+        coord.compact()
+    coord.close()
+    
+    restored = Coordinator(prune_keep_last=KEEP_LAST, **options)
+    assert restored.load_state()
+    assert all(restored.pruner.was_pruned(restored.dag, copy) for copy in copies)
+    _assert_not_minted_again(restored, copies)
+    restored.close()
+
+def test_batch_keeps_live_parents():
+    coord = Coordinator(prune_keep_last=KEEP_LAST)
+    copies = _mint_and_prune(coord)
+    dag = coord.dag
+    # Gepruned wird nie vor den eigenen Eltern
+    for copy in copies:
+        assert not {copy.parent1, copy.parent2} & set(dag.transactions)
+    # Neue Meldungen auf den verbleibenden Tips werden weiter angenommen
+    assert coord.submit_energy("n9", 1.0, "solar_2") in dag.transactions
+    assert coord.pruner.horizon >= copies[0].timestamp
\ No newline at end of file
@@ -0,0 +1,75 @@
+import pytest
+from compute.job import ComputeJob
+from conftest import fund
+from orchestration.coordinator import Coordinator
+
+BACKENDS = [
+    pytest.param({"journal_dir": "j"}, id="wal"),
+    pytest.param({"journal_dir": "j", "compact_dag": True, "snapshot_compression": "zlib"}, id="wal-compact-zlib"),
+    pytest.param({"journal_dir": "j", "body_path": "bodies.bin"}, id="wal-bodystore"),
+    pytest.param({"database": "atlas.db"}, id="sqlite")
+]
+
+
+def _fingerprint(coord: Coordinator):
+    return (
+        coord.merkle_roots(),
+        dict(coord.ledger.balances),
+        coord.ledger.total_supply,
+        coord.escrow.to_dict(),
+        coord.scheduler.get_queue_length(),
+        set(coord.minter.processed_transactions)
+    )
+
+
+def _activity(coord: Coordinator, round_: int) -> None:
+    for i in range(6):
+        fund(coord, f"n{i % 3}", 1.0 + i, f"solar_{round_}_{i}")
+    # Unbestätigte Transaktionen gehören ebenfalls zum Zustand
+    coord.submit_energy("n1", 3.5, f"wind_{round_}")
+    for i in range(3):
+        assert coord.submit_compute_job(ComputeJob(f"job_{round_}_{i}", f"n{i}", 2.0 + i, {"i": i}))
+    assert coord.cancel_compute_job(f"job_{round_}_1")
+
+
+@pytest.mark.parametrize("options", BACKENDS)
+def test_snapshot_plus_tail_matches_memory(options):
+    coord = Coordinator(compute_pool=True, **options)
+    _activity(coord, 0)
+    coord.compact()
+    # WAL-Rest nach dem Snapshot
+    _activity(coord, 1)
+    coord.save_state()
+    expected = _fingerprint(coord)
+    assert expected[3]
+    coord.close()
+    
+    restored = Coordinator(compute_pool=True, **options)
+    assert restored.load_state()
+    assert _fingerprint(restored) == expected
+    restored.close()
+
+
+@pytest.mark.parametrize("options", BACKENDS)
+def test_snapshot_alone_matches_memory(options):
+    coord = Coordinator(compute_pool=True, **options)
+    _activity(coord, 0)
+    coord.compact()
+    expected = _fingerprint(coord)
+    coord.close()
+    
+    restored = Coordinator(compute_pool=True, **options)
+    assert restored.load_state()
+    assert _fingerprint(restored) == expected
+    restored.close()
+
+
+def test_binary_snapshot_file_round_trip():
+    coord = Coordinator(compute_pool=True)
+    _activity(coord, 0)
+    coord.save_snapshot("state.snap", "lzma")
+    expected = _fingerprint(coord)
+    
+    restored = Coordinator(compute_pool=True, compact_dag=True)
+    restored.load_snapshot("state.snap")
+    assert _fingerprint(restored) == expected
\ No newline at end of file
@@ -0,0 +1,36 @@
+from energy.replay import ReplayGuard
+from orchestration.coordinator import Coordinator
+
+RETENTION = ReplayGuard.RETENTION_SECONDS
+
+
+def test_reading_older_than_retention_is_rejected():
+    guard = ReplayGuard(window=900)
+    key = guard.key("n", "s", 1000.0)
+    assert not guard.check_and_remember(key, now=1000.0 + RETENTION + 901)
+    assert not guard.check_and_remember(key, now=1000.0 + RETENTION + 901)
+    assert len(guard) == 0
+
+
+def test_entry_expires_with_its_window():
+    guard = ReplayGuard(window=900)
+    # Spät nachgereichte Meldung: ihr Eintrag gilt nur bis Fensterende + retention
+    old = guard.key("n", "s", 1000.0)
+    assert guard.check_and_remember(old, now=1000.0 + RETENTION - 100)
+    fresh = guard.key("n", "s", 1000.0 + RETENTION)
+    assert guard.check_and_remember(fresh, now=1000.0 + RETENTION)
+    assert not guard.check_and_remember(old, now=1000.0 + RETENTION)
+    guard.is_duplicate(fresh, now=guard.expires(old))
+    assert len(guard) == 1
+    assert not guard.check_and_remember(fresh, now=guard.expires(old))
+
+
+def test_restored_guard_rejects_replay():
+    coord = Coordinator(journal_dir="j", replay_window=900)
+    coord.submit_energy("n", 1.0, "solar_1")
+    coord.close()
+    
+    restored = Coordinator(journal_dir="j", replay_window=900)
+    assert restored.load_state()
+    assert restored.submit_energy_batch([("n", 1.0, "solar_1")])[0]["error"] == "duplicate_report"
+    restored.close()
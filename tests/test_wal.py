@@ -0,0 +1,73 @@
+import os
+from conftest import fund
+from orchestration.coordinator import Coordinator
+from storage import wal
+from storage.wal import WriteAheadLog
+
+
+def _truncate_tail(directory: str, count: int) -> None:
+    """Schneidet die letzten `count` Bytes des jüngsten Segments ab (Absturz beim Schreiben)"""
+    log = WriteAheadLog(directory)
+    path = log._segment_path(log.segments()[-1])
+    log.close()
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - count)
+
+
+def test_records_stop_before_torn_record():
+    log = WriteAheadLog("j")
+    for i in range(3):
+        log.append_json(wal.NODE_REGISTERED, {"node_id": f"n{i}"})
+    log.close()
+    _truncate_tail("j", 5)
+    
+    log = WriteAheadLog("j")
+    assert [body for _, body in log.records()] == [b'{"node_id":"n0"}', b'{"node_id":"n1"}']
+    # Das abgeschnittene Ende ist entfernt, neue Records bleiben lesbar
+    log.append_json(wal.NODE_REGISTERED, {"node_id": "n3"})
+    assert [body for _, body in log.records()][-1] == b'{"node_id":"n3"}'
+    log.close()
+
+
+def test_replay_drops_transaction_torn_mid_record():
+    coord = Coordinator(journal_dir="j")
+    for i in range(5):
+        fund(coord, f"n{i % 2}", 1.0 + i, f"solar_{i}")
+    roots = coord.merkle_roots()
+    balances = dict(coord.ledger.balances)
+    tx_count = len(coord.dag.transactions)
+    # Genau ein Record: TX_ADDED
+    torn = coord.submit_energy("n0", 7.0, "solar_torn")
+    coord.close()
+    _truncate_tail("j", 20)
+    
+    restored = Coordinator(journal_dir="j")
+    assert restored.load_state()
+    assert torn not in restored.dag.transactions
+    assert len(restored.dag.transactions) == tx_count
+    assert restored.merkle_roots() == roots
+    assert dict(restored.ledger.balances) == balances
+    # Das Journal nimmt nach dem Abschneiden weiter Records an
+    added = restored.submit_energy("n0", 7.0, "solar_torn")
+    restored.close()
+    again = Coordinator(journal_dir="j")
+    assert again.load_state()
+    assert added in again.dag.transactions
+    again.close()
+
+
+def test_replay_after_truncating_into_header():
+    coord = Coordinator(journal_dir="j")
+    fund(coord, "n0", 2.0)
+    roots = coord.merkle_roots()
+    coord.register_node("late")
+    coord.close()
+    # Der letzte Record hat nur noch einen Teil seines Headers
+    body = len(b'{"node_id":"late","public_key":null}')
+    _truncate_tail("j", body + 4)
+    
+    restored = Coordinator(journal_dir="j")
+    assert restored.load_state()
+    assert "late" not in restored.nodes
+    assert restored.merkle_roots() == roots
+    restored.close()
\ No newline at end of file
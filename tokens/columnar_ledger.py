@@ -0,0 +1,236 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+from core.merkle import MerkleTree
+from tokens.history import BalanceHistory
+from tokens.ledger import SCALE, TokenLedger, balance_leaf, to_units
+
+Accounts = Union[Sequence[str], np.ndarray]
+
+
+class ColumnarTokenLedger(TokenLedger):
+    """TokenLedger mit Guthaben als NumPy-Spalte in Festkomma-Einheiten.
+    
+    Konten werden beim ersten Guthaben auf fortlaufende Indizes abgebildet
+    (interniert); `balance_view()` liefert die Guthaben ohne Kopie.
+    `credit_many`/`debit_many` buchen ganze Batches per `np.add.at` bzw.
+    `np.subtract.at`; Konten können dabei als Namen oder als bereits
+    internierte Index-Arrays (`intern()`) übergeben werden. Ein einziges
+    Lock genügt, da Batches vektorisiert laufen.
+    """
+    
+    INITIAL_CAPACITY = 1024
+    
+    def __init__(self, history: Optional[BalanceHistory] = None):
+        self.history = history
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._accounts: List[str] = []
+        self._units = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)
+        self._dirty = np.zeros(self.INITIAL_CAPACITY, dtype=bool)
+        self._supply_units = 0
+        # Blattposition = Kontoindex (Reihenfolge des ersten Auftretens wie im TokenLedger)
+        self._tree = MerkleTree()
+    
+    def __len__(self) -> int:
+        return len(self._accounts)
+    
+    @property
+    def balances(self) -> Dict[str, float]:
+        """Neues Dict bei jedem Zugriff; für die Anzahl `account_count()`"""
+        units = self._units[:len(self._accounts)].tolist()
+        return {node_id: value / SCALE for node_id, value in zip(self._accounts, units)}
+    
+    @property
+    def total_supply(self) -> float:
+        return self._supply_units / SCALE
+    
+    @property
+    def accounts(self) -> List[str]:
+        return list(self._accounts)
+    
+    def balance_view(self) -> np.ndarray:
+        """Schreibgeschützte Sicht auf alle Guthaben (Einheiten, / SCALE = Tokens)"""
+        view = self._units[:len(self._accounts)]
+        view.flags.writeable = False
+        return view
+    
+    def _grow(self, size: int) -> None:
+        capacity = len(self._units)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        units = np.zeros(capacity, dtype=np.int64)
+        units[:len(self._units)] = self._units
+        dirty = np.zeros(capacity, dtype=bool)
+        dirty[:len(self._dirty)] = self._dirty
+        self._units, self._dirty = units, dirty
+    
+    def intern(self, node_ids: Iterable[str]) -> np.ndarray:
+        """Indizes der Konten; unbekannte Konten werden angelegt"""
+        with self._lock:
+            return self._intern(node_ids)
+    
+    def _intern(self, node_ids: Iterable[str]) -> np.ndarray:
+        index = self._index
+        accounts = self._accounts
+        known = len(accounts)
+        indexes = []
+        for node_id in node_ids:
+            position = index.get(node_id)
+            if position is None:
+                position = index[node_id] = len(accounts)
+                accounts.append(node_id)
+            indexes.append(position)
+        self._grow(len(accounts))
+        # Neue Konten bekommen ihr Merkle-Blatt beim nächsten root()
+        self._dirty[known:len(accounts)] = True
+        return np.array(indexes, dtype=np.int64)
+    
+    def _lookup(self, node_ids: Accounts) -> np.ndarray:
+        """Indizes der Konten, -1 für unbekannte"""
+        if isinstance(node_ids, np.ndarray) and node_ids.dtype.kind in "iu":
+            return node_ids.astype(np.int64, copy=False)
+        index = self._index
+        return np.array([index.get(node_id, -1) for node_id in node_ids], dtype=np.int64)
+    
+    @staticmethod
+    def _to_units(amounts: Union[Iterable[float], np.ndarray]) -> np.ndarray:
+        return np.rint(np.asarray(amounts, dtype=np.float64) * SCALE).astype(np.int64)
+    
+    def get_balance(self, node_id: str) -> float:
+        position = self._index.get(node_id)
+        if position is None:
+            return 0.0
+        return int(self._units[position]) / SCALE
+    
+    def credit_tokens(self, node_id: str, amount: float, at: Optional[float] = None) -> None:
+        if amount <= 0:
+            return
+        units = to_units(amount)
+        with self._lock:
+            position = self._intern((node_id,))[0]
+            self._units[position] += units
+            self._dirty[position] = True
+            self._supply_units += units
+            if self.history is not None:
+                self.history.credit(node_id, units, at)
+    
+    def debit_tokens(self, node_id: str, amount: float, at: Optional[float] = None) -> bool:
+        if amount <= 0:
+            return False
+        units = to_units(amount)
+        with self._lock:
+            position = self._index.get(node_id)
+            if position is None or self._units[position] < units:
+                return False
+            self._units[position] -= units
+            self._dirty[position] = True
+            if self.history is not None:
+                self.history.debit(node_id, units, at)
+        return True
+    
+    def refund_tokens(self, node_id: str, amount: float, at: Optional[float] = None) -> None:
+        if amount <= 0:
+            return
+        units = to_units(amount)
+        with self._lock:
+            position = self._intern((node_id,))[0]
+            self._units[position] += units
+            self._dirty[position] = True
+            if self.history is not None:
+                self.history.refund(node_id, units, at)
+    
+    def _record(self, book, indexes: np.ndarray, units: np.ndarray, at: Optional[float]) -> None:
+        accounts = self._accounts
+        for position, value in zip(indexes.tolist(), units.tolist()):
+            book(accounts[position], value, at)
+    
+    def credit_many(
+        self,
+        node_ids: Accounts,
+        amounts: Union[Iterable[float], np.ndarray],
+        at: Optional[float] = None
+    ) -> None:
+        """Bucht alle Gutschriften eines Batches; Beträge <= 0 werden ignoriert"""
+        units = self._to_units(amounts)
+        valid = units > 0
+        with self._lock:
+            if isinstance(node_ids, np.ndarray) and node_ids.dtype.kind in "iu":
+                indexes = node_ids.astype(np.int64, copy=False)
+                if len(indexes) and (indexes.min() < 0 or indexes.max() >= len(self._accounts)):
+                    raise IndexError("unknown account index")
+            else:
+                # Nur Konten mit gültiger Gutschrift anlegen (wie credit_tokens)
+                node_ids = list(node_ids)
+                indexes = np.full(len(node_ids), -1, dtype=np.int64)
+                indexes[valid] = self._intern(node_id for node_id, ok in zip(node_ids, valid.tolist()) if ok)
+            indexes, units = indexes[valid], units[valid]
+            np.add.at(self._units, indexes, units)
+            self._dirty[indexes] = True
+            self._supply_units += int(units.sum())
+            if self.history is not None:
+                self._record(self.history.credit, indexes, units, at)
+    
+    def debit_many(
+        self,
+        node_ids: Accounts,
+        amounts: Union[Iterable[float], np.ndarray],
+        at: Optional[float] = None
+    ) -> np.ndarray:
+        """Bucht Abbuchungen eines Batches; liefert pro Eintrag, ob gebucht wurde.
+        
+        Pro Konto wird in Batch-Reihenfolge abgebucht, solange das Guthaben
+        reicht; ab der ersten ungedeckten Abbuchung schlagen alle weiteren
+        dieses Kontos im Batch fehl. Unbekannte Konten und Beträge <= 0
+        schlagen fehl.
+        """
+        units = self._to_units(amounts)
+        with self._lock:
+            indexes = self._lookup(node_ids)
+            valid = (indexes >= 0) & (units > 0)
+            candidates = np.flatnonzero(valid)
+            # Stabil nach Konto sortieren und je Konto kumulieren
+            order = candidates[np.argsort(indexes[candidates], kind="stable")]
+            sorted_indexes = indexes[order]
+            sorted_units = units[order]
+            running = np.cumsum(sorted_units)
+            starts = np.ones(len(order), dtype=bool)
+            starts[1:] = sorted_indexes[1:] != sorted_indexes[:-1]
+            before_group = (running - sorted_units)[starts]
+            running -= before_group[np.cumsum(starts) - 1]
+            covered = running <= self._units[sorted_indexes]
+            accepted = np.zeros(len(units), dtype=bool)
+            accepted[order[covered]] = True
+            np.subtract.at(self._units, indexes[accepted], units[accepted])
+            self._dirty[indexes[accepted]] = True
+            if self.history is not None:
+                self._record(self.history.debit, indexes[accepted], units[accepted], at)
+        return accepted
+    
+    def load_balances(self, balances: Dict[str, float], total_supply: float) -> None:
+        with self._lock:
+            self._index = {}
+            self._accounts = []
+            self._units = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)
+            self._dirty = np.zeros(self.INITIAL_CAPACITY, dtype=bool)
+            indexes = self._intern(balances.keys())
+            self._units[indexes] = self._to_units(list(balances.values()))
+            self._supply_units = to_units(total_supply)
+            self._tree = MerkleTree()
+    
+    def root(self) -> bytes:
+        with self._lock:
+            count = len(self._accounts)
+            for position in np.flatnonzero(self._dirty[:count]).tolist():
+                leaf = balance_leaf(self._accounts[position], int(self._units[position]))
+                if position < len(self._tree):
+                    self._tree.update(position, leaf)
+                else:
+                    self._tree.append(leaf)
+            self._dirty[:count] = False
+            return self._tree.root()
+    
+    def get_all_balances(self) -> Dict[str, float]:
+        return self.balances
\ No newline at end of file
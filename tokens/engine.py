@@ -1,3 +1,6 @@
+from tokens.processed import ProcessedIndex
+
+
 class TokenEngine:
     """Mintet Tokens für bestätigte Energie-Meldungen"""
     
@@ -7,7 +10,7 @@ class TokenEngine:
     def __init__(self, tangle):
         self.tangle = tangle
         self.balances = {}
-        self.processed_txs = set()
+        self.processed_txs = ProcessedIndex()
     
     def process_confirmed_transactions(self):
         confirmed = self.tangle.get_confirmed_transactions(self.MIN_CONFIRMATIONS)
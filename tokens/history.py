@@ -0,0 +1,187 @@
+import heapq
+import itertools
+import time
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from tokens.ledger import SCALE, to_units
+
+
+class _Series:
+    """Änderungen eines Kontos (oder der Gesamtmenge) in Festkomma-Einheiten.
+    
+    `checkpoints[i]` ist der Stand vor Eintrag `i * every`; ein Stand zu
+    einem Zeitpunkt kostet daher eine Binärsuche plus höchstens `every - 1`
+    Additionen. Zeitpunkte sind monoton (ältere werden auf den letzten
+    angehoben), damit die Binärsuche gilt.
+    """
+    
+    __slots__ = ("times", "deltas", "checkpoints", "value")
+    
+    def __init__(self):
+        self.times = array('d')
+        self.deltas = array('q')
+        self.checkpoints = array('q')
+        self.value = 0
+    
+    def append(self, at: float, delta: int, every: int) -> None:
+        if len(self.deltas) % every == 0:
+            self.checkpoints.append(self.value)
+        if self.times and at < self.times[-1]:
+            at = self.times[-1]
+        self.times.append(at)
+        self.deltas.append(delta)
+        self.value += delta
+    
+    def extend(self, times: Sequence[float], deltas: Sequence[int], every: int) -> None:
+        """Übernimmt gespeicherte Einträge (leere Reihe vorausgesetzt)"""
+        self.times = array('d', times)
+        self.deltas = array('q', deltas)
+        running = list(itertools.accumulate(self.deltas, initial=0))
+        self.checkpoints = array('q', running[:len(self.deltas):every])
+        self.value = running[-1]
+    
+    def value_at(self, at: float, every: int) -> int:
+        count = bisect_right(self.times, at)
+        if count == len(self.deltas):
+            return self.value
+        block = count // every
+        return self.checkpoints[block] + sum(self.deltas[block * every:count])
+
+
+class BalanceHistory:
+    """Append-only Buchungsjournal pro Konto für Stichtagsabfragen.
+    
+    Jede Gutschrift und Abbuchung wird mit Zeitpunkt und Betrag (Festkomma,
+    `tokens.ledger.SCALE`) in Arrays abgelegt (16 Bytes pro Buchung); alle
+    `checkpoint_every` Buchungen kommt ein Zwischenstand hinzu.
+    `balance_at()` und `supply_at()` laufen in O(log n) plus einer kurzen
+    Nachrechnung. Für Bestände, deren Entstehung nicht aufgezeichnet ist,
+    legt `open()` Anfangsbuchungen zum Zeitpunkt 0 an.
+    
+    Die Gesamtmenge ist in `SUPPLY_PARTS` Reihen aufgeteilt (`part`, beim
+    TokenLedger der Lock-Streifen des Kontos), damit parallele Buchungen
+    kein gemeinsames Lock brauchen; `supply_at()` summiert die Teile,
+    gespeichert wird eine zusammengeführte Reihe.
+    """
+    
+    CHECKPOINT_EVERY = 64
+    SUPPLY_PARTS = 64
+    
+    def __init__(self, checkpoint_every: int = CHECKPOINT_EVERY):
+        self.checkpoint_every = checkpoint_every
+        self._accounts: Dict[str, _Series] = {}
+        self._supply = [_Series() for _ in range(self.SUPPLY_PARTS)]
+    
+    def __len__(self) -> int:
+        return sum(len(series.deltas) for series in self._accounts.values())
+    
+    def _account(self, node_id: str) -> _Series:
+        series = self._accounts.get(node_id)
+        if series is None:
+            series = self._accounts[node_id] = _Series()
+        return series
+    
+    def credit(self, node_id: str, units: int, at: Optional[float] = None, part: int = 0) -> None:
+        at = time.time() if at is None else at
+        self._account(node_id).append(at, units, self.checkpoint_every)
+        self._supply[part % self.SUPPLY_PARTS].append(at, units, self.checkpoint_every)
+    
+    def debit(self, node_id: str, units: int, at: Optional[float] = None) -> None:
+        at = time.time() if at is None else at
+        self._account(node_id).append(at, -units, self.checkpoint_every)
+    
+    def refund(self, node_id: str, units: int, at: Optional[float] = None) -> None:
+        """Rückbuchung aufs Konto; die Gesamtmenge bleibt unverändert"""
+        at = time.time() if at is None else at
+        self._account(node_id).append(at, units, self.checkpoint_every)
+    
+    def open(self, balances: Dict[str, float], total_supply: float, at: float = 0.0) -> None:
+        """Anfangsbestände ohne aufgezeichnete Historie"""
+        for node_id, amount in balances.items():
+            units = to_units(amount)
+            if units:
+                self._account(node_id).append(at, units, self.checkpoint_every)
+        supply = to_units(total_supply)
+        if supply:
+            self._supply[0].append(at, supply, self.checkpoint_every)
+    
+    def balance_at(self, node_id: str, at: float) -> float:
+        """Guthaben nach allen Buchungen bis einschließlich `at`"""
+        series = self._accounts.get(node_id)
+        if series is None:
+            return 0.0
+        return series.value_at(at, self.checkpoint_every) / SCALE
+    
+    def supply_at(self, at: float) -> float:
+        return sum(part.value_at(at, self.checkpoint_every) for part in self._supply) / SCALE
+    
+    def _supply_entries(self) -> List[Tuple[float, int]]:
+        """Buchungen der Gesamtmenge über alle Teile, nach Zeitpunkt sortiert"""
+        return list(heapq.merge(
+            *(zip(part.times, part.deltas) for part in self._supply if part.deltas),
+            key=lambda entry: entry[0]
+        ))
+    
+    def _load_supply(self, times: Sequence[float], deltas: Sequence[int]) -> None:
+        self._supply = [_Series() for _ in range(self.SUPPLY_PARTS)]
+        self._supply[0].extend(times, deltas, self.checkpoint_every)
+    
+    def entries(self, node_id: str) -> List[Tuple[float, float]]:
+        """Alle Buchungen eines Kontos als (Zeitpunkt, Betrag)"""
+        series = self._accounts.get(node_id)
+        if series is None:
+            return []
+        return [(at, delta / SCALE) for at, delta in zip(series.times, series.deltas)]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "accounts": {
+                node_id: [[at, delta] for at, delta in zip(series.times, series.deltas)]
+                for node_id, series in self._accounts.items()
+            },
+            "supply": [[at, delta] for at, delta in self._supply_entries()]
+        }
+    
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Ersetzt den Inhalt durch gespeicherte Buchungen (Format von to_dict)"""
+        self._accounts = {}
+        for node_id, entries in data.get("accounts", {}).items():
+            self._account(node_id).extend(
+                [at for at, _ in entries], [delta for _, delta in entries], self.checkpoint_every
+            )
+        supply = data.get("supply", [])
+        self._load_supply([at for at, _ in supply], [delta for _, delta in supply])
+    
+    def to_columns(self) -> Tuple[List[Optional[str]], List[int], array, array]:
+        """(Konten, Anzahl je Konto, Zeitpunkte, Beträge); Konto None ist die Gesamtmenge"""
+        supply = self._supply_entries()
+        names: List[Optional[str]] = [None]
+        counts = [len(supply)]
+        times = array('d', (at for at, _ in supply))
+        deltas = array('q', (delta for _, delta in supply))
+        for node_id, series in self._accounts.items():
+            names.append(node_id)
+            counts.append(len(series.deltas))
+            times.extend(series.times)
+            deltas.extend(series.deltas)
+        return names, counts, times, deltas
+    
+    def load_columns(
+        self,
+        names: List[Optional[str]],
+        counts: Iterable[int],
+        times: Sequence[float],
+        deltas: Sequence[int]
+    ) -> None:
+        self._accounts = {}
+        self._load_supply((), ())
+        start = 0
+        for node_id, count in zip(names, counts):
+            if node_id is None:
+                self._load_supply(times[start:start + count], deltas[start:start + count])
+            else:
+                self._account(node_id).extend(
+                    times[start:start + count], deltas[start:start + count], self.checkpoint_every
+                )
+            start += count
\ No newline at end of file
@@ -1,30 +1,193 @@
-from typing import Dict, List
-from copy import deepcopy
+import hashlib
+import struct
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+from core.merkle import MerkleTree
+
+if TYPE_CHECKING:
+    from tokens.history import BalanceHistory
+
+# Festkomma-Einheiten pro Token; Merkle-Blätter und ColumnarTokenLedger rechnen
+# in ganzen Einheiten, damit beide Ledger dieselben Roots liefern
+SCALE = 1_000_000
+
+
+def to_units(amount: float) -> int:
+    return round(amount * SCALE)
+
+
+def balance_leaf(node_id: str, units: int) -> bytes:
+    return hashlib.sha256(node_id.encode() + b"\x00" + struct.pack("<q", units)).digest()
+
+
+class _Stripe:
+    """Lock und Buchungsstand eines Teils der Konten"""
+    
+    __slots__ = ("lock", "index", "supply_units", "dirty")
+    
+    def __init__(self, index: int):
+        self.lock = threading.Lock()
+        self.index = index
+        # Änderung der Gesamtmenge (Festkomma) seit load_balances
+        self.supply_units = 0
+        # Seit dem letzten root() geänderte Konten dieses Streifens
+        self.dirty: Dict[str, None] = {}
 
 
 class TokenLedger:
-    def __init__(self):
+    """Guthaben pro Node.
+    
+    Thread-sicher: jede Buchung läuft nur unter einem von `LOCK_STRIPES`
+    Streifen (per Hash des Kontos gewählt). Jeder Streifen führt seinen
+    Anteil an der Gesamtmenge (Festkomma) und seine geänderten Konten
+    selbst; `total_supply` und `root()` fassen die Streifen zusammen.
+    Einen globalen Abschnitt gibt es nur beim ersten Guthaben eines Kontos,
+    das dort seine Position im Merkle-Baum erhält (Reihenfolge des ersten
+    Auftretens, damit Replikate dieselbe Root bilden).
+    
+    Mit einer `BalanceHistory` wird jede Buchung zusätzlich mit Zeitpunkt
+    (`at`, Standard: jetzt) festgehalten, die Gesamtmenge dort ebenfalls
+    pro Streifen; dann beantworten `balance_at()` und `supply_at()`
+    Stichtagsabfragen.
+    """
+    
+    LOCK_STRIPES = 64
+    
+    def __init__(self, history: Optional["BalanceHistory"] = None):
         self.balances: Dict[str, float] = {}
-        self.total_supply: float = 0.0
+        self.history = history
+        self._stripes: List[_Stripe] = [_Stripe(index) for index in range(self.LOCK_STRIPES)]
+        self._supply_units = 0
+        self._lock = threading.Lock()
+        # Merkle-Baum über die Guthaben in Reihenfolge des ersten Auftretens
+        self._tree = MerkleTree()
+        self._positions: Dict[str, int] = {}
+        # Seit dem letzten root() neu aufgetretene Konten, in dieser Reihenfolge
+        self._new_accounts: List[str] = []
+    
+    def __len__(self) -> int:
+        """Anzahl der Konten"""
+        return len(self.balances)
+    
+    def account_count(self) -> int:
+        return len(self)
+    
+    @property
+    def total_supply(self) -> float:
+        return (self._supply_units + sum(stripe.supply_units for stripe in self._stripes)) / SCALE
+    
+    def _stripe(self, node_id: str) -> _Stripe:
+        return self._stripes[hash(node_id) % self.LOCK_STRIPES]
+    
+    def _touch(self, stripe: _Stripe, node_id: str) -> None:
+        """Markiert ein Konto als geändert (unter dem Lock seines Streifens)"""
+        if node_id not in self.balances:
+            with self._lock:
+                self._new_accounts.append(node_id)
+        stripe.dirty[node_id] = None
     
     def get_balance(self, node_id: str) -> float:
         return self.balances.get(node_id, 0.0)
     
-    def credit_tokens(self, node_id: str, amount: float) -> None:
+    def credit_tokens(self, node_id: str, amount: float, at: Optional[float] = None) -> None:
         if amount <= 0:
             return
-        current = self.balances.get(node_id, 0.0)
-        self.balances[node_id] = current + amount
-        self.total_supply += amount
+        units = to_units(amount)
+        stripe = self._stripe(node_id)
+        with stripe.lock:
+            self._touch(stripe, node_id)
+            self.balances[node_id] = self.balances.get(node_id, 0.0) + amount
+            stripe.supply_units += units
+            if self.history is not None:
+                self.history.credit(node_id, units, at, stripe.index)
     
-    def debit_tokens(self, node_id: str, amount: float) -> bool:
+    def debit_tokens(self, node_id: str, amount: float, at: Optional[float] = None) -> bool:
         if amount <= 0:
             return False
-        current = self.balances.get(node_id, 0.0)
-        if current < amount:
-            return False
-        self.balances[node_id] = current - amount
+        stripe = self._stripe(node_id)
+        with stripe.lock:
+            current = self.balances.get(node_id, 0.0)
+            if current < amount:
+                return False
+            self.balances[node_id] = current - amount
+            stripe.dirty[node_id] = None
+            if self.history is not None:
+                self.history.debit(node_id, to_units(amount), at)
         return True
     
+    def refund_tokens(self, node_id: str, amount: float, at: Optional[float] = None) -> None:
+        """Macht eine Abbuchung rückgängig; anders als eine Gutschrift ohne neue Tokens"""
+        if amount <= 0:
+            return
+        stripe = self._stripe(node_id)
+        with stripe.lock:
+            self._touch(stripe, node_id)
+            self.balances[node_id] = self.balances.get(node_id, 0.0) + amount
+            if self.history is not None:
+                self.history.refund(node_id, to_units(amount), at)
+    
+    def credit_many(self, node_ids: Iterable[str], amounts: Iterable[float], at: Optional[float] = None) -> None:
+        for node_id, amount in zip(node_ids, amounts):
+            self.credit_tokens(node_id, amount, at)
+    
+    def debit_many(
+        self,
+        node_ids: Iterable[str],
+        amounts: Iterable[float],
+        at: Optional[float] = None
+    ) -> List[bool]:
+        return [self.debit_tokens(node_id, amount, at) for node_id, amount in zip(node_ids, amounts)]
+    
+    def _require_history(self) -> "BalanceHistory":
+        if self.history is None:
+            raise RuntimeError("Balance history is not enabled")
+        return self.history
+    
+    def balance_at(self, node_id: str, at: float) -> float:
+        """Guthaben zum Zeitpunkt `at` (setzt eine BalanceHistory voraus)"""
+        return self._require_history().balance_at(node_id, at)
+    
+    def supply_at(self, at: float) -> float:
+        return self._require_history().supply_at(at)
+    
+    def load_balances(self, balances: Dict[str, float], total_supply: float) -> None:
+        """Ersetzt alle Guthaben (Wiederherstellung) und baut den Baum neu auf"""
+        with self._all_locks():
+            self.balances = dict(balances)
+            self._supply_units = to_units(total_supply)
+            for stripe in self._stripes:
+                stripe.supply_units = 0
+                stripe.dirty = {}
+            self._tree = MerkleTree()
+            self._positions = {}
+            self._new_accounts = list(self.balances)
+    
+    @contextmanager
+    def _all_locks(self) -> Iterator[None]:
+        """Alle Streifen und das globale Lock (immer in dieser Reihenfolge)"""
+        with ExitStack() as stack:
+            for stripe in self._stripes:
+                stack.enter_context(stripe.lock)
+            stack.enter_context(self._lock)
+            yield
+    
+    def root(self) -> bytes:
+        """Merkle-Root über alle Guthaben"""
+        with self._all_locks():
+            new_accounts, self._new_accounts = self._new_accounts, []
+            dirty: Dict[str, None] = dict.fromkeys(new_accounts)
+            for stripe in self._stripes:
+                dirty.update(stripe.dirty)
+                stripe.dirty = {}
+            for node_id in dirty:
+                leaf = balance_leaf(node_id, to_units(self.balances[node_id]))
+                position = self._positions.get(node_id)
+                if position is None:
+                    self._positions[node_id] = self._tree.append(leaf)
+                else:
+                    self._tree.update(position, leaf)
+            return self._tree.root()
+    
     def get_all_balances(self) -> Dict[str, float]:
-        return deepcopy(self.balances)
\ No newline at end of file
+        return dict(self.balances)
\ No newline at end of file
@@ -1,6 +1,8 @@
-from typing import List, Set
+import threading
+from typing import List, Optional
 from energy.contribution import EnergyContribution
 from tokens.ledger import TokenLedger
+from tokens.processed import ProcessedIndex
 
 
 class TokenMinter:
@@ -9,15 +11,25 @@ class TokenMinter:
     
     def __init__(self, ledger: TokenLedger):
         self.ledger = ledger
-        self.processed_transactions: Set[str] = set()
+        self.processed_transactions = ProcessedIndex()
+        # Reserviert Hashes, damit parallele Aufrufe nicht doppelt minten
+        self._lock = threading.Lock()
     
-    def mint_for_contributions(self, contributions: List[EnergyContribution]) -> List[EnergyContribution]:
+    def mint_for_contributions(
+        self,
+        contributions: List[EnergyContribution],
+        at: Optional[float] = None
+    ) -> List[EnergyContribution]:
         minted = []
-        for contrib in contributions:
-            if contrib.transaction_hash in self.processed_transactions:
-                continue
-            tokens = contrib.amount_kwh * self.KWH_TO_TOKEN_RATE
-            self.ledger.credit_tokens(contrib.node_id, tokens)
-            self.processed_transactions.add(contrib.transaction_hash)
-            minted.append(contrib)
+        with self._lock:
+            for contrib in contributions:
+                if contrib.transaction_hash in self.processed_transactions:
+                    continue
+                self.processed_transactions.add(contrib.transaction_hash)
+                minted.append(contrib)
+        self.ledger.credit_many(
+            [contrib.node_id for contrib in minted],
+            [contrib.amount_kwh * self.KWH_TO_TOKEN_RATE for contrib in minted],
+            at
+        )
         return minted
\ No newline at end of file
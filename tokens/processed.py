@@ -0,0 +1,140 @@
+import base64
+from typing import Any, Dict, Iterable, Iterator
+from core.compact_dag import HASH_SIZE, NO_ID, HashIndex
+
+
+class ProcessedIndex:
+    """Menge geminteter Transaktionen als Bitmap über internierte IDs.
+    
+    Hashes werden im HashIndex zu dichten IDs interniert (32-Byte-Digest
+    plus Tabellenslot statt eines Set-Eintrags mit 64-Zeichen-String), ein
+    Bit pro ID sagt, ob die Transaktion als gemintet gilt. Entfernen löscht
+    nur das Bit; ist mehr als die Hälfte der IDs gelöscht, wird neu
+    aufgebaut. Die Schnittstelle entspricht dem bisherigen Set[str].
+    
+    Gespeichert wird nur eine Bitmap über die Transaktionen des DAGs in
+    Einfügereihenfolge (`bitmap`/`load_bitmap`), also ein Bit pro
+    Transaktion.
+    """
+    
+    REBUILD_MIN = 1024
+    
+    def __init__(self, tx_hashes: Iterable[str] = ()):
+        self._index = HashIndex()
+        self._bits = bytearray()
+        self._count = 0
+        self.update(tx_hashes)
+    
+    @classmethod
+    def from_state(cls, data: Dict[str, Any]) -> "ProcessedIndex":
+        """Aus atlas_state.json: `processed_bitmap` über dag.transactions oder die alte Hash-Liste"""
+        processed = cls(data.get("processed_transactions", ()))
+        if "processed_bitmap" in data:
+            processed.load_bitmap(
+                (bytes.fromhex(tx_dict["hash"]) for tx_dict in data.get("dag", {}).get("transactions", [])),
+                base64.b64decode(data["processed_bitmap"])
+            )
+        return processed
+    
+    def to_state(self, digests: Iterable[bytes]) -> str:
+        """Bitmap über `digests` (Reihenfolge von dag.transactions) als Base64"""
+        return base64.b64encode(self.bitmap(digests)).decode("ascii")
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __contains__(self, tx_hash: object) -> bool:
+        tx_id = self._lookup(tx_hash)
+        return tx_id != NO_ID and self._test(tx_id)
+    
+    def __iter__(self) -> Iterator[str]:
+        return (digest.hex() for digest in self.digests())
+    
+    def _lookup(self, tx_hash: object) -> int:
+        if not isinstance(tx_hash, str) or len(tx_hash) != 2 * HASH_SIZE:
+            return NO_ID
+        try:
+            return self._index.lookup(bytes.fromhex(tx_hash))
+        except ValueError:
+            return NO_ID
+    
+    def _test(self, tx_id: int) -> bool:
+        return bool(self._bits[tx_id >> 3] >> (tx_id & 7) & 1)
+    
+    def add(self, tx_hash: str) -> None:
+        self.add_digest(bytes.fromhex(tx_hash))
+    
+    def add_digest(self, digest: bytes) -> None:
+        tx_id = self._index.intern(digest)
+        byte = tx_id >> 3
+        if byte == len(self._bits):
+            self._bits.append(0)
+        mask = 1 << (tx_id & 7)
+        if not self._bits[byte] & mask:
+            self._bits[byte] |= mask
+            self._count += 1
+    
+    def update(self, tx_hashes: Iterable[str]) -> None:
+        for tx_hash in tx_hashes:
+            self.add(tx_hash)
+    
+    def discard(self, tx_hash: str) -> None:
+        tx_id = self._lookup(tx_hash)
+        if tx_id == NO_ID or not self._test(tx_id):
+            return
+        self._bits[tx_id >> 3] &= ~(1 << (tx_id & 7)) & 0xFF
+        self._count -= 1
+    
+    def difference_update(self, tx_hashes: Iterable[str]) -> None:
+        for tx_hash in tx_hashes:
+            self.discard(tx_hash)
+        if len(self._index) > max(2 * self._count, self.REBUILD_MIN):
+            self._rebuild()
+    
+    def _rebuild(self) -> None:
+        digests = list(self.digests())
+        self.clear()
+        for digest in digests:
+            self.add_digest(digest)
+    
+    def clear(self) -> None:
+        self._index = HashIndex()
+        self._bits = bytearray()
+        self._count = 0
+    
+    def digests(self) -> Iterator[bytes]:
+        index = self._index
+        return (index.digest(tx_id) for tx_id in range(len(index)) if self._test(tx_id))
+    
+    def bitmap(self, digests: Iterable[bytes]) -> bytes:
+        """Bit i (niederwertigstes zuerst) ist gesetzt, wenn die i-te Transaktion gemintet ist"""
+        result = bytearray()
+        lookup = self._index.lookup
+        for position, digest in enumerate(digests):
+            if position & 7 == 0:
+                result.append(0)
+            tx_id = lookup(digest)
+            if tx_id != NO_ID and self._test(tx_id):
+                result[-1] |= 1 << (position & 7)
+        return bytes(result)
+    
+    def load_bitmap(self, digests: Iterable[bytes], bitmap: bytes) -> None:
+        """Ersetzt den Inhalt durch die Transaktionen mit gesetztem Bit.
+        
+        Die `digests` müssen eindeutig sein (wie in dag.transactions); der
+        Index wird in einem Durchgang aufgebaut.
+        """
+        selected = bytearray()
+        for position, digest in zip(range(8 * len(bitmap)), digests):
+            if bitmap[position >> 3] >> (position & 7) & 1:
+                selected += digest
+        self._index = HashIndex.from_digests(selected)
+        self._count = len(self._index)
+        self._bits = bytearray(b"\xff") * (self._count >> 3)
+        if self._count & 7:
+            self._bits.append((1 << (self._count & 7)) - 1)
+    
+    def memory_usage(self) -> int:
+        """Belegter Speicher von Digests, Hash-Tabelle und Bitmap in Bytes"""
+        table = self._index._table
+        return len(self._index.digests) + len(table) * table.itemsize + len(self._bits)
\ No newline at end of file